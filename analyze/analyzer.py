@@ -1,17 +1,79 @@
+import os
+import socket
+import sqlite3
+import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable
 from datetime import datetime, UTC
 from store.sqlite import SQLiteStore
+from analyze.cache import AnalysisCache
 from analyze.models import AnalyzedJob
 from analyze.openai import analyze_job_listing
+from analyze.prefilter import PreFilter, DEFAULT_RULES_PATH, METADATA_FIELDS
+from analyze.text import TextStats, prepare_description
+from telemetry.metrics import counter, write_snapshot
+
+JOBS_PROCESSED = counter("analyzer_jobs_total", "Jobs the analyzer finished, by how they were resolved", ("outcome",))
 
 class JobAnalyzer:
-    def __init__(self, store: SQLiteStore):
+    def __init__(
+        self,
+        store: SQLiteStore,
+        concurrency: int = 4,
+        batch_size: int = 20,
+        use_cache: bool = True,
+        prefilter_rules: str | None = DEFAULT_RULES_PATH,
+        token_budget: int | None = 1500,
+        lease_timeout: float = 300,
+        max_attempts: int = 5
+    ):
+        """
+        Args:
+            store: Store to read unanalyzed jobs from and write results to
+            concurrency: Maximum number of OpenAI requests in flight at once
+            batch_size: Number of results written to the store per transaction
+            use_cache: Reuse earlier analyses of identical listings instead of calling OpenAI again
+            prefilter_rules: Rules file for rejecting obvious mismatches without OpenAI, or None to disable
+            token_budget: Maximum estimated tokens of description sent per job, or None for no cap
+            lease_timeout: Seconds a claimed job stays reserved for this worker before others may retry it
+            max_attempts: Attempts before a job is moved to the dead-letter state
+        """
         self.store = store
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size)
+        self.cache = AnalysisCache(store, token_budget=token_budget) if use_cache else None
+        self.prefilter = PreFilter(prefilter_rules) if prefilter_rules else None
+        self.token_budget = token_budget
+        self.text_stats = TextStats()
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def inherit_analysis(self, job) -> AnalyzedJob | None:
+        """Copy the scores of the listing job reposts, or None if that listing isn't analyzed yet."""
+        row = self.store.get_analysis(job.canonical_id)
+        if row is None:
+            return None
+        return AnalyzedJob(
+            job_listing_id=job.id,
+            url=str(job.url),
+            salary_from=row['salary_from'],
+            salary_to=row['salary_to'],
+            is_remote_score=row['is_remote_score'],
+            is_applicable_score=row['is_applicable_score'],
+            is_european_score=row['is_european_score'],
+            analyzed_at=datetime.now(UTC),
+            source="duplicate"
+        )
 
     def analyze_job(self, job) -> AnalyzedJob:
         """Analyze a job listing using OpenAI to extract key metrics."""
+        description = prepare_description(job.content, self.token_budget)
+        self.text_stats.record(description)
         analysis_result = analyze_job_listing(
-            job_description=job.content,
+            job_description=description.text,
             job_id=job.id,
             url=job.url,
             salary_from=job.salary_min,
@@ -21,30 +83,212 @@ class JobAnalyzer:
         )
         return analysis_result
 
-    def run(self, poll_interval: int = 60):
-        """Continuously poll for unanalyzed jobs and analyze them."""
-        print(f"Starting job analyzer. Polling every {poll_interval} seconds...")
-        
-        while True:
-            try:
-                unanalyzed_jobs = self.store.get_unanalyzed_jobs()
-                
-                if unanalyzed_jobs:
-                    print(f"Found {len(unanalyzed_jobs)} unanalyzed jobs")
-                    for job in unanalyzed_jobs:
-                        print(f"Analyzing job: {job.url}")
-                        analysis = self.analyze_job(job)
-                        if self.store.save_analysis(analysis):
-                            print(f"Analysis complete and saved: remote={analysis.is_remote_score:.2f}, applicable={analysis.is_applicable_score:.2f}, european={analysis.is_european_score:.2f}")
-                        else:
-                            print(f"Failed to save analysis for job: {job.url}.")
-                            
-                    print(f"Completed analysis of {len(unanalyzed_jobs)} jobs")
+    def analyze_jobs(self, jobs, on_failure: Callable[[object, Exception], None] | None = None) -> tuple[int, int]:
+        """
+        Analyze jobs concurrently and save the results in batches.
+
+        Analyses run on a pool of worker threads while this thread is the only
+        writer, flushing results to the store every batch_size jobs. A failing
+        job is reported to on_failure and skipped without aborting the rest.
+        A batch that fails to save is released back to the queue without
+        counting the attempt. Jobs may come without content; it is loaded only
+        for jobs sent to OpenAI.
+
+        Returns:
+            Tuple of (saved, failed) counts
+        """
+        saved = 0
+        failed = 0
+        pending_results = []
+        pending_cache = []
+
+        def flush():
+            nonlocal saved, failed
+            if pending_cache:
+                self.store.save_cached_analyses(pending_cache)
+                pending_cache.clear()
+            if not pending_results:
+                return
+            count = self.store.save_analyses(pending_results)
+            saved += count
+            if count < len(pending_results):
+                failed += len(pending_results) - count
+                print(f"Failed to save {len(pending_results) - count} of {len(pending_results)} analyses")
+                # A failed write leaves the batch leased; hand it straight back rather than
+                # waiting out the lease and charging an attempt for analyses that succeeded.
+                # Listings that were saved are no longer leased and stay done.
+                try:
+                    released = self.store.release_jobs(self.worker_id, [analysis.job_listing_id for analysis in pending_results])
+                except sqlite3.Error as e:
+                    print(f"Failed to release unsaved jobs, they return to the queue when their lease expires: {e}")
                 else:
-                    print("No new jobs to analyze")
-                
-                time.sleep(poll_interval)
-                
-            except Exception as e:
-                print(f"Error during analysis: {str(e)}")
-                time.sleep(poll_interval)
+                    if released:
+                        print(f"Released {released} unsaved jobs back to the queue")
+            pending_results.clear()
+
+        jobs = iter(jobs)
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="analyzer") as executor:
+            in_flight = {}
+
+            def resolve_without_llm(job) -> AnalyzedJob | None:
+                # Title and location rules and the cache need no description,
+                # so it is only loaded for jobs that get past both.
+                if self.prefilter:
+                    result = self.prefilter.check(job, METADATA_FIELDS)
+                    if result is not None:
+                        print(f"Rejected by pre-filter: {job.url}")
+                        JOBS_PROCESSED.labels("prefilter").inc()
+                        return result
+                if self.cache:
+                    result = self.cache.lookup(job)
+                    if result is not None:
+                        print(f"Reusing cached analysis for job: {job.url}")
+                        JOBS_PROCESSED.labels("cache").inc()
+                        return result
+                if job.canonical_id is not None:
+                    result = self.inherit_analysis(job)
+                    if result is not None:
+                        print(f"Reusing analysis of original listing {job.canonical_id} for repost: {job.url}")
+                        JOBS_PROCESSED.labels("duplicate").inc()
+                        return result
+                if not job.content:
+                    job.content = self.store.get_job_content(job.id)
+                if self.prefilter:
+                    result = self.prefilter.check(job, ("content",), count=False)
+                    if result is not None:
+                        print(f"Rejected by pre-filter: {job.url}")
+                        JOBS_PROCESSED.labels("prefilter").inc()
+                        return result
+                return None
+
+            def submit_next() -> bool:
+                while True:
+                    job = next(jobs, None)
+                    if job is None:
+                        return False
+                    result = resolve_without_llm(job)
+                    if result is None:
+                        break
+                    pending_results.append(result)
+                    if len(pending_results) >= self.batch_size:
+                        flush()
+                print(f"Analyzing job: {job.url}")
+                in_flight[executor.submit(self.analyze_job, job)] = job
+                return True
+
+            # Keep a bounded number of jobs queued so the backlog isn't held as futures.
+            while len(in_flight) < self.concurrency * 2 and submit_next():
+                pass
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = in_flight.pop(future)
+                    try:
+                        analysis = future.result()
+                    except Exception as e:
+                        failed += 1
+                        JOBS_PROCESSED.labels("failed").inc()
+                        print(f"Failed to analyze job {job.url}: {str(e)}")
+                        if on_failure:
+                            on_failure(job, e)
+                    else:
+                        print(f"Analysis complete: remote={analysis.is_remote_score:.2f}, applicable={analysis.is_applicable_score:.2f}, european={analysis.is_european_score:.2f}")
+                        JOBS_PROCESSED.labels("llm").inc()
+                        pending_results.append(analysis)
+                        if self.cache:
+                            pending_cache.append(self.cache.entry(job, analysis))
+                        if len(pending_results) >= self.batch_size:
+                            flush()
+                    submit_next()
+
+        flush()
+        return saved, failed
+
+    def report_stats(self):
+        """Print cache, description and pre-filter counters accumulated so far."""
+        if self.cache:
+            stats = self.cache.stats()
+            print(f"Analysis cache: {stats['hits']} hits, {stats['misses']} misses, {stats['tokens_saved']} tokens saved")
+        stats = self.text_stats.stats()
+        if stats["jobs"]:
+            print(f"Descriptions: {stats['raw_tokens']} raw tokens trimmed to {stats['tokens']} ({stats['tokens_saved']} saved, {stats['truncated']} truncated)")
+        if self.prefilter:
+            stats = self.prefilter.stats()
+            print(f"Pre-filter: {stats['avoided_calls']} of {stats['checked']} OpenAI calls avoided {stats['by_rule']}")
+
+    def process_queue(self) -> int:
+        """
+        Claim one batch of queued jobs, analyze them and record the outcome.
+
+        Returns:
+            Number of jobs claimed, 0 when the queue had nothing due
+        """
+        claim_size = max(self.batch_size, self.concurrency * 2)
+        job_ids = self.store.claim_jobs(self.worker_id, claim_size, self.lease_timeout, self.max_attempts)
+        if not job_ids:
+            return 0
+
+        print(f"Claimed {len(job_ids)} jobs from the analysis queue")
+        jobs = self.store.get_jobs_by_ids(job_ids, include_content=False)
+
+        def on_failure(job, error: Exception):
+            self.store.fail_job(job.id, self.worker_id, str(error), self.max_attempts)
+
+        saved, failed = self.analyze_jobs(jobs, on_failure=on_failure)
+        print(f"Completed analysis of {len(jobs)} jobs: {saved} saved, {failed} failed")
+        return len(job_ids)
+
+    def wait_for_work(self, timeout: float, check_interval: float = 0.5, stop: threading.Event | None = None):
+        """
+        Sleep until another process commits to the database or timeout elapses.
+
+        PRAGMA data_version is a constant-time check, so an idle worker wakes
+        within check_interval of new jobs being stored without rescanning tables.
+        Setting stop also ends the wait.
+        """
+        stop = stop or threading.Event()
+        version = self.store.data_version()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if stop.wait(min(check_interval, max(0, deadline - time.monotonic()))):
+                return
+            if self.store.data_version() != version:
+                return
+
+    def run(self, poll_interval: int = 60, stop: threading.Event | None = None):
+        """
+        Continuously work through the analysis queue.
+
+        Idle workers wake as soon as new jobs are committed, and at least every
+        poll_interval seconds to pick up retries and expired leases. When stop
+        is set the worker finishes its current batch and returns.
+        """
+        print(f"Starting job analyzer {self.worker_id}. Idle re-check every {poll_interval} seconds...")
+        stop = stop or threading.Event()
+
+        queued = self.store.enqueue_unanalyzed()
+        if queued:
+            print(f"Queued {queued} previously unanalyzed jobs")
+
+        try:
+            while not stop.is_set():
+                try:
+                    claimed = self.process_queue()
+                    write_snapshot("analyzer", min_interval=10)
+                    if claimed:
+                        self.report_stats()
+                        continue
+
+                    counts = self.store.queue_counts()
+                    print(f"No new jobs to analyze (queue: {counts})")
+                    self.wait_for_work(poll_interval, stop=stop)
+
+                except Exception as e:
+                    print(f"Error during analysis: {str(e)}")
+                    stop.wait(poll_interval)
+        finally:
+            released = self.store.release_jobs(self.worker_id)
+            if released:
+                print(f"Released {released} leased jobs back to the queue")
+            write_snapshot("analyzer")
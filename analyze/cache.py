@@ -0,0 +1,80 @@
+import json
+import threading
+from datetime import datetime, UTC
+from hashlib import sha256
+from store.sqlite import SQLiteStore
+from analyze.models import AnalyzedJob
+from analyze.openai import MODEL, PROMPT_FINGERPRINT
+from analyze.text import NORMALIZER_VERSION
+
+class AnalysisCache:
+    def __init__(self, store: SQLiteStore, model: str = MODEL, prompt_version: str = PROMPT_FINGERPRINT, token_budget: int | None = None):
+        """
+        Persistent cache of LLM analyses keyed by everything that goes into the prompt.
+
+        Entries from other prompt or description normalizer versions are
+        dropped on startup, so editing the prompt or schema in analyze/openai.py
+        or the text preparation in analyze/text.py invalidates the cache.
+
+        Args:
+            store: Store holding the analysis_cache table
+            model: Model name the analyses were produced with
+            prompt_version: Fingerprint of the prompt and schema
+            token_budget: Cap the descriptions were truncated to, or None for no cap
+        """
+        self.store = store
+        self.model = model
+        self.prompt_version = f"{prompt_version}-n{NORMALIZER_VERSION}"
+        self.token_budget = token_budget
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+        self._lock = threading.Lock()
+
+        removed = self.store.prune_analysis_cache(self.prompt_version)
+        if removed:
+            print(f"Dropped {removed} cached analyses from an older prompt version")
+
+    def key_for(self, job) -> str:
+        """Build the cache key for a job from its content checksum and prompt inputs."""
+        parts = [
+            job.checksum,
+            job.title,
+            job.salary_min,
+            job.salary_max,
+            job.location,
+            self.model,
+            self.prompt_version,
+            self.token_budget
+        ]
+        return sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+    def lookup(self, job) -> AnalyzedJob | None:
+        """Return a copy of the cached analysis for job, or None on a miss."""
+        row = self.store.get_cached_analysis(self.key_for(job))
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.tokens_saved += row['tokens_used']
+
+        return AnalyzedJob(
+            job_listing_id=job.id,
+            url=str(job.url),
+            salary_from=row['salary_from'],
+            salary_to=row['salary_to'],
+            is_remote_score=row['is_remote_score'],
+            is_applicable_score=row['is_applicable_score'],
+            is_european_score=row['is_european_score'],
+            analyzed_at=datetime.now(UTC)
+        )
+
+    def entry(self, job, analysis: AnalyzedJob) -> tuple[str, str, AnalyzedJob]:
+        """Build the row to store for a fresh analysis of job."""
+        return self.key_for(job), self.prompt_version, analysis
+
+    def stats(self) -> dict[str, int]:
+        """Return cache hit, miss and saved-token counters."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "tokens_saved": self.tokens_saved}
@@ -1,14 +1,21 @@
 from datetime import datetime, UTC
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl
 
 class AnalyzedJob(BaseModel):
     job_listing_id: int
     url: HttpUrl
     salary_from: str | None = None
     salary_to: str | None = None
-    is_remote_score: float = 0.0  # 0-1 score indicating confidence of remote work
-    is_applicable_score: float = 0.0  # 0-1 score indicating if job matches user criteria
-    is_european_score: float = 0.0  # 0-1 score indicating if job can be done in Europe
-    analyzed_at: datetime = datetime.now(UTC)
-
+    # Scores are None when unknown, such as those a pre-filter rule doesn't decide.
+    is_remote_score: float | None = 0.0  # 0-1 score indicating confidence of remote work
+    is_applicable_score: float | None = 0.0  # 0-1 score indicating if job matches user criteria
+    is_european_score: float | None = 0.0  # 0-1 score indicating if job can be done in Europe
+    analyzed_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    tokens_used: int = 0  # total OpenAI tokens spent producing this analysis
+    source: str = "llm"  # "llm" for OpenAI scores, "heuristic" for pre-filter rejects, "duplicate" for scores copied from the original of a repost
 
+    @property
+    def ai_score(self) -> float:
+        """Unweighted mean of the known scores, as shown in the AI Score column; 0 if none is known."""
+        known = [score for score in (self.is_remote_score, self.is_applicable_score, self.is_european_score) if score is not None]
+        return sum(known) / len(known) if known else 0.0
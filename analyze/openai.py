@@ -1,26 +1,95 @@
 from openai import OpenAI
 from datetime import datetime, UTC
+from hashlib import md5
 from .models import AnalyzedJob
 from dotenv import load_dotenv
+from telemetry.metrics import counter, histogram
 import json
 import os
+import threading
+import time
 
 load_dotenv()
 
-client = OpenAI()
+MODEL = os.getenv("OPENAI_MODEL") or "gpt-4o-mini"
+
+# Bump when the meaning of the prompt changes in a way the fingerprint below can't see.
+PROMPT_VERSION = 1
+
+PROMPT_TEMPLATE = "Analyze this job description into json\n\n\"\"\"\n{job}\"\"\""
+
+JOB_SCORE_SCHEMA = {
+  "type": "object",
+  "properties": {
+    "yearly_salary_from": {
+      "type": "number",
+      "description": "Minimum yearly salary in USD for the position, can be null."
+    },
+    "yearly_salary_to": {
+      "type": "number",
+      "description": "Maximum yearly salary in USD for the position, can be null."
+    },
+    "how_likely_remote_role": {
+      "type": "number",
+      "description": "Score indicating how likely that the position is remote, on a scale of 0 to 1."
+    },
+    "is_backend_role": {
+      "type": "number",
+      "description": "Is it a backend engineering or fullstack engineering role? Any other role is false, 0 for false, 1 for true."
+    },
+    "can_work_from_eu": {
+      "type": "number",
+      "description": "How likely that I can work from the EU for this role, on a scale of 0 to 1."
+    }
+  },
+  "required": [
+    "yearly_salary_from",
+    "yearly_salary_to",
+    "how_likely_remote_role",
+    "is_backend_role",
+    "can_work_from_eu"
+  ],
+  "additionalProperties": False
+}
+
+# Identifies the prompt and schema actually sent, so any edit to either
+# invalidates cached analyses without anyone having to remember a bump.
+PROMPT_FINGERPRINT = md5(
+    json.dumps([PROMPT_VERSION, PROMPT_TEMPLATE, JOB_SCORE_SCHEMA], sort_keys=True).encode("utf-8")
+).hexdigest()[:12]
+
+OPENAI_REQUEST_SECONDS = histogram("openai_request_seconds", "Latency of OpenAI Responses API calls", ("outcome",))
+OPENAI_TOKENS = counter("openai_tokens_total", "Tokens reported by the OpenAI API", ("kind",))
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client() -> OpenAI:
+    """
+    Return the shared OpenAI client, creating it on first use.
+
+    The client is thread-safe and reuses its connection pool across concurrent
+    analyses. Set OPENAI_BASE_URL to point it at a local fake of the Responses API.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OpenAI()
+    return _client
 
 def analyze_job_listing(job_description: str, job_id: int, url: str, salary_from: float | None = None, salary_to: float | None = None, location: str | None = None, title: str | None = None) -> AnalyzedJob:
     """
     Analyze a job listing using OpenAI to extract key metrics.
-    
+
     Args:
         job_description: The job listing text content
         job_id: The ID of the job listing
         url: The URL of the job listing
-        salary_from: Optional minimum salary 
+        salary_from: Optional minimum salary
         salary_to: Optional maximum salary
         location: Optional job location
-    
+
     Returns:
         AnalyzedJob containing salary range and various job scores
     """
@@ -32,15 +101,17 @@ def analyze_job_listing(job_description: str, job_id: int, url: str, salary_from
     Job title: {title if title else 'Not specified'}
     """
 
-    response = client.responses.create(
-  model="gpt-4o-mini",
+    start = time.perf_counter()
+    try:
+        response = get_client().responses.create(
+  model=MODEL,
   input=[
     {
       "role": "user",
       "content": [
         {
           "type": "input_text",
-          "text": f"Analyze this job description into json\n\n\"\"\"\n{job}\"\"\""
+          "text": PROMPT_TEMPLATE.format(job=job)
           }
       ]
     }
@@ -50,39 +121,7 @@ def analyze_job_listing(job_description: str, job_id: int, url: str, salary_from
       "type": "json_schema",
       "name": "job_position_score",
       "strict": True,
-      "schema": {
-        "type": "object",
-        "properties": {
-          "yearly_salary_from": {
-            "type": "number",
-            "description": "Minimum yearly salary in USD for the position, can be null."
-          },
-          "yearly_salary_to": {
-            "type": "number",
-            "description": "Maximum yearly salary in USD for the position, can be null."
-          },
-          "how_likely_remote_role": {
-            "type": "number",
-            "description": "Score indicating how likely that the position is remote, on a scale of 0 to 1."
-          },
-          "is_backend_role": {
-            "type": "number", 
-            "description": "Is it a backend engineering or fullstack engineering role? Any other role is false, 0 for false, 1 for true."
-          },
-          "can_work_from_eu": {
-            "type": "number",
-            "description": "How likely that I can work from the EU for this role, on a scale of 0 to 1."
-          }
-        },
-        "required": [
-          "yearly_salary_from",
-          "yearly_salary_to",
-          "how_likely_remote_role",
-          "is_backend_role",
-          "can_work_from_eu"
-        ],
-        "additionalProperties": False
-      }
+      "schema": JOB_SCORE_SCHEMA
     }
   },
   reasoning={},
@@ -92,16 +131,24 @@ def analyze_job_listing(job_description: str, job_id: int, url: str, salary_from
   top_p=1,
   store=True
 )
-    
+    except Exception:
+        OPENAI_REQUEST_SECONDS.labels("error").observe(time.perf_counter() - start)
+        raise
+    OPENAI_REQUEST_SECONDS.labels("ok").observe(time.perf_counter() - start)
+    if response.usage:
+        OPENAI_TOKENS.labels("input").inc(response.usage.input_tokens)
+        OPENAI_TOKENS.labels("output").inc(response.usage.output_tokens)
+
     scores = json.loads(response.output[0].content[0].text)
-    
+
     return AnalyzedJob(
         job_listing_id=job_id,
-        url=str(url),  
+        url=str(url),
         salary_from=str(scores["yearly_salary_from"]),
         salary_to=str(scores["yearly_salary_to"]),
         is_remote_score=scores["how_likely_remote_role"],
-        is_applicable_score=scores["is_backend_role"], 
+        is_applicable_score=scores["is_backend_role"],
         is_european_score=scores["can_work_from_eu"],
-        analyzed_at=datetime.now(UTC)
-    )
\ No newline at end of file
+        analyzed_at=datetime.now(UTC),
+        tokens_used=response.usage.total_tokens if response.usage else 0
+    )
@@ -0,0 +1,90 @@
+import json
+import re
+import threading
+from datetime import datetime, UTC
+from pathlib import Path
+from analyze.models import AnalyzedJob
+
+DEFAULT_RULES_PATH = Path(__file__).parent / "prefilter_rules.json"
+
+FIELDS = ("title", "location", "content")
+SCORES = ("is_remote_score", "is_applicable_score", "is_european_score")
+# Fields available without loading the description.
+METADATA_FIELDS = ("title", "location")
+
+class PreFilterRule:
+    def __init__(self, name: str, field: str, patterns: list[str], scores: dict[str, float], unless: list[str] | None = None):
+        if field not in FIELDS:
+            raise ValueError(f"Pre-filter rule {name!r} has unknown field {field!r}")
+        unknown = set(scores) - set(SCORES)
+        if unknown or not scores:
+            raise ValueError(f"Pre-filter rule {name!r} must set some of {SCORES}, got {sorted(scores)}")
+        self.name = name
+        self.field = field
+        # Only the scores the rule proves; the others are stored as unknown.
+        self.scores = scores
+        # One alternation per rule keeps matching to a single regex scan per field.
+        self.pattern = re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+        self.unless = re.compile("|".join(f"(?:{p})" for p in unless), re.IGNORECASE) if unless else None
+
+    def matches(self, job) -> bool:
+        value = getattr(job, self.field, None)
+        if not value:
+            return False
+        if not self.pattern.search(value):
+            return False
+        return not (self.unless and self.unless.search(value))
+
+class PreFilter:
+    def __init__(self, rules_path: str | Path = DEFAULT_RULES_PATH):
+        """
+        Rules-based rejection of obviously irrelevant listings before they reach OpenAI.
+
+        Args:
+            rules_path: JSON file with "rules", each giving the "scores" its match proves
+        """
+        config = json.loads(Path(rules_path).read_text())
+        self.rules = [
+            PreFilterRule(
+                name=rule["name"],
+                field=rule["field"],
+                patterns=rule["patterns"],
+                # Rule files written before per-rule scores share one set.
+                scores=rule.get("scores", config.get("default_scores", {})),
+                unless=rule.get("unless")
+            )
+            for rule in config["rules"]
+        ]
+        self.checked = 0
+        self.rejected: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def check(self, job, fields: tuple[str, ...] = FIELDS, count: bool = True) -> AnalyzedJob | None:
+        """
+        Return a heuristic AnalyzedJob if a rule confidently rejects the job, otherwise None.
+
+        Args:
+            job: Listing to check
+            fields: Only apply rules on these fields, so cheap fields can be checked before content is loaded
+            count: Count the job as checked; pass False for a later stage of the same job
+        """
+        rule = next((rule for rule in self.rules if rule.field in fields and rule.matches(job)), None)
+        with self._lock:
+            if count:
+                self.checked += 1
+            if rule is None:
+                return None
+            self.rejected[rule.name] = self.rejected.get(rule.name, 0) + 1
+
+        return AnalyzedJob(
+            job_listing_id=job.id,
+            url=str(job.url),
+            analyzed_at=datetime.now(UTC),
+            source="heuristic",
+            **{score: rule.scores.get(score) for score in SCORES}
+        )
+
+    def stats(self) -> dict:
+        """Return how many jobs were checked and how many OpenAI calls each rule avoided."""
+        with self._lock:
+            return {"checked": self.checked, "avoided_calls": sum(self.rejected.values()), "by_rule": dict(self.rejected)}
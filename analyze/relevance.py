@@ -0,0 +1,360 @@
+"""
+Local relevance ranking: hashed TF-IDF vectors of every listing, scored
+against a profile text and against each other without calling OpenAI.
+
+The term matrix is stored as CSR arrays in flat files next to the database
+and opened with numpy.memmap, so a process can start querying without
+reading it in. Listings are appended as the scraper stores them; document
+frequencies are kept alongside, and IDF weights and row norms are derived
+from them when the matrix is opened, so old rows never need rewriting.
+"""
+import json
+import os
+import re
+import zlib
+from contextlib import contextmanager
+from hashlib import md5
+from pathlib import Path
+from typing import Iterable, Iterator
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are not serialized between processes
+    fcntl = None
+
+# Features are hashed into this many columns; collisions cost a little precision, not correctness.
+DIM = 1 << 18
+# Title words count this many times, so a listing's own title outweighs passing mentions.
+TITLE_WEIGHT = 3
+# Profile scores are all recomputed once the corpus has grown by this factor,
+# as IDF weights drift when many listings are added.
+RESCORE_GROWTH = 1.25
+# Rows scored per step, bounding the temporaries of a full scan.
+BLOCK_ROWS = 16384
+DEFAULT_PROFILE_PATH = os.getenv("RELEVANCE_PROFILE") or str(Path(__file__).parent / "profile.txt")
+
+_TAG = re.compile(r"<[^>]*>")
+_ENTITY = re.compile(r"&#?\w+;")
+# Keeps tokens such as c++, c#, node.js and k8s whole.
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+class _FeatureIds(dict):
+    """Column of each distinct token, from a hash that is stable across processes."""
+    def __missing__(self, token: str) -> int:
+        if len(self) >= 200_000:
+            self.clear()
+        column = zlib.crc32(token.encode("utf-8")) & (DIM - 1)
+        self[token] = column
+        return column
+
+_feature_ids = _FeatureIds()
+
+def tokens(text: str | None) -> list[str]:
+    """Lowercased word tokens of text with HTML tags and entities removed."""
+    if not text:
+        return []
+    return _WORD.findall(_ENTITY.sub(" ", _TAG.sub(" ", text)).lower())
+
+def term_vector(title: str | None, content: str | None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Hashed, sublinear term frequencies of a listing.
+
+    Returns:
+        Sorted column indices (int32) and their weights 1 + log(count) (float32)
+    """
+    counts: dict[int, int] = {}
+    for column in map(_feature_ids.__getitem__, tokens(title)):
+        counts[column] = counts.get(column, 0) + TITLE_WEIGHT
+    for column in map(_feature_ids.__getitem__, tokens(content)):
+        counts[column] = counts.get(column, 0) + 1
+    indices = np.fromiter(sorted(counts), dtype=np.int32, count=len(counts))
+    weights = 1 + np.log(np.fromiter((counts[column] for column in indices.tolist()), dtype=np.float32, count=len(counts)))
+    return indices, weights
+
+class _Matrix:
+    """One consistent, read-only view of the stored CSR arrays and the weights derived from them."""
+    def __init__(self, path: Path, meta: dict):
+        self.rows = meta["rows"]
+        self.nnz = meta["nnz"]
+        self.ids = _map(path / "ids.i64", np.int64, self.rows)
+        self.indptr = _map(path / "indptr.i64", np.int64, self.rows + 1) if self.rows else np.zeros(1, dtype=np.int64)
+        self.indices = _map(path / "indices.i32", np.int32, self.nnz)
+        self.data = _map(path / "data.f32", np.float32, self.nnz)
+        df = np.fromfile(path / meta["df"], dtype=np.int32) if meta["df"] else np.zeros(DIM, dtype=np.int32)
+        self.idf = (np.log((1 + self.rows) / (1 + df.astype(np.float32))) + 1).astype(np.float32)
+        self._norms: np.ndarray | None = None
+
+    @property
+    def norms(self) -> np.ndarray:
+        """TF-IDF length of every row, computed on first use so opening stays cheap."""
+        if self._norms is None:
+            self._norms = np.sqrt(self.row_dots(self.idf, squared=True))
+        return self._norms
+
+    def row_dots(self, column_weights: np.ndarray, squared: bool = False) -> np.ndarray:
+        """
+        Sum of each row's weights times column_weights, or of their squares.
+
+        Rows are processed in blocks, so temporaries stay small however large
+        the matrix is and only the pages being read are touched.
+        """
+        sums = np.zeros(self.rows, dtype=np.float32)
+        for first in range(0, self.rows, BLOCK_ROWS):
+            last = min(first + BLOCK_ROWS, self.rows)
+            start, end = int(self.indptr[first]), int(self.indptr[last])
+            if start == end:
+                continue
+            values = self.data[start:end] * column_weights[self.indices[start:end]]
+            if squared:
+                np.square(values, out=values)
+            starts = self.indptr[first:last] - start
+            # reduceat needs starts inside values: trailing empty rows are left at 0,
+            # and other empty rows, which reduceat gives their neighbour's value, are reset.
+            filled = int(np.searchsorted(starts, end - start))
+            block = np.add.reduceat(values, starts[:filled])
+            block[starts[:filled] == self.indptr[first + 1:first + filled + 1] - start] = 0
+            sums[first:first + filled] = block
+        return sums
+
+    def cosine(self, weights: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity of every row with a query whose TF-IDF vector, divided
+        by its length, is weights. Rows without terms score 0.
+        """
+        dots = self.row_dots(self.idf * weights)
+        norms = self.norms
+        return np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+
+    def row(self, position: int) -> tuple[np.ndarray, np.ndarray]:
+        start, end = self.indptr[position], self.indptr[position + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def query(self, indices: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Dense query weights for a term vector, TF-IDF weighted and L2 normalised."""
+        tfidf = weights * self.idf[indices]
+        length = float(np.sqrt(np.square(tfidf).sum()))
+        query = np.zeros(DIM, dtype=np.float32)
+        if length > 0:
+            query[indices] = tfidf / length
+        return query
+
+def _map(path: Path, dtype, count: int) -> np.ndarray:
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+class RelevanceIndex:
+    def __init__(self, path: str | Path, profile_path: str | None = DEFAULT_PROFILE_PATH):
+        """
+        Hashed TF-IDF matrix of stored listings, kept in a directory of flat files.
+
+        Several processes may open the same directory: writers serialize on a
+        lock file and publish appended rows by replacing meta.json, and readers
+        reopen the files whenever meta.json changes.
+
+        Args:
+            path: Directory holding the matrix files; created on first update
+            profile_path: Text describing the jobs wanted, scored against every
+                listing; None disables profile scores
+        """
+        self.path = Path(path)
+        self.profile_path = profile_path
+        self._matrix: _Matrix | None = None
+        self._meta_stamp = None
+
+    @classmethod
+    def for_database(cls, db_path: str | Path, **kwargs) -> "RelevanceIndex":
+        """Index stored beside a database file, so data/jobs.db uses data/jobs.relevance/."""
+        return cls(Path(db_path).with_suffix(".relevance"), **kwargs)
+
+    def _read_meta(self) -> dict:
+        try:
+            return json.loads((self.path / "meta.json").read_text())
+        except FileNotFoundError:
+            return {"dim": DIM, "rows": 0, "nnz": 0, "df": None}
+
+    def matrix(self) -> _Matrix:
+        """Current view of the matrix, reopened when another process has appended rows."""
+        meta_path = self.path / "meta.json"
+        for _ in range(3):
+            try:
+                stat = meta_path.stat()
+                stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                stamp = None
+            if self._matrix is not None and stamp == self._meta_stamp:
+                return self._matrix
+            meta = self._read_meta()
+            if meta["dim"] != DIM:
+                raise ValueError(f"{self.path} was built with {meta['dim']} features, expected {DIM}; delete it to rebuild")
+            try:
+                self._matrix = _Matrix(self.path, meta)
+            except FileNotFoundError:
+                # A writer replaced the document frequencies between reading meta.json and opening them.
+                continue
+            self._meta_stamp = stamp
+            return self._matrix
+        raise RuntimeError(f"{self.path} kept changing while it was being opened")
+
+    def __len__(self) -> int:
+        return self.matrix().rows
+
+    @contextmanager
+    def _writing(self) -> Iterator[dict]:
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self.path / "lock", "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield self._read_meta()
+
+    def _last_id(self, meta: dict) -> int:
+        """Id of the last published row, read from the files rather than a possibly stale view."""
+        if not meta["rows"]:
+            return 0
+        with open(self.path / "ids.i64", "rb") as handle:
+            handle.seek((meta["rows"] - 1) * 8)
+            return int(np.frombuffer(handle.read(8), dtype=np.int64)[0])
+
+    def append(self, listings: Iterable[tuple[int, str | None, str]]) -> int:
+        """
+        Add listings to the matrix and publish them in one step.
+
+        Listings whose id isn't above the last indexed one are dropped, so two
+        writers that read the same listings never index them twice.
+
+        Args:
+            listings: (listing id, title, content) in increasing id order
+
+        Returns:
+            Number of rows added
+        """
+        with self._writing() as meta:
+            return self._append(meta, listings)
+
+    def _append(self, meta: dict, listings: Iterable[tuple[int, str | None, str]]) -> int:
+        # Called with the lock held and meta just read under it.
+        last_id = self._last_id(meta)
+        rows, nnz = meta["rows"], meta["nnz"]
+        df = np.fromfile(self.path / meta["df"], dtype=np.int32) if meta["df"] else np.zeros(DIM, dtype=np.int32)
+        files = {name: self.path / name for name in ("ids.i64", "indptr.i64", "indices.i32", "data.f32")}
+        # Drop whatever an interrupted writer left past the published end.
+        sizes = {"ids.i64": rows * 8, "indptr.i64": (rows + 1) * 8, "indices.i32": nnz * 4, "data.f32": nnz * 4}
+        for name, file in files.items():
+            with open(file, "ab") as handle:
+                handle.truncate(sizes[name])
+        if rows == 0:
+            files["indptr.i64"].write_bytes(np.zeros(1, dtype=np.int64).tobytes())
+
+        added = 0
+        handles = {name: open(file, "ab") for name, file in files.items()}
+        try:
+            for listing_id, title, content in listings:
+                if listing_id <= last_id:
+                    continue
+                last_id = listing_id
+                indices, weights = term_vector(title, content)
+                nnz += len(indices)
+                df[indices] += 1
+                handles["ids.i64"].write(np.int64(listing_id).tobytes())
+                handles["indptr.i64"].write(np.int64(nnz).tobytes())
+                handles["indices.i32"].write(indices.tobytes())
+                handles["data.f32"].write(weights.tobytes())
+                added += 1
+            for handle in handles.values():
+                handle.flush()
+                os.fsync(handle.fileno())
+        finally:
+            for handle in handles.values():
+                handle.close()
+        if not added:
+            return 0
+
+        # meta.json is replaced last, so readers see either none or all of the new rows.
+        df_name = f"df-{rows + added}.i32"
+        df.tofile(self.path / df_name)
+        temp = self.path / "meta.json.tmp"
+        temp.write_text(json.dumps({"dim": DIM, "rows": rows + added, "nnz": nnz, "df": df_name}))
+        os.replace(temp, self.path / "meta.json")
+        if meta["df"] and meta["df"] != df_name:
+            (self.path / meta["df"]).unlink(missing_ok=True)
+        return added
+
+    def profile(self) -> str | None:
+        """Profile text, or None if no profile is configured."""
+        if not self.profile_path:
+            return None
+        try:
+            text = Path(self.profile_path).read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            return None
+        return text or None
+
+    def score_text(self, text: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Cosine similarity of every indexed listing with free text.
+
+        Returns:
+            Listing ids and their scores, in index order
+        """
+        matrix = self.matrix()
+        return matrix.ids, matrix.cosine(matrix.query(*term_vector(None, text)))
+
+    def similar(self, job_listing_id: int, limit: int = 20) -> list[tuple[int, float]]:
+        """
+        Listings most similar to an indexed listing, best first, excluding itself.
+
+        Returns:
+            (listing id, cosine similarity) pairs; empty if the listing isn't indexed
+        """
+        matrix = self.matrix()
+        position = int(np.searchsorted(matrix.ids, job_listing_id))
+        if position >= matrix.rows or matrix.ids[position] != job_listing_id:
+            return []
+        scores = matrix.cosine(matrix.query(*matrix.row(position)))
+        scores[position] = -1
+        limit = min(limit, matrix.rows - 1)
+        if limit <= 0:
+            return []
+        # Partition first so only the top candidates are sorted.
+        top = np.argpartition(scores, -limit)[-limit:]
+        top = top[np.argsort(scores[top])[::-1]]
+        return [(int(matrix.ids[i]), float(scores[i])) for i in top if scores[i] > 0]
+
+    def update(self, store, batch_size: int = 1000) -> tuple[int, int]:
+        """
+        Index listings stored since the last update and refresh profile scores.
+
+        New listings are scored against the profile as they are indexed. All
+        scores are recomputed when the profile text changes or the corpus has
+        grown by RESCORE_GROWTH since they were, so they stay comparable.
+
+        Args:
+            store: SQLiteStore the listings are read from and scores written to
+            batch_size: Listings read from the database per fetch
+
+        Returns:
+            Tuple of (listings indexed, listings scored)
+        """
+        # The last indexed id is read under the lock, so a concurrent update can't make this one append the same listings.
+        with self._writing() as meta:
+            added = self._append(meta, store.iter_listing_texts(after_id=self._last_id(meta), batch_size=batch_size))
+
+        profile = self.profile()
+        if profile is None:
+            return added, 0
+        matrix = self.matrix()
+        fingerprint = md5(f"{DIM}\n{TITLE_WEIGHT}\n{profile}".encode("utf-8")).hexdigest()[:12]
+        state = store.get_relevance_profile()
+        ids, scores = self.score_text(profile)
+        if state is None or state["fingerprint"] != fingerprint or matrix.rows >= state["listings"] * RESCORE_GROWTH:
+            store.save_relevance_scores(zip(ids.tolist(), scores.tolist()), fingerprint=fingerprint, listings=matrix.rows)
+            return added, matrix.rows
+
+        unscored = np.fromiter(store.iter_unscored_listing_ids(), dtype=np.int64)
+        positions = np.searchsorted(ids, unscored)
+        found = positions < len(ids)
+        found[found] = ids[positions[found]] == unscored[found]
+        positions = positions[found]
+        store.save_relevance_scores(zip(ids[positions].tolist(), scores[positions].tolist()))
+        return added, len(positions)
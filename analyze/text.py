@@ -0,0 +1,118 @@
+import re
+import threading
+import warnings
+from bs4 import BeautifulSoup, MarkupResemblesLocatorWarning
+from pydantic import BaseModel
+
+# Boilerplate job boards append to every description. It carries no signal for
+# scoring but is paid for as input tokens on every call.
+BOILERPLATE_PATTERNS = [
+    # RemoteOK's anti-spam footer
+    re.compile(r"Please mention the word\s+\**\w+\**\s+and tag\s+\S+\s+when applying.*?(?:that read this and see they're human\.?|$)", re.IGNORECASE | re.DOTALL),
+    # LinkedIn-style tracking tags such as #LI-Remote or #LI-DNI
+    re.compile(r"#LI-[\w-]+", re.IGNORECASE),
+    # Equal-opportunity statements
+    re.compile(r"\b(?:we are|is) an? equal (?:employment )?opportunity employer\b[^.]*\.?", re.IGNORECASE),
+]
+
+# Bump whenever normalize_description or BOILERPLATE_PATTERNS change the text
+# sent to OpenAI, so analyses cached from the old text are dropped.
+NORMALIZER_VERSION = 1
+
+_WHITESPACE = re.compile(r"\s+")
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+warnings.filterwarnings("ignore", category=MarkupResemblesLocatorWarning)
+
+class PreparedText(BaseModel):
+    text: str
+    raw_chars: int
+    normalized_chars: int
+    raw_tokens: int
+    tokens: int
+    truncated: bool = False
+
+def normalize_description(raw: str) -> str:
+    """Strip HTML tags and known boilerplate from a job description and collapse whitespace."""
+    if not raw:
+        return ""
+    # Skip the parser entirely for descriptions that are already plain text.
+    text = BeautifulSoup(raw, "html.parser").get_text(" ") if "<" in raw or "&" in raw else raw
+    for pattern in BOILERPLATE_PATTERNS:
+        text = pattern.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap local estimate of how many tokens text costs.
+
+    Counts words and punctuation, charging long words roughly one token per four
+    characters, which tracks BPE tokenizers closely enough for budgeting.
+    """
+    return sum((len(piece) + 3) // 4 for piece in _TOKEN.findall(text))
+
+def truncate_to_tokens(text: str, budget: int) -> tuple[str, bool]:
+    """Cut text at the last whole word that fits within budget tokens."""
+    used = 0
+    for match in _TOKEN.finditer(text):
+        used += (len(match.group()) + 3) // 4
+        if used > budget:
+            return text[:match.start()].rstrip() + " ...", True
+    return text, False
+
+def prepare_description(raw: str, token_budget: int | None = None) -> PreparedText:
+    """
+    Normalise a raw description for the prompt and cap it at token_budget tokens.
+
+    Args:
+        raw: Description as scraped, usually HTML
+        token_budget: Maximum estimated tokens to keep, or None/0 for no cap
+
+    Returns:
+        PreparedText with the prompt text and its raw and normalised sizes
+    """
+    text = normalize_description(raw)
+    normalized_chars = len(text)
+    truncated = False
+    if token_budget:
+        text, truncated = truncate_to_tokens(text, token_budget)
+    return PreparedText(
+        text=text,
+        raw_chars=len(raw or ""),
+        normalized_chars=normalized_chars,
+        raw_tokens=estimate_tokens(raw or ""),
+        tokens=estimate_tokens(text),
+        truncated=truncated
+    )
+
+class TextStats:
+    def __init__(self):
+        """Running totals of description sizes before and after preparation."""
+        self.jobs = 0
+        self.raw_chars = 0
+        self.normalized_chars = 0
+        self.raw_tokens = 0
+        self.tokens = 0
+        self.truncated = 0
+        self._lock = threading.Lock()
+
+    def record(self, prepared: PreparedText):
+        with self._lock:
+            self.jobs += 1
+            self.raw_chars += prepared.raw_chars
+            self.normalized_chars += prepared.normalized_chars
+            self.raw_tokens += prepared.raw_tokens
+            self.tokens += prepared.tokens
+            self.truncated += int(prepared.truncated)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "jobs": self.jobs,
+                "raw_chars": self.raw_chars,
+                "normalized_chars": self.normalized_chars,
+                "raw_tokens": self.raw_tokens,
+                "tokens": self.tokens,
+                "tokens_saved": self.raw_tokens - self.tokens,
+                "truncated": self.truncated
+            }
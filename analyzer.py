@@ -2,6 +2,7 @@ import os
 import argparse
 from store.sqlite import SQLiteStore
 from analyze.analyzer import JobAnalyzer
+from analyze.prefilter import DEFAULT_RULES_PATH
 
 def setup_argparse() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
@@ -17,6 +18,9 @@ Examples:
 
   # Run analyzer with debug logging
   python analyzer.py --debug
+
+  # Keep up to 16 OpenAI requests in flight
+  python analyzer.py --concurrency 16
         """
     )
     
@@ -24,7 +28,60 @@ Examples:
         "--poll-interval",
         type=int,
         default=60,
-        help="Interval in seconds between checking for new jobs (default: 60)"
+        help="Maximum seconds an idle analyzer waits before re-checking for retries (default: 60)"
+    )
+    
+    parser.add_argument(
+        "--lease-timeout",
+        type=float,
+        default=300,
+        help="Seconds a claimed job stays reserved before another worker may retry it (default: 300)"
+    )
+    
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=5,
+        help="Attempts before a failing job is moved to the dead-letter state (default: 5)"
+    )
+    
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Maximum number of jobs analyzed at the same time (default: 4)"
+    )
+    
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=20,
+        help="Number of analyses written to the database per transaction (default: 20)"
+    )
+    
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Call OpenAI for every job even if an identical listing was analyzed before"
+    )
+    
+    parser.add_argument(
+        "--prefilter-rules",
+        default=str(DEFAULT_RULES_PATH),
+        help="JSON rules used to reject obvious mismatches before calling OpenAI (default: analyze/prefilter_rules.json)"
+    )
+    
+    parser.add_argument(
+        "--no-prefilter",
+        action="store_true",
+        help="Send every job to OpenAI without the rules-based pre-filter"
+    )
+    
+    parser.add_argument(
+        "--token-budget",
+        type=int,
+        default=1500,
+        help="Maximum estimated tokens of each description sent to OpenAI, 0 for no cap (default: 1500)"
     )
     
     parser.add_argument(
@@ -47,10 +104,20 @@ def main():
     
     # Initialize store and analyzer
     store = SQLiteStore()
-    analyzer = JobAnalyzer(store)
+    analyzer = JobAnalyzer(
+        store,
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        use_cache=not args.no_cache,
+        prefilter_rules=None if args.no_prefilter else args.prefilter_rules,
+        token_budget=args.token_budget or None,
+        lease_timeout=args.lease_timeout,
+        max_attempts=args.max_attempts
+    )
     
     print("Starting AI Job Analyzer...")
-    print(f"Polling interval: {args.poll_interval} seconds")
+    print(f"Idle re-check interval: {args.poll_interval} seconds")
+    print(f"Concurrency: {args.concurrency}")
     print("Press Ctrl+C to stop")
     print("-" * 50)
     
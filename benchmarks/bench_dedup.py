@@ -0,0 +1,220 @@
+"""
+Measure near-duplicate detection: fingerprint cost, backfill time, and how long
+finding a repost takes with the band indexes compared with scanning every
+stored fingerprint.
+
+Every synthetic listing has a date line, a salary and a tracking link.
+Reposts are made from stored listings by changing those, as boards do when
+they repost a role, or by editing one word of the text. Fresh listings drawn
+from the same vocabulary measure false positives.
+
+Usage:
+    python -m benchmarks.bench_dedup --sizes 10k,100k --probes 500
+"""
+import argparse
+import json
+import random
+import re
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from benchmarks.common import parse_sizes
+from store import simhash
+from store.sqlite import SQLiteStore
+
+TITLES = ["Backend Engineer", "Senior Go Developer", "Site Reliability Engineer", "Data Engineer", "Product Designer", "Account Executive"]
+SYLLABLES = ["ka", "lo", "mi", "ren", "tas", "vo", "qui", "zan", "pel", "dor", "ix", "mu", "sel", "tra", "no", "bex", "fu", "gar"]
+# Boilerplate each company repeats in all of its listings.
+COMPANIES = 200
+TEMPLATE_WORDS = 60
+
+MONTHS = ["June", "July", "August"]
+
+def date_line(rng: random.Random) -> str:
+    return f"Posted {rng.choice(MONTHS)} {rng.randint(1, 28)}, 2025"
+
+def salary_line(rng: random.Random) -> str:
+    return f"${rng.randint(60, 140)}k - ${rng.randint(150, 220)}k"
+
+def tracking_ref(rng: random.Random) -> str:
+    return f"ref={rng.getrandbits(48):x}"
+
+# How a repost differs from the listing it copies.
+MUTATIONS = {
+    "date_line": lambda rng, corpus, content: re.sub(r"Posted \w+ \d+, 2025", date_line(rng), content),
+    "salary": lambda rng, corpus, content: re.sub(r"\$\d+k - \$\d+k", salary_line(rng), content),
+    "tracking_link": lambda rng, corpus, content: re.sub(r"ref=[0-9a-f]+", tracking_ref(rng), content),
+    "all_three": lambda rng, corpus, content: MUTATIONS["date_line"](rng, corpus, MUTATIONS["salary"](rng, corpus, MUTATIONS["tracking_link"](rng, corpus, content))),
+    # A real edit to the text; not every such repost is expected to be caught.
+    "one_word_edited": lambda rng, corpus, content: one_word_edited(rng, corpus, content),
+}
+
+class Corpus:
+    def __init__(self, seed: int, vocabulary: int = 30000):
+        """Listings from a Zipf-weighted made-up vocabulary, each with its company's boilerplate."""
+        self.rng = random.Random(seed)
+        words = set()
+        while len(words) < vocabulary:
+            words.add("".join(self.rng.choice(SYLLABLES) for _ in range(self.rng.randint(2, 4))))
+        self.words = sorted(words)
+        self.cumulative = []
+        total = 0.0
+        for rank in range(len(self.words)):
+            total += 1 / (rank + 1)
+            self.cumulative.append(total)
+        self.templates = [" ".join(self.sample(TEMPLATE_WORDS)) for _ in range(COMPANIES)]
+
+    def sample(self, count: int) -> list[str]:
+        return self.rng.choices(self.words, cum_weights=self.cumulative, k=count)
+
+    def listing(self, i: int, words: int = 220) -> tuple[str, str]:
+        rng = self.rng
+        title = f"{rng.choice(TITLES)} {i}"
+        content = (
+            f"<p>{date_line(rng)}</p><p>{' '.join(self.sample(words))}</p>"
+            f"<p>Salary: {salary_line(rng)}</p><p>{self.templates[i % COMPANIES]}</p>"
+            f"<p>Apply at https://jobs.example.com/apply?{tracking_ref(rng)}&utm_source=feed</p>"
+        )
+        return title, content
+
+def one_word_edited(rng: random.Random, corpus: Corpus, content: str) -> str:
+    words = content.split(" ")
+    index = rng.randrange(4, len(words) - 12)
+    words[index] = corpus.sample(1)[0]
+    return " ".join(words)
+
+def create_corpus(path: Path, corpus: Corpus, rows: int):
+    SQLiteStore(path).close()
+    conn = sqlite3.connect(str(path))
+
+    def generate():
+        for i in range(rows):
+            title, content = corpus.listing(i)
+            yield (f"https://example.com/jobs/{i}", content, f"{i:032x}", "2025-01-01T00:00:00+00:00", "2025-01-01T00:00:00+00:00", title)
+
+    # Bulk load without the full-text triggers; search isn't measured here.
+    triggers = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'job_listings_fts_%'").fetchall()
+    for (sql,) in triggers:
+        conn.execute(f"DROP TRIGGER {sql.split()[2]}")
+    conn.executemany(
+        "INSERT INTO job_listings (url, content, checksum, published_at, created_at, title) VALUES (?, ?, ?, ?, ?, ?)",
+        generate()
+    )
+    for (sql,) in triggers:
+        conn.execute(sql)
+    conn.commit()
+    conn.close()
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def run(sizes: list[int], probes: int, scan_probes: int, workdir: Path, seed: int) -> list[dict]:
+    results = []
+    band_sql = "SELECT COUNT(*) FROM job_fingerprints WHERE " + " OR ".join(f"band{band} = ?" for band in range(simhash.BANDS))
+    for size in sizes:
+        path = workdir / f"dedup_{size}.db"
+        print(f"\nBuilding {size:,} synthetic listings...")
+        corpus = Corpus(seed)
+        create_corpus(path, corpus, size)
+
+        store = SQLiteStore(path)
+        start = time.perf_counter()
+        indexed, linked = store.index_near_duplicates()
+        backfill_s = time.perf_counter() - start
+        print(f"Backfill fingerprinted {indexed:,} listings in {backfill_s:.1f} s ({indexed / backfill_s:,.0f}/s), {linked} linked")
+
+        conn = store._get_connection()
+        rng = random.Random(seed + 1)
+        originals = conn.execute(
+            "SELECT id, title, content FROM job_listings WHERE id IN (%s)" % ",".join("?" * probes),
+            rng.sample(range(1, size + 1), probes)
+        ).fetchall()
+
+        # Reposts of stored listings should be found; fresh listings should not.
+        cases = []
+        fingerprint_ms = []
+        for job_id, title, content in originals:
+            kind = rng.choice(list(MUTATIONS))
+            repost = MUTATIONS[kind](rng, corpus, content)
+            start = time.perf_counter()
+            fingerprint = simhash.simhash(title, repost)
+            fingerprint_ms.append((time.perf_counter() - start) * 1000)
+            cases.append((kind, job_id, fingerprint))
+        for i in range(probes):
+            title, content = corpus.listing(size + i)
+            cases.append(("fresh", None, simhash.simhash(title, content)))
+
+        cursor = conn.cursor()
+        lookup_ms = []
+        candidates = []
+        found: dict[str, list[bool]] = {}
+        for kind, expected, fingerprint in cases:
+            if fingerprint is None:
+                found.setdefault(kind, []).append(False)
+                continue
+            start = time.perf_counter()
+            match = store._closest_fingerprint(cursor, fingerprint)
+            lookup_ms.append((time.perf_counter() - start) * 1000)
+            candidates.append(conn.execute(band_sql, simhash.bands(fingerprint)).fetchone()[0])
+            found.setdefault(kind, []).append(match is not None and (expected is None or match == expected))
+
+        # What a lookup costs without the bands: compare against every stored fingerprint.
+        scan_ms = []
+        for _, _, fingerprint in cases[:scan_probes]:
+            if fingerprint is None:
+                continue
+            start = time.perf_counter()
+            min(
+                (simhash.distance(fingerprint, simhash.from_sql(other)), other_id)
+                for other_id, other in conn.execute("SELECT job_listing_id, fingerprint FROM job_fingerprints WHERE fingerprint IS NOT NULL")
+            )
+            scan_ms.append((time.perf_counter() - start) * 1000)
+
+        recall = {kind: round(sum(hits) / len(hits), 3) for kind, hits in found.items() if kind != "fresh"}
+        false_positives = sum(found.get("fresh", []))
+        result = {
+            "rows": size,
+            "backfill_s": round(backfill_s, 2),
+            "fingerprint_us": round(statistics.median(fingerprint_ms) * 1000, 1),
+            "band_lookup_p50_ms": round(percentile(lookup_ms, 0.5), 3),
+            "band_lookup_p95_ms": round(percentile(lookup_ms, 0.95), 3),
+            "scan_lookup_p50_ms": round(percentile(scan_ms, 0.5), 3),
+            "candidates_mean": round(statistics.mean(candidates), 2),
+            "candidates_max": max(candidates),
+            "recall": recall,
+            "false_positives": false_positives,
+            "fresh_probes": probes,
+        }
+        results.append(result)
+        print(f"  fingerprint {result['fingerprint_us']:.0f} us   band lookup p50 {result['band_lookup_p50_ms']:.3f} ms "
+              f"p95 {result['band_lookup_p95_ms']:.3f} ms   full scan p50 {result['scan_lookup_p50_ms']:.1f} ms")
+        print(f"  candidates per lookup {result['candidates_mean']:.2f} (max {result['candidates_max']})   "
+              f"false positives {false_positives}/{probes}")
+        print("  recall " + "   ".join(f"{kind} {value:.1%}" for kind, value in recall.items()))
+        store.close()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SimHash near-duplicate lookups against a full fingerprint scan")
+    parser.add_argument("--sizes", default="10k,100k", help="Comma-separated corpus sizes (default: 10k,100k)")
+    parser.add_argument("--probes", type=int, default=500, help="Reposts and fresh listings looked up per size (default: 500)")
+    parser.add_argument("--scan-probes", type=int, default=20, help="Lookups timed with the full scan baseline (default: 20)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed so runs compare like with like (default: 42)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_dedup_"))
+    try:
+        results = run(parse_sizes(args.sizes), args.probes, args.scan_probes, workdir, args.seed)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
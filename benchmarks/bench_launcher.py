@@ -0,0 +1,146 @@
+"""
+Compare main.py's in-process supervisor with the --subprocess launcher: time
+until the web interface answers, resident memory of the whole process tree,
+and what is left running after SIGTERM.
+
+Runs the analyzer and web interface against an empty temporary database. The
+scraper is left out because the subprocess launcher always fetches the real
+RemoteOK feed. Linux only, as memory is read from /proc.
+
+Usage:
+    python -m benchmarks.bench_launcher --repeat 3 --output results.json
+"""
+import argparse
+import json
+import os
+import shutil
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+LAUNCHERS = {
+    "subprocess": ["--subprocess"],
+    "supervisor": [],
+}
+
+def descendants(pid: int) -> list[int]:
+    """pid and every process below it, found through /proc/<pid>/task/*/children."""
+    pids = [pid]
+    for current in pids:
+        for task in Path(f"/proc/{current}/task").glob("*"):
+            try:
+                pids.extend(int(child) for child in (task / "children").read_text().split())
+            except OSError:
+                continue
+    return pids
+
+def rss_mb(pids: list[int]) -> float:
+    total_kb = 0
+    for pid in pids:
+        try:
+            for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    total_kb += int(line.split()[1])
+        except OSError:
+            continue
+    return total_kb / 1024
+
+def wait_until_ready(url: str, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+def run_once(launcher: str, workdir: Path, port: int, settle: float) -> dict:
+    env = dict(os.environ, OPENAI_API_KEY="benchmark", METRICS_DIR=str(workdir / "metrics"), PYTHONUNBUFFERED="1")
+    env.pop("JOBS_DB_PATH", None)
+    command = [sys.executable, str(ROOT / "main.py"), "--analyzer", "--web", *LAUNCHERS[launcher]]
+    if launcher == "supervisor":
+        command += ["--port", str(port)]
+
+    start = time.perf_counter()
+    # Own session so everything the launcher started can be cleaned up afterwards.
+    process = subprocess.Popen(command, cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+    try:
+        if not wait_until_ready(f"http://127.0.0.1:{port}/", timeout=60):
+            raise RuntimeError(f"{launcher} launcher did not serve the web interface within 60 seconds")
+        ready = time.perf_counter() - start
+        time.sleep(settle)
+        pids = descendants(process.pid)
+        memory = rss_mb(pids)
+
+        start = time.perf_counter()
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+            exited = True
+        except subprocess.TimeoutExpired:
+            exited = False
+        stop_seconds = time.perf_counter() - start
+        time.sleep(0.5)
+        left_running = [pid for pid in pids[1:] if Path(f"/proc/{pid}").exists()]
+    finally:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        process.wait()
+
+    return {
+        "launcher": launcher,
+        "ready_s": round(ready, 3),
+        "processes": len(pids),
+        "rss_mb": round(memory, 1),
+        "launcher_exited": exited,
+        "stop_s": round(stop_seconds, 3),
+        "left_running": len(left_running),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup time and memory of the subprocess launcher vs. the in-process supervisor")
+    parser.add_argument("--repeat", type=int, default=3, help="Launches per mode; medians are reported (default: 3)")
+    parser.add_argument("--settle", type=float, default=2.0, help="Seconds to let components finish starting before reading memory (default: 2)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    # The subprocess launcher always runs list.py on port 5000.
+    port = 5000
+    results = []
+    for launcher in LAUNCHERS:
+        runs = []
+        for _ in range(args.repeat):
+            workdir = Path(tempfile.mkdtemp(prefix="bench_launcher_"))
+            try:
+                runs.append(run_once(launcher, workdir, port, args.settle))
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+        result = {
+            "launcher": launcher,
+            "ready_s": round(statistics.median(run["ready_s"] for run in runs), 3),
+            "processes": runs[-1]["processes"],
+            "rss_mb": round(statistics.median(run["rss_mb"] for run in runs), 1),
+            "stop_s": round(statistics.median(run["stop_s"] for run in runs), 3),
+            "clean_exits": sum(run["launcher_exited"] and not run["left_running"] for run in runs),
+            "runs": len(runs),
+        }
+        results.append(result)
+        print(f"  {launcher:<11} ready {result['ready_s']:6.2f} s   {result['processes']} processes   "
+              f"{result['rss_mb']:7.1f} MB   stop {result['stop_s']:5.2f} s   clean exits {result['clean_exits']}/{result['runs']}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({"config": vars(args), "results": results}, indent=2))
+
+if __name__ == "__main__":
+    main()
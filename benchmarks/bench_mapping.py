@@ -0,0 +1,91 @@
+"""
+Per-row cost of turning database rows and RemoteOK items into job objects.
+
+Usage:
+    python -m benchmarks.bench_mapping --rows 20000
+"""
+import argparse
+import json
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from benchmarks.common import create_legacy_db
+from scrape.providers.models import JobListing
+from scrape.providers.remoteok import RemoteOKScraper
+from store.sqlite import JOB_COLUMNS, SQLiteStore
+
+def validated_listing(row) -> JobListing:
+    """How rows were mapped before: a fully validated JobListing per row."""
+    return JobListing(
+        id=row['id'],
+        url=row['url'],
+        content=row['content'],
+        published_at=datetime.fromisoformat(row['published_at']),
+        created_at=datetime.fromisoformat(row['created_at']),
+        salary_min=row['salary_min'],
+        salary_max=row['salary_max'],
+        location=row['location'],
+        title=row['title']
+    )
+
+def remoteok_items(count: int) -> list[dict]:
+    return [
+        {
+            "id": str(i),
+            "position": f"Senior Backend Engineer {i}",
+            "url": f"https://remoteok.com/remote-jobs/{i}",
+            "description": f"<p>Build services in Go and Python. Listing {i}.</p>",
+            "date": "1735689600",
+            "salary": "$80k-$120k",
+            "location": "Europe"
+        }
+        for i in range(count)
+    ]
+
+def per_row_us(fn, items, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(items) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-row mapping cost in the store and the RemoteOK provider")
+    parser.add_argument("--rows", type=int, default=20000, help="Rows or items mapped per run (default: 20000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the fastest is reported (default: 3)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_mapping_"))
+    try:
+        path = create_legacy_db(workdir / "jobs.db", args.rows)
+        store = SQLiteStore(path)
+        rows = store._get_connection().execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM job_listings").fetchall()
+        provider = RemoteOKScraper(use_cache=False)
+        items = remoteok_items(args.rows)
+
+        cases = {
+            "store_row_validated_model": per_row_us(validated_listing, rows, args.repeat),
+            "store_row_record": per_row_us(store._row_to_job, rows, args.repeat),
+            "remoteok_item_validated_model": per_row_us(provider._parse_item, items, args.repeat),
+        }
+        store.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    for name, us in cases.items():
+        print(f"  {name:<32} {us:8.2f} us/row   {1e6 / us:12,.0f} rows/s")
+    speedup = cases["store_row_validated_model"] / cases["store_row_record"]
+    print(f"  store row mapping speedup x{speedup:.1f}")
+
+    if args.output:
+        results = {name: round(us, 3) for name, us in cases.items()}
+        results["rows"] = args.rows
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Measure peak RSS of reading the unanalyzed backlog with fetchall() against
+the batched iterators, with and without descriptions.
+
+Usage:
+    python -m benchmarks.bench_memory --sizes 10k,50k,200k
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from benchmarks.common import create_legacy_db, parse_sizes
+from store.sqlite import SQLiteStore
+
+MODES = {
+    "fetchall": lambda store: store.get_unanalyzed_jobs(),
+    "iter_with_content": lambda store: store.iter_unanalyzed_jobs(),
+    "iter_deferred_content": lambda store: store.iter_unanalyzed_jobs(include_content=False),
+}
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def measure_mode(db_path: str, mode: str, results):
+    store = SQLiteStore(db_path)
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    count = sum(1 for _ in MODES[mode](store))
+    results.put({
+        "mode": mode,
+        "jobs": count,
+        "seconds": round(time.perf_counter() - start, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "growth_mb": round(peak_rss_mb() - baseline, 1)
+    })
+
+def run(sizes: list[int], content_size: int, workdir: Path) -> list[dict]:
+    # Every measurement runs in a fresh interpreter so peaks don't carry over.
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for size in sizes:
+        print(f"\nBuilding a backlog of {size:,} unanalyzed listings...")
+        path = create_legacy_db(workdir / f"backlog_{size}.db", size, analyzed_fraction=0, content_size=content_size)
+        SQLiteStore(path).close()
+        for mode in MODES:
+            queue = context.Queue()
+            process = context.Process(target=measure_mode, args=(str(path), mode, queue))
+            process.start()
+            result = queue.get()
+            process.join()
+            result["backlog"] = size
+            results.append(result)
+            print(f"  {mode:<22} peak {result['peak_rss_mb']:8.1f} MB   growth {result['growth_mb']:8.1f} MB   {result['seconds']:6.2f} s")
+        path.unlink()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark peak memory of reading the analysis backlog")
+    parser.add_argument("--sizes", default="10k,50k,200k", help="Comma-separated backlog sizes (default: 10k,50k,200k)")
+    parser.add_argument("--content-size", type=int, default=3000, help="Characters per synthetic description (default: 3000)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_memory_"))
+    try:
+        results = run(parse_sizes(args.sizes), args.content_size, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
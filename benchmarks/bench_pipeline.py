@@ -0,0 +1,140 @@
+"""
+Offline end-to-end benchmark of the scrape, store, analyze and list pipeline.
+
+Runs against a synthetic RemoteOK feed and a fake OpenAI Responses endpoint,
+so no network access or API key is needed.
+
+Usage:
+    python -m benchmarks.bench_pipeline --sizes 1k,10k --output results.json
+"""
+import argparse
+import importlib
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from contextlib import redirect_stdout
+from itertools import islice
+from pathlib import Path
+from benchmarks.common import parse_sizes
+from benchmarks.fakes import FakeOpenAI, generate_remoteok_items, serve_remoteok
+from scrape.known import KnownURLs
+from scrape.providers.remoteok import RemoteOKScraper
+from store.sqlite import SQLiteStore
+
+def run_size(size: int, args, workdir: Path) -> dict:
+    result = {"size": size}
+    items = generate_remoteok_items(size, html_kb=args.html_kb)
+    server, api_url = serve_remoteok(items)
+    result["feed_mb"] = round(len(json.dumps(items)) / 2**20, 2)
+    try:
+        start = time.perf_counter()
+        with redirect_stdout(open(os.devnull, "w")):
+            jobs = list(RemoteOKScraper(api_url=api_url, use_cache=False).fetch_jobs())
+        elapsed = time.perf_counter() - start
+        result["parse_items_per_s"] = round(len(jobs) / elapsed, 1)
+        result["parse_mb_per_s"] = round(result["feed_mb"] / elapsed, 2)
+
+        db_path = workdir / f"pipeline_{size}.db"
+        store = SQLiteStore(db_path)
+        start = time.perf_counter()
+        ingest = store.insert_jobs(jobs, batch_size=500)
+        result["ingest_rows_per_s"] = round(ingest.inserted / (time.perf_counter() - start), 1)
+        del jobs
+
+        # The same feed again, as the next scheduled run sees it: every item is already stored.
+        start = time.perf_counter()
+        known = KnownURLs(store.iter_job_urls())
+        result["known_index_load_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        provider = RemoteOKScraper(api_url=api_url, use_cache=False)
+        provider.begin_run(known)
+        start = time.perf_counter()
+        with redirect_stdout(open(os.devnull, "w")):
+            reparsed = sum(1 for _ in provider.fetch_jobs())
+        result["rescrape_items_per_s"] = round(provider.items / (time.perf_counter() - start), 1)
+        result["rescrape_parsed"] = reparsed
+    finally:
+        server.shutdown()
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        store.get_unanalyzed_jobs()
+        timings.append((time.perf_counter() - start) * 1000)
+    result["get_unanalyzed_jobs_ms"] = round(statistics.median(timings), 2)
+
+    # Imported late so the client picks up the fake endpoint from the environment.
+    from analyze import openai as openai_module
+    from analyze.analyzer import JobAnalyzer
+    fake = FakeOpenAI(latency=args.latency, error_rate=args.error_rate)
+    os.environ["OPENAI_BASE_URL"] = fake.start()
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    openai_module._client = None
+    try:
+        analyzer = JobAnalyzer(store, concurrency=args.concurrency, use_cache=False)
+        batch = islice(store.iter_unanalyzed_jobs(include_content=False), args.analyze_limit)
+        start = time.perf_counter()
+        with redirect_stdout(open(os.devnull, "w")):
+            saved, failed = analyzer.analyze_jobs(batch)
+        elapsed = time.perf_counter() - start
+    finally:
+        fake.stop()
+        openai_module._client = None
+    result["analyzer_jobs_per_s"] = round((saved + failed) / elapsed, 1)
+    result["analyzer_saved"] = saved
+    result["analyzer_failed"] = failed
+    result["analyzer_llm_requests"] = fake.requests
+    store.close()
+
+    web = importlib.import_module("list")
+    web.DB_PATH = str(db_path)
+    web._store = None
+    web.page_cache.max_entries = 0
+    client = web.app.test_client()
+    client.get("/")
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        response = client.get("/")
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.status_code
+    result["list_render_ms"] = round(statistics.median(timings), 2)
+    web._store.close()
+    web._store = None
+
+    db_path.unlink()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end pipeline benchmark")
+    parser.add_argument("--sizes", default="1k,10k", help="Comma-separated feed sizes (default: 1k,10k)")
+    parser.add_argument("--html-kb", type=float, default=2.0, help="Approximate KiB of HTML per description (default: 2)")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds the fake OpenAI takes per request (default: 0.02)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of fake OpenAI requests that fail (default: 0)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Analyzer concurrency (default: 8)")
+    parser.add_argument("--analyze-limit", type=int, default=500, help="Jobs analyzed per size (default: 500)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per latency measurement; the median is reported (default: 5)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_pipeline_"))
+    results = []
+    try:
+        for size in parse_sizes(args.sizes):
+            print(f"\nRunning pipeline with {size:,} synthetic listings...")
+            result = run_size(size, args, workdir)
+            results.append(result)
+            for name, value in result.items():
+                if name != "size":
+                    print(f"  {name:<26} {value}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        config = {name: value for name, value in vars(args).items() if name != "output"}
+        Path(args.output).write_text(json.dumps({"config": config, "results": results}, indent=2))
+
+if __name__ == "__main__":
+    main()
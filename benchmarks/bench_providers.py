@@ -0,0 +1,177 @@
+"""
+Exercise the provider HTTP framework against a local paginated job board:
+connection reuse compared with a new connection per request, following
+pagination by Link header and by page number, keeping under a board's rate
+limit compared with being throttled, the per-host concurrency cap, and
+retries on 503.
+
+Usage:
+    python -m benchmarks.bench_providers --pages 200 --throttle-pages 10
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Iterator
+import requests
+from benchmarks.fakes import FakeBoard, generate_remoteok_items
+from scrape.providers.base import BaseScraper, NextPage, next_link, page_number
+from scrape.providers.client import HostPolicy, HTTPClient
+from scrape.providers.models import JobListing
+
+class BoardScraper(BaseScraper):
+    """A provider for a paginated board, as GolangProjects and most other boards need."""
+
+    def __init__(self, url: str, client: HTTPClient, next_page: NextPage = next_link, use_cache: bool = True):
+        self.url = url
+        self.client = client
+        self.next_page = next_page
+
+    def fetch_jobs(self) -> Iterator[JobListing]:
+        params = None if self.next_page is next_link else {"page": 1}
+        for response in self.paginate(self.url, params=params, next_page=self.next_page):
+            for item in response.json():
+                published_at = datetime.fromtimestamp(item["epoch"], UTC)
+                if self.already_stored(item["url"], published_at):
+                    continue
+                yield JobListing(
+                    url=item["url"],
+                    content=item["description"],
+                    published_at=published_at,
+                    created_at=datetime.now(UTC),
+                    location=item["location"],
+                    title=item["position"]
+                )
+
+def unpooled_pages(url: str) -> int:
+    """Follow the Link headers with module-level requests.get, as providers did before the shared client."""
+    pages = 0
+    while url:
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+        pages += 1
+        link = response.links.get("next", {}).get("url")
+        url = requests.compat.urljoin(response.url, link) if link else None
+    return pages
+
+def unlimited(**options) -> HTTPClient:
+    return HTTPClient(policy=HostPolicy(rate=None, concurrency=64), **options)
+
+def timed_fetch(provider: BaseScraper) -> tuple[int, float]:
+    start = time.perf_counter()
+    count = sum(1 for _ in provider.fetch_jobs())
+    return count, time.perf_counter() - start
+
+def quiet_fetch(provider: BaseScraper) -> tuple[int, float]:
+    # Retries are reported on stdout; keep them out of the results.
+    with redirect_stdout(open(os.devnull, "w")):
+        return timed_fetch(provider)
+
+def run(args) -> dict:
+    results = {}
+    items = generate_remoteok_items(args.pages * args.page_size, html_kb=args.html_kb)[1:]
+    board = FakeBoard(items, page_size=args.page_size)
+    url = board.start()
+    try:
+        # Connection reuse: every page on one keep-alive connection vs. a new connection each.
+        count, pooled_s = quiet_fetch(BoardScraper(url, unlimited()))
+        pooled_connections = board.connections
+        board.reset()
+        start = time.perf_counter()
+        pages = unpooled_pages(url)
+        unpooled_s = time.perf_counter() - start
+        results["connection_reuse"] = {
+            "pages": pages,
+            "items": count,
+            "pooled_ms_per_page": round(pooled_s * 1000 / pages, 3),
+            "pooled_connections": pooled_connections,
+            "unpooled_ms_per_page": round(unpooled_s * 1000 / pages, 3),
+            "unpooled_connections": board.connections,
+        }
+        print(f"Pagination over {pages} pages: {count} of {len(items)} items")
+        print(f"  shared pool {pooled_s * 1000 / pages:.2f} ms/page over {pooled_connections} connection(s)   "
+              f"new connection per page {unpooled_s * 1000 / pages:.2f} ms/page over {board.connections}")
+
+        # The same board paged by number until an empty page.
+        count, _ = quiet_fetch(BoardScraper(url, unlimited(), next_page=page_number(page_size=args.page_size)))
+        results["page_number_items"] = count
+        print(f"  page-number pagination: {count} items")
+        assert results["connection_reuse"]["items"] == len(items) and count == len(items), "pagination lost items"
+
+        # Concurrency cap: several providers paging the same host at once.
+        board.latency = args.latency
+        for cap in (1, args.concurrency):
+            board.reset()
+            client = HTTPClient(policy=HostPolicy(rate=None, concurrency=cap))
+            providers = [BoardScraper(url, client) for _ in range(args.threads)]
+            threads = [threading.Thread(target=timed_fetch, args=(provider,)) for provider in providers]
+            start = time.perf_counter()
+            with redirect_stdout(open(os.devnull, "w")):
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            elapsed = time.perf_counter() - start
+            results[f"concurrency_cap_{cap}"] = {"max_in_flight": board.max_in_flight, "seconds": round(elapsed, 2)}
+            print(f"{args.threads} providers on one host, cap {cap}: at most {board.max_in_flight} requests in flight, {elapsed:.2f} s")
+        board.latency = 0.0
+    finally:
+        board.stop()
+
+    # Throttling: a board allowing `rate` requests per second, paged with and without a matching limit.
+    small = items[:args.throttle_pages * args.page_size]
+    for label, policy in (
+        ("unlimited", HostPolicy(rate=None)),
+        ("rate_limited", HostPolicy(rate=args.rate * 0.9)),
+    ):
+        board = FakeBoard(small, page_size=args.page_size, rate=args.rate)
+        url = board.start()
+        try:
+            count, elapsed = quiet_fetch(BoardScraper(url, HTTPClient(policy=policy, retries=args.throttle_pages * 2)))
+        finally:
+            board.stop()
+        results[f"throttle_{label}"] = {
+            "items": count,
+            "seconds": round(elapsed, 2),
+            "responses_429": board.statuses.get(429, 0),
+            "responses_200": board.statuses.get(200, 0),
+        }
+        print(f"Board allowing {args.rate:g} req/s, client {label.replace('_', ' ')}: {count} items in {elapsed:.2f} s, "
+              f"{board.statuses.get(429, 0)} throttled responses")
+
+    # Retries: a board failing a share of requests with 503 still yields every page.
+    board = FakeBoard(items, page_size=args.page_size, error_rate=args.error_rate)
+    url = board.start()
+    try:
+        count, elapsed = quiet_fetch(BoardScraper(url, unlimited(backoff=0.01)))
+    finally:
+        board.stop()
+    results["retry_503"] = {"items": count, "responses_503": board.statuses.get(503, 0), "seconds": round(elapsed, 2)}
+    print(f"Board failing {args.error_rate:.0%} of requests with 503: {count} of {len(items)} items, "
+          f"{board.statuses.get(503, 0)} retried, {elapsed:.2f} s")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled, rate-limited and retried provider requests against a local job board")
+    parser.add_argument("--pages", type=int, default=200, help="Pages served by the board (default: 200)")
+    parser.add_argument("--page-size", type=int, default=20, help="Items per page (default: 20)")
+    parser.add_argument("--html-kb", type=float, default=1.0, help="Approximate size of each description in KiB (default: 1.0)")
+    parser.add_argument("--threads", type=int, default=6, help="Providers paging the same host at once (default: 6)")
+    parser.add_argument("--concurrency", type=int, default=3, help="Per-host cap compared with a cap of 1 (default: 3)")
+    parser.add_argument("--latency", type=float, default=0.005, help="Seconds each page takes in the concurrency test (default: 0.005)")
+    parser.add_argument("--rate", type=float, default=20, help="Requests per second the throttling board allows (default: 20)")
+    parser.add_argument("--throttle-pages", type=int, default=10, help="Pages fetched in the throttling test (default: 10)")
+    parser.add_argument("--error-rate", type=float, default=0.2, help="Fraction of requests failed with 503 in the retry test (default: 0.2)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
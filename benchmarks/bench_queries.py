@@ -0,0 +1,101 @@
+"""
+Compare hot query latency on the legacy schema against the migrated one.
+
+Usage:
+    python -m benchmarks.bench_queries --sizes 10k,100k,1m
+"""
+import argparse
+import json
+import shutil
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from benchmarks.common import create_legacy_db, measure, parse_sizes
+from store.sqlite import SQLiteStore
+
+LEGACY_QUERIES = {
+    "pending_count": """
+        SELECT COUNT(*) FROM job_listings jl
+        LEFT JOIN analyzed_jobs aj ON jl.id = aj.job_listing_id
+        WHERE aj.job_listing_id IS NULL
+    """,
+    "unanalyzed_jobs": """
+        SELECT jl.* FROM job_listings jl
+        LEFT JOIN analyzed_jobs aj ON jl.id = aj.job_listing_id
+        WHERE aj.job_listing_id IS NULL
+    """,
+    "list_recent": """
+        SELECT jl.title, jl.url, aj.is_remote_score, aj.is_applicable_score, aj.is_european_score, aj.analyzed_at
+        FROM job_listings jl JOIN analyzed_jobs aj ON jl.id = aj.job_listing_id
+        ORDER BY aj.analyzed_at DESC LIMIT 100
+    """,
+    "top_ai_score": """
+        SELECT jl.title, jl.url, aj.analyzed_at
+        FROM job_listings jl JOIN analyzed_jobs aj ON jl.id = aj.job_listing_id
+        ORDER BY (aj.is_remote_score + aj.is_applicable_score + aj.is_european_score) / 3.0 DESC LIMIT 100
+    """,
+    "recently_published": "SELECT id, title FROM job_listings ORDER BY published_at DESC LIMIT 100",
+}
+
+MIGRATED_QUERIES = {
+    "pending_count": "SELECT COUNT(*) FROM job_listings WHERE analysis_status = 'pending'",
+    "unanalyzed_jobs": "SELECT * FROM job_listings WHERE analysis_status = 'pending'",
+    "list_recent": LEGACY_QUERIES["list_recent"],
+    "top_ai_score": """
+        SELECT jl.title, jl.url, aj.analyzed_at
+        FROM job_listings jl JOIN analyzed_jobs aj ON jl.id = aj.job_listing_id
+        ORDER BY aj.ai_score DESC LIMIT 100
+    """,
+    "recently_published": LEGACY_QUERIES["recently_published"],
+}
+
+def run(sizes: list[int], repeat: int, workdir: Path) -> list[dict]:
+    results = []
+    for size in sizes:
+        print(f"\nBuilding {size:,} synthetic listings...")
+        legacy_path = create_legacy_db(workdir / f"legacy_{size}.db", size)
+        migrated_path = workdir / f"migrated_{size}.db"
+        shutil.copy(legacy_path, migrated_path)
+
+        start = time.perf_counter()
+        SQLiteStore(migrated_path).close()
+        migration_ms = (time.perf_counter() - start) * 1000
+        print(f"Migrating legacy database took {migration_ms:.0f} ms")
+
+        legacy = sqlite3.connect(str(legacy_path))
+        migrated = sqlite3.connect(str(migrated_path))
+        for name in LEGACY_QUERIES:
+            before = measure(lambda: legacy.execute(LEGACY_QUERIES[name]).fetchall(), repeat)
+            after = measure(lambda: migrated.execute(MIGRATED_QUERIES[name]).fetchall(), repeat)
+            results.append({
+                "rows": size,
+                "query": name,
+                "legacy_ms": round(before, 3),
+                "migrated_ms": round(after, 3),
+                "speedup": round(before / after, 1) if after else None,
+                "migration_ms": round(migration_ms, 1)
+            })
+            print(f"  {name:<20} legacy {before:10.2f} ms   migrated {after:10.2f} ms   x{before / after if after else 0:.1f}")
+        legacy.close()
+        migrated.close()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hot store queries before and after migrations")
+    parser.add_argument("--sizes", default="10k,100k,1m", help="Comma-separated table sizes (default: 10k,100k,1m)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query; the median is reported (default: 5)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_queries_"))
+    try:
+        results = run(parse_sizes(args.sizes), args.repeat, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
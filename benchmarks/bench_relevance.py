@@ -0,0 +1,167 @@
+"""
+Measure the local relevance index: building it, appending a scrape's worth of
+listings compared with rebuilding, opening it in a fresh process, and scoring
+the profile and "similar jobs" queries with numpy compared with a pure Python
+loop over term dictionaries.
+
+Usage:
+    python -m benchmarks.bench_relevance --sizes 10k,100k
+"""
+import argparse
+import json
+import math
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from analyze import relevance
+from analyze.relevance import RelevanceIndex
+from benchmarks.bench_search import create_corpus
+from benchmarks.common import measure, parse_sizes
+from store.sqlite import SQLiteStore
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Run in a fresh interpreter: time to import, map the files and answer the first query.
+OPEN_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+from analyze.relevance import RelevanceIndex
+index = RelevanceIndex(sys.argv[1], profile_path=None)
+matrix = index.matrix()
+opened = time.perf_counter()
+index.similar(int(matrix.ids[0]))
+print(opened - start, time.perf_counter() - opened)
+"""
+
+def python_scores(rows: list[tuple[int, str | None, str]], profile: str) -> list[float]:
+    """The same TF-IDF cosine computed with dictionaries, as it would be without numpy."""
+    vectors = []
+    df: dict[int, int] = {}
+    for _, title, content in rows:
+        counts: dict[int, int] = {}
+        for token in relevance.tokens(title):
+            column = relevance._feature_ids[token]
+            counts[column] = counts.get(column, 0) + relevance.TITLE_WEIGHT
+        for token in relevance.tokens(content):
+            column = relevance._feature_ids[token]
+            counts[column] = counts.get(column, 0) + 1
+        vectors.append({column: 1 + math.log(count) for column, count in counts.items()})
+        for column in counts:
+            df[column] = df.get(column, 0) + 1
+    idf = {column: math.log((1 + len(rows)) / (1 + count)) + 1 for column, count in df.items()}
+
+    query = {}
+    for token in relevance.tokens(profile):
+        column = relevance._feature_ids[token]
+        query[column] = query.get(column, 0) + 1
+    query = {column: (1 + math.log(count)) * idf.get(column, math.log(1 + len(rows)) + 1) for column, count in query.items()}
+    query_norm = math.sqrt(sum(value * value for value in query.values()))
+    scores = []
+    for vector in vectors:
+        weighted = {column: value * idf[column] for column, value in vector.items()}
+        norm = math.sqrt(sum(value * value for value in weighted.values()))
+        dot = sum(value * query.get(column, 0) for column, value in weighted.items())
+        scores.append(dot / norm / query_norm if norm and query_norm else 0.0)
+    return scores
+
+def append_listings(path: Path, start: int, count: int):
+    conn = sqlite3.connect(str(path))
+    conn.executemany(
+        "INSERT INTO job_listings (url, content, checksum, published_at, created_at, title) VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (f"https://example.com/new/{i}", f"<p>python kafka postgres word{i % 5000} word{i % 77}</p>", f"new{i:029x}",
+             "2025-01-02T00:00:00+00:00", "2025-01-02T00:00:00+00:00", "Backend Engineer")
+            for i in range(start, start + count)
+        ]
+    )
+    conn.commit()
+    conn.close()
+
+def directory_mb(path: Path) -> float:
+    return sum(file.stat().st_size for file in path.iterdir()) / 2**20
+
+def run(sizes: list[int], appended: int, repeat: int, baseline_limit: int, workdir: Path) -> list[dict]:
+    results = []
+    for size in sizes:
+        path = workdir / f"relevance_{size}.db"
+        print(f"\nBuilding {size:,} synthetic listings...")
+        create_corpus(path, size)
+        store = SQLiteStore(path)
+        index = RelevanceIndex.for_database(path)
+        profile = index.profile()
+
+        start = time.perf_counter()
+        index.update(store)
+        build_s = time.perf_counter() - start
+
+        # A scrape's worth of new listings, appended and scored without touching existing rows.
+        append_listings(path, size, appended)
+        start = time.perf_counter()
+        indexed, scored = index.update(store)
+        append_ms = (time.perf_counter() - start) * 1000
+
+        output = subprocess.run(
+            [sys.executable, "-c", OPEN_SCRIPT, str(index.path)],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.split()
+        open_ms, first_query_ms = (float(value) * 1000 for value in output)
+
+        matrix = index.matrix()
+        matrix.norms
+        profile_ms = measure(lambda: index.score_text(profile), repeat)
+        probes = [int(matrix.ids[i]) for i in range(0, matrix.rows, max(1, matrix.rows // repeat))][:repeat]
+        similar_ms = statistics.median(measure(lambda: index.similar(job_id), 1) for job_id in probes)
+
+        python_ms = None
+        if size <= baseline_limit:
+            rows = list(store.iter_listing_texts())
+            python_ms = measure(lambda: python_scores(rows, profile), 1)
+
+        result = {
+            "rows": size,
+            "build_s": round(build_s, 2),
+            "build_rows_per_s": round(size / build_s),
+            "index_mb": round(directory_mb(index.path), 1),
+            "append_rows": indexed,
+            "append_scored": scored,
+            "append_ms": round(append_ms, 1),
+            "open_ms": round(open_ms, 1),
+            "first_query_ms": round(first_query_ms, 1),
+            "profile_score_ms": round(profile_ms, 2),
+            "similar_ms": round(similar_ms, 2),
+            "python_profile_score_ms": round(python_ms, 1) if python_ms is not None else None,
+        }
+        results.append(result)
+        print(f"  build {build_s:.1f} s ({result['build_rows_per_s']:,}/s), {result['index_mb']} MB on disk")
+        print(f"  append {indexed} rows and score {scored}: {append_ms:.0f} ms, against {build_s * 1000:.0f} ms to rebuild")
+        print(f"  fresh process: open {open_ms:.0f} ms, first similar query {first_query_ms:.0f} ms")
+        print(f"  profile scores {profile_ms:.1f} ms   similar {similar_ms:.1f} ms"
+              + (f"   pure Python profile scores {python_ms:.0f} ms" if python_ms is not None else ""))
+        store.close()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the hashed TF-IDF relevance index")
+    parser.add_argument("--sizes", default="10k,100k", help="Comma-separated corpus sizes (default: 10k,100k)")
+    parser.add_argument("--appended", type=int, default=500, help="Listings added after the build, as by one scrape (default: 500)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query; the median is reported (default: 5)")
+    parser.add_argument("--baseline-limit", type=int, default=20000, help="Largest size also scored with pure Python (default: 20000)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_relevance_"))
+    try:
+        results = run(parse_sizes(args.sizes), args.appended, args.repeat, args.baseline_limit, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
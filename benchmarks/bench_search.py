@@ -0,0 +1,126 @@
+"""
+Compare full-text search latency against scanning descriptions with LIKE.
+
+The LIKE baseline collects every matching listing, as finding roles without
+an index required; the FTS side returns the best-ranked page with snippets.
+
+Usage:
+    python -m benchmarks.bench_search --sizes 10k,100k,1m
+"""
+import argparse
+import json
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from benchmarks.common import measure, parse_sizes
+from store.sqlite import SQLiteStore
+
+TECH_TERMS = [
+    "python", "go", "rust", "kafka", "postgres", "kubernetes", "terraform", "react", "typescript", "java",
+    "scala", "aws", "gcp", "redis", "graphql", "django", "flask", "spark", "airflow", "elixir",
+]
+TITLES = ["Backend Engineer", "Senior Go Developer", "Site Reliability Engineer", "Data Engineer", "Rust Systems Engineer", "Frontend Developer"]
+FILLER = [f"word{i}" for i in range(5000)]
+
+# (label, free-text query, equivalent LIKE patterns that must all match)
+QUERIES = [
+    ("single_term", "kafka", ["%kafka%"]),
+    ("two_terms", "rust kafka", ["%rust%", "%kafka%"]),
+    ("phrase", '"site reliability"', ["%site reliability%"]),
+    ("prefix", "terra*", ["%terra%"]),
+    ("rare_term", "word4999", ["%word4999%"]),
+]
+
+def create_corpus(path: Path, rows: int, words: int = 120, seed: int = 42):
+    """Listings whose descriptions mix common filler with a few tech terms, roughly Zipf distributed."""
+    rng = random.Random(seed)
+    filler_weights = [1 / (rank + 1) for rank in range(len(FILLER))]
+    SQLiteStore(path).close()
+    conn = sqlite3.connect(str(path))
+
+    def generate():
+        for i in range(rows):
+            body = rng.choices(FILLER, weights=filler_weights, k=words) + rng.sample(TECH_TERMS, 3)
+            rng.shuffle(body)
+            if i % 7 == 0:
+                body.insert(rng.randrange(len(body)), "site reliability")
+            yield (
+                f"https://example.com/jobs/{i}",
+                "<p>" + " ".join(body) + "</p>",
+                f"{i:032x}",
+                "2025-01-01T00:00:00+00:00",
+                "2025-01-01T00:00:00+00:00",
+                f"{rng.choice(TITLES)} {i}",
+            )
+
+    # Bulk load with the sync triggers dropped, then build the index in one pass.
+    triggers = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'job_listings_fts_%'").fetchall()
+    for (sql,) in triggers:
+        conn.execute(f"DROP TRIGGER {sql.split()[2]}")
+    conn.executemany(
+        "INSERT INTO job_listings (url, content, checksum, published_at, created_at, title) VALUES (?, ?, ?, ?, ?, ?)",
+        generate()
+    )
+    for (sql,) in triggers:
+        conn.execute(sql)
+    conn.commit()
+    conn.close()
+
+def run(sizes: list[int], repeat: int, limit: int, workdir: Path) -> list[dict]:
+    results = []
+    for size in sizes:
+        path = workdir / f"search_{size}.db"
+        print(f"\nBuilding {size:,} synthetic listings...")
+        create_corpus(path, size)
+
+        store = SQLiteStore(path)
+        start = time.perf_counter()
+        store.rebuild_search_index()
+        rebuild_ms = (time.perf_counter() - start) * 1000
+        print(f"Building the full-text index took {rebuild_ms:.0f} ms")
+
+        conn = store._get_connection()
+        for name, text, patterns in QUERIES:
+            like_sql = f"""
+                SELECT id, title, url FROM job_listings
+                WHERE {" AND ".join("(title LIKE ? OR content LIKE ?)" for _ in patterns)}
+            """
+            like_params = [p for pattern in patterns for p in (pattern, pattern)]
+            matches = len(store.search(text, limit=size))
+            before = measure(lambda: conn.execute(like_sql, like_params).fetchall(), repeat)
+            after = measure(lambda: store.search(text, limit=limit), repeat)
+            results.append({
+                "rows": size,
+                "query": name,
+                "matches": matches,
+                "like_ms": round(before, 3),
+                "fts_ms": round(after, 3),
+                "speedup": round(before / after, 1) if after else None,
+                "rebuild_ms": round(rebuild_ms, 1)
+            })
+            print(f"  {name:<12} {matches:>8} matches   LIKE {before:10.2f} ms   FTS {after:10.2f} ms   x{before / after if after else 0:.1f}")
+        store.close()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full-text search against LIKE scans")
+    parser.add_argument("--sizes", default="10k,100k", help="Comma-separated corpus sizes (default: 10k,100k)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query; the median is reported (default: 5)")
+    parser.add_argument("--limit", type=int, default=20, help="Results fetched per query (default: 20)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_search_"))
+    try:
+        results = run(parse_sizes(args.sizes), args.repeat, args.limit, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Compare list page throughput with a store opened per request, the shared
+read-only store, the rendered-page cache and conditional 304 responses.
+
+Usage:
+    python -m benchmarks.bench_web --rows 50 --requests 2000 --threads 4
+"""
+import argparse
+import importlib
+import json
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from benchmarks.common import create_legacy_db
+from store.sqlite import SQLiteStore
+
+web = importlib.import_module("list")
+
+@contextmanager
+def page_cache_disabled():
+    max_entries = web.page_cache.max_entries
+    web.page_cache.max_entries = 0
+    web.page_cache.pages.clear()
+    try:
+        yield
+    finally:
+        web.page_cache.max_entries = max_entries
+
+@contextmanager
+def store_per_request():
+    """The web UI's previous behaviour: open, initialise and close a store on every page view."""
+    original = web.get_store
+    opened = []
+
+    def get_store():
+        store = SQLiteStore(web.DB_PATH)
+        opened.append(store)
+        return store
+
+    def close_stores(exception=None):
+        while opened:
+            opened.pop().close()
+
+    web.get_store = get_store
+    web.app.teardown_appcontext(close_stores)
+    try:
+        with page_cache_disabled():
+            yield
+    finally:
+        web.get_store = original
+        web.app.teardown_appcontext_funcs.remove(close_stores)
+
+@contextmanager
+def shared_read_only_store(page_cache: bool = False):
+    web._store = None
+    try:
+        if page_cache:
+            yield
+        else:
+            with page_cache_disabled():
+                yield
+    finally:
+        if web._store is not None:
+            web._store.close()
+        web._store = None
+
+def requests_per_second(requests: int, threads: int, revalidate: bool = False) -> float:
+    def worker(count: int):
+        client = web.app.test_client()
+        headers = {}
+        if revalidate:
+            headers["If-None-Match"] = client.get("/").headers["ETag"]
+        for _ in range(count):
+            response = client.get("/", headers=headers)
+            assert response.status_code == (304 if revalidate else 200), response.status_code
+
+    per_thread = max(1, requests // threads)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(worker, [per_thread] * threads))
+    return per_thread * threads / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark list page requests per second before and after the shared read-only store")
+    parser.add_argument("--rows", type=int, default=50, help="Synthetic listings in the database (default: 50)")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per scenario (default: 2000)")
+    parser.add_argument("--threads", type=int, default=4, help="Concurrent client threads (default: 4)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_web_"))
+    try:
+        web.DB_PATH = str(create_legacy_db(workdir / "jobs.db", args.rows))
+        SQLiteStore(web.DB_PATH).close()
+
+        results = {"rows": args.rows, "requests": args.requests, "threads": args.threads}
+        scenarios = (
+            ("per_request", store_per_request, False),
+            ("read_only_shared", shared_read_only_store, False),
+            ("page_cache", lambda: shared_read_only_store(page_cache=True), False),
+            ("not_modified", lambda: shared_read_only_store(page_cache=True), True),
+        )
+        for name, scenario, revalidate in scenarios:
+            with scenario():
+                requests_per_second(min(100, args.requests), args.threads, revalidate)  # warm up
+                rps = requests_per_second(args.requests, args.threads, revalidate)
+            results[f"{name}_rps"] = round(rps, 1)
+            print(f"  {name:<18} {rps:10.1f} req/s   x{rps / results['per_request_rps']:.2f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
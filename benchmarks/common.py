@@ -0,0 +1,98 @@
+import sqlite3
+import statistics
+import time
+from pathlib import Path
+from typing import Callable
+
+# Schema as it was before versioned migrations, used as the baseline in comparisons.
+LEGACY_SCHEMA = [
+    """
+    CREATE TABLE job_listings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        url TEXT NOT NULL UNIQUE,
+        content TEXT NOT NULL,
+        checksum TEXT NOT NULL,
+        published_at TIMESTAMP NOT NULL,
+        created_at TIMESTAMP NOT NULL,
+        salary_min REAL,
+        salary_max REAL,
+        location TEXT,
+        title TEXT,
+        UNIQUE(checksum)
+    )
+    """,
+    """
+    CREATE TABLE analyzed_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_listing_id INTEGER NOT NULL,
+        url TEXT NOT NULL,
+        salary_from TEXT,
+        salary_to TEXT,
+        is_remote_score REAL NOT NULL DEFAULT 0.0,
+        is_applicable_score REAL NOT NULL DEFAULT 0.0,
+        is_european_score REAL NOT NULL DEFAULT 0.0,
+        analyzed_at TIMESTAMP NOT NULL,
+        FOREIGN KEY (job_listing_id) REFERENCES job_listings(id),
+        UNIQUE(job_listing_id)
+    )
+    """,
+]
+
+def create_legacy_db(path: str | Path, rows: int, analyzed_fraction: float = 0.9, content_size: int = 200) -> Path:
+    """
+    Build a database with the pre-migration schema holding synthetic listings.
+
+    Rows are generated inside SQLite with a recursive CTE so millions of rows
+    take seconds rather than minutes.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+
+    conn = sqlite3.connect(str(path))
+    for statement in LEGACY_SCHEMA:
+        conn.execute(statement)
+    conn.execute(f"""
+        INSERT INTO job_listings (url, content, checksum, published_at, created_at, salary_min, salary_max, location, title)
+        WITH RECURSIVE seq(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM seq WHERE i < ?)
+        SELECT
+            'https://example.com/jobs/' || i,
+            'Synthetic job description ' || i || ' ' || substr(hex(zeroblob({content_size // 2})), 1, {content_size}),
+            lower(hex(randomblob(16))),
+            datetime('2025-01-01', '+' || (i % 100000) || ' minutes'),
+            datetime('2025-01-01', '+' || (i % 100000) || ' minutes'),
+            40000 + (i % 50) * 2000,
+            60000 + (i % 50) * 2000,
+            CASE i % 3 WHEN 0 THEN 'Worldwide' WHEN 1 THEN 'Europe' ELSE 'US only' END,
+            'Engineer ' || i
+        FROM seq
+    """, (rows,))
+    modulo = max(1, round(1 / (1 - analyzed_fraction))) if analyzed_fraction < 1 else 0
+    conn.execute(f"""
+        INSERT INTO analyzed_jobs (job_listing_id, url, salary_from, salary_to, is_remote_score, is_applicable_score, is_european_score, analyzed_at)
+        SELECT id, url, salary_min, salary_max, (id % 10) / 10.0, (id % 7) / 7.0, (id % 5) / 5.0,
+               datetime('2025-06-01', '+' || id || ' seconds')
+        FROM job_listings
+        {f"WHERE id % {modulo} != 0" if modulo else ""}
+    """)
+    conn.commit()
+    conn.close()
+    return path
+
+def measure(fn: Callable[[], object], repeat: int = 5) -> float:
+    """Run fn repeat times and return the median wall time in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def parse_sizes(value: str) -> list[int]:
+    """Parse a comma-separated list of sizes such as "10k,100k,1m"."""
+    sizes = []
+    for part in value.split(","):
+        part = part.strip().lower()
+        multiplier = {"k": 1_000, "m": 1_000_000}.get(part[-1:], 1)
+        sizes.append(int(float(part.rstrip("km")) * multiplier))
+    return sizes
@@ -0,0 +1,329 @@
+"""
+Offline stand-ins for the services the pipeline talks to: a synthetic RemoteOK
+feed served over local HTTP, a paginated job board that throttles eager
+clients, and a fake OpenAI Responses endpoint.
+"""
+import json
+import random
+import threading
+import time
+from hashlib import md5
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+TITLES = [
+    "Senior Backend Engineer", "Go Developer", "Python Engineer", "Site Reliability Engineer",
+    "Fullstack Engineer", "Data Engineer", "Frontend Developer", "Product Designer",
+    "Sales Manager", "DevOps Engineer",
+]
+LOCATIONS = ["Worldwide", "Europe", "EU", "US only", "Remote", "Germany", "USA", ""]
+SKILLS = ["Go", "Python", "Kafka", "Postgres", "Kubernetes", "AWS", "Rust", "React", "Terraform", "Redis"]
+SENTENCES = [
+    "You will design and operate services that handle millions of requests a day.",
+    "We are a fully remote team spread across many time zones.",
+    "Our stack is mostly {skill} and {skill}, deployed on {skill}.",
+    "You care about tests, code review and shipping small changes often.",
+    "Experience with {skill} in production is a strong plus.",
+    "We offer flexible hours, a home office budget and yearly team retreats.",
+]
+FOOTER = (
+    "Please mention the word **BRIGHT** and tag RMTg4LjE2OS4xMjMuMTI0 when applying to show you read the job post completely. "
+    "This is a beta feature to avoid spam applicants. Companies can search these words to find applicants that read this and see they're human."
+)
+
+# Made-up words for the part of each description that is specific to one job, so
+# listings from the same templates aren't near-duplicates of each other.
+SYLLABLES = ["ka", "lo", "mi", "ren", "tas", "vo", "qui", "zan", "pel", "dor", "ix", "mu", "sel", "tra", "no", "bex"]
+
+def _about(rng: random.Random, html_kb: float) -> str:
+    count = max(80, int(html_kb * 45))
+    words = ("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))) for _ in range(rng.randint(count, count * 3 // 2)))
+    return f"<p>{' '.join(words)}.</p>"
+
+def _description(rng: random.Random, html_kb: float) -> str:
+    parts = [_about(rng, html_kb)]
+    size = len(parts[0])
+    target = max(1, int(html_kb * 1024))
+    while size < target:
+        sentences = " ".join(
+            rng.choice(SENTENCES).format(skill=rng.choice(SKILLS)) for _ in range(rng.randint(2, 4))
+        )
+        if rng.random() < 0.3:
+            items = "".join(f"<li>{rng.choice(SKILLS)} experience</li>" for _ in range(3))
+            part = f"<p><strong>Requirements</strong></p><ul>{items}</ul>"
+        else:
+            part = f"<p>{sentences}</p>"
+        parts.append(part)
+        size += len(part)
+    parts.append(f"<p>{FOOTER}</p>")
+    return "".join(parts)
+
+def generate_remoteok_items(count: int, html_kb: float = 2.0, seed: int = 1) -> list[dict]:
+    """
+    Build RemoteOK-shaped API items, including the leading legal notice.
+
+    Args:
+        count: Number of job items
+        html_kb: Approximate size of each HTML description in KiB
+        seed: Seed so runs compare like with like
+    """
+    rng = random.Random(seed)
+    items = [{"legal": "API terms of service: synthetic feed for benchmarks"}]
+    for i in range(count):
+        low = rng.randrange(40, 150) * 1000
+        items.append({
+            "slug": f"synthetic-job-{i}",
+            "id": str(100000 + i),
+            "epoch": 1735689600 + i,
+            "date": str(1735689600 + i),
+            "company": f"Company {i % 500}",
+            "position": f"{rng.choice(TITLES)} {i}",
+            "tags": rng.sample([skill.lower() for skill in SKILLS], 3),
+            "description": _description(rng, html_kb),
+            "location": rng.choice(LOCATIONS),
+            "salary": f"${low // 1000}k-${low // 1000 + 30}k" if rng.random() < 0.7 else "",
+            "url": f"https://remoteok.com/remote-jobs/synthetic-job-{i}",
+        })
+    return items
+
+def _serve(handler: type[BaseHTTPRequestHandler]) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def serve_remoteok(items: list[dict]) -> tuple[ThreadingHTTPServer, str]:
+    """
+    Serve items as a RemoteOK API feed on a local port, honouring If-None-Match.
+
+    Returns:
+        The running server (call shutdown() when done) and its API URL
+    """
+    body = json.dumps(items).encode("utf-8")
+    etag = f'"{md5(body).hexdigest()}"'
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = _serve(Handler)
+    return server, f"http://127.0.0.1:{server.server_port}/api"
+
+class FakeBoard:
+    def __init__(self, items: list[dict], page_size: int = 50, rate: float | None = None, retry_after: int = 1, latency: float = 0.0, error_rate: float = 0.0, seed: int = 1):
+        """
+        Local paginated job board: GET /jobs?page=N with a Link header to the next page.
+
+        Requests arriving faster than rate are answered with 429 and a
+        Retry-After header, like boards that throttle scrapers. It counts
+        every response by status, the TCP connections opened and the most
+        requests it was serving at once.
+
+        Args:
+            items: Job items split into pages
+            page_size: Items per page
+            rate: Requests per second allowed before answering 429, or None for no limit
+            retry_after: Seconds sent in Retry-After with each 429
+            latency: Seconds each page takes to answer
+            error_rate: Fraction of requests answered with 503
+            seed: Seed for choosing which requests fail
+        """
+        self.items = items
+        self.page_size = page_size
+        self.rate = rate
+        self.retry_after = retry_after
+        self.latency = latency
+        self.error_rate = error_rate
+        self.statuses: dict[int, int] = {}
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._next_allowed = 0.0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.server = None
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-len(self.items) // self.page_size))
+
+    def start(self) -> str:
+        """Start serving and return the URL of the first page."""
+        board = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; without this, delayed ACKs stall each keep-alive reply.
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with board._lock:
+                    board.connections += 1
+
+            def do_GET(self):
+                with board._lock:
+                    board.in_flight += 1
+                    board.max_in_flight = max(board.max_in_flight, board.in_flight)
+                try:
+                    status, headers, body = board.respond(self.path)
+                    if board.latency and status == 200:
+                        time.sleep(board.latency)
+                finally:
+                    with board._lock:
+                        board.in_flight -= 1
+                        board.statuses[status] = board.statuses.get(status, 0) + 1
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = _serve(Handler)
+        return f"http://127.0.0.1:{self.server.server_port}/jobs"
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def reset(self):
+        with self._lock:
+            self.statuses = {}
+            self.connections = 0
+            self.max_in_flight = 0
+            self._next_allowed = 0.0
+
+    def respond(self, path: str) -> tuple[int, dict, bytes]:
+        with self._lock:
+            now = time.monotonic()
+            if self.rate and now < self._next_allowed:
+                return 429, {"Retry-After": str(self.retry_after)}, b""
+            if self.rate:
+                self._next_allowed = now + 1 / self.rate
+            if self._rng.random() < self.error_rate:
+                return 503, {}, b""
+
+        url = urlsplit(path)
+        page = int(parse_qs(url.query).get("page", ["1"])[0])
+        items = self.items[(page - 1) * self.page_size:page * self.page_size]
+        headers = {"Content-Type": "application/json"}
+        if page < self.pages:
+            headers["Link"] = f'<{url.path}?page={page + 1}>; rel="next"'
+        return 200, headers, json.dumps(items).encode("utf-8")
+
+class FakeOpenAI:
+    def __init__(self, latency: float = 0.02, error_rate: float = 0.0, seed: int = 1):
+        """
+        Local stand-in for the OpenAI Responses API used by analyze_job_listing.
+
+        Scores are derived from the prompt so the same job always scores the
+        same. Failures are answered with HTTP 400, which the client does not
+        retry, so injected errors don't add retry backoff to the timings.
+
+        Args:
+            latency: Seconds each response is delayed, like model time
+            error_rate: Fraction of requests that fail
+            seed: Seed for choosing which requests fail
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.server = None
+
+    def start(self) -> str:
+        """Start serving and return the base URL to use as OPENAI_BASE_URL."""
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                status, body = fake.respond(request)
+                time.sleep(fake.latency)
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = _serve(Handler)
+        return f"http://127.0.0.1:{self.server.server_port}/v1"
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server = None
+
+    def respond(self, request: dict) -> tuple[int, dict]:
+        with self._lock:
+            self.requests += 1
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        if failed:
+            return 400, {"error": {"message": "Injected failure", "type": "invalid_request_error", "code": None, "param": None}}
+
+        prompt = json.dumps(request.get("input", ""))
+        digest = md5(prompt.encode("utf-8")).digest()
+        scores = {
+            "yearly_salary_from": 50000 + digest[0] * 100,
+            "yearly_salary_to": 80000 + digest[1] * 100,
+            "how_likely_remote_role": round(digest[2] / 255, 2),
+            "is_backend_role": digest[3] % 2,
+            "can_work_from_eu": round(digest[4] / 255, 2),
+        }
+        input_tokens = len(prompt) // 4
+        return 200, {
+            "id": f"resp_{digest.hex()[:16]}",
+            "object": "response",
+            "created_at": int(time.time()),
+            "model": request.get("model"),
+            "status": "completed",
+            "output": [{
+                "type": "message",
+                "id": f"msg_{digest.hex()[:16]}",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": json.dumps(scores), "annotations": []}],
+            }],
+            "parallel_tool_calls": True,
+            "tool_choice": "auto",
+            "tools": [],
+            "usage": {
+                "input_tokens": input_tokens,
+                "output_tokens": 40,
+                "total_tokens": input_tokens + 40,
+                "input_tokens_details": {"cached_tokens": 0},
+                "output_tokens_details": {"reasoning_tokens": 0},
+            },
+        }
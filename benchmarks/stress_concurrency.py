@@ -0,0 +1,142 @@
+"""
+Run the scraper, analyzer and web workloads against one database at the same
+time and check that no write is lost.
+
+Usage:
+    python -m benchmarks.stress_concurrency --jobs 20000
+"""
+import argparse
+import multiprocessing
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, UTC
+from pathlib import Path
+from analyze.models import AnalyzedJob
+from scrape.providers.models import JobListing
+from store.sqlite import SQLiteStore
+
+def scraper_workload(db_path: str, jobs: int, batch_size: int, results):
+    store = SQLiteStore(db_path)
+    inserted = 0
+    errors = 0
+    start = time.perf_counter()
+    for offset in range(0, jobs, batch_size):
+        batch = [
+            JobListing(url=f"https://example.com/jobs/{i}", content=f"Synthetic description {i}", title=f"Engineer {i}")
+            for i in range(offset, min(offset + batch_size, jobs))
+        ]
+        # Mix bulk and single-row writes so both paths see contention.
+        if random.random() < 0.1:
+            for job in batch:
+                if store.insert_job(job):
+                    inserted += 1
+                else:
+                    errors += 1
+        else:
+            result = store.insert_jobs(batch, batch_size=batch_size)
+            inserted += result.inserted
+            errors += result.skipped
+    results.put(("scraper", {"inserted": inserted, "errors": errors, "seconds": time.perf_counter() - start}))
+
+def analyzer_workload(db_path: str, jobs: int, deadline: float, results):
+    store = SQLiteStore(db_path)
+    saved = 0
+    start = time.perf_counter()
+    while saved < jobs and time.time() < deadline:
+        job_ids = store.claim_jobs("stress", 200, 60, 5)
+        if not job_ids:
+            time.sleep(0.01)
+            continue
+        saved += store.save_analyses([
+            AnalyzedJob(
+                job_listing_id=job_id,
+                url=f"https://example.com/analyzed/{job_id}",
+                is_remote_score=0.5,
+                is_applicable_score=0.5,
+                is_european_score=0.5,
+                analyzed_at=datetime.now(UTC)
+            )
+            for job_id in job_ids
+        ])
+    results.put(("analyzer", {"saved": saved, "seconds": time.perf_counter() - start}))
+
+def web_workload(db_path: str, deadline: float, stop, results):
+    store = SQLiteStore(db_path)
+    conn = store._get_connection()
+    reads = 0
+    errors = 0
+    while not stop.is_set() and time.time() < deadline:
+        try:
+            conn.execute("""
+                SELECT jl.title, jl.url, aj.ai_score, aj.analyzed_at
+                FROM job_listings jl JOIN analyzed_jobs aj ON jl.id = aj.job_listing_id
+                ORDER BY aj.analyzed_at DESC LIMIT 100
+            """).fetchall()
+            reads += 1
+        except Exception:
+            errors += 1
+    results.put(("web", {"reads": reads, "errors": errors}))
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress concurrent scraper, analyzer and web access to one SQLite database")
+    parser.add_argument("--jobs", type=int, default=20000, help="Listings written by the scraper workload (default: 20000)")
+    parser.add_argument("--batch-size", type=int, default=100, help="Listings per scraper transaction (default: 100)")
+    parser.add_argument("--timeout", type=float, default=300, help="Seconds before the run is declared failed (default: 300)")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="stress_"))
+    db_path = str(workdir / "jobs.db")
+    SQLiteStore(db_path).close()
+
+    deadline = time.time() + args.timeout
+    results = multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    processes = [
+        multiprocessing.Process(target=scraper_workload, args=(db_path, args.jobs, args.batch_size, results)),
+        multiprocessing.Process(target=analyzer_workload, args=(db_path, args.jobs, deadline, results)),
+        multiprocessing.Process(target=web_workload, args=(db_path, deadline, stop, results)),
+    ]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+
+    reports = {}
+    while len(reports) < 2 and time.time() < deadline:
+        try:
+            name, report = results.get(timeout=1)
+            reports[name] = report
+        except Exception:
+            pass
+    stop.set()
+    name, report = results.get(timeout=30)
+    reports[name] = report
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+
+    conn = SQLiteStore(db_path)._get_connection()
+    stored = conn.execute("SELECT COUNT(*) FROM job_listings").fetchone()[0]
+    analyzed = conn.execute("SELECT COUNT(*) FROM analyzed_jobs").fetchone()[0]
+    pending = conn.execute("SELECT COUNT(*) FROM job_listings WHERE analysis_status = 'pending'").fetchone()[0]
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"Finished in {elapsed:.1f}s")
+    for name, report in reports.items():
+        print(f"  {name}: {report}")
+    print(f"  stored={stored} analyzed={analyzed} pending={pending}")
+
+    ok = (
+        stored == args.jobs
+        and analyzed == args.jobs
+        and pending == 0
+        and reports.get("scraper", {}).get("errors") == 0
+        and reports.get("web", {}).get("errors") == 0
+    )
+    print("OK: no writes lost" if ok else "FAILED: writes were lost or errored")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+import argparse
+import shutil
+import time
+from analyze.relevance import RelevanceIndex
+from store.sqlite import SQLiteStore
+
+def setup_argparse() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Database maintenance - One-off tasks on the job database",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Index listings stored before full-text search existed
+  python db.py rebuild-fts
+
+  # Fingerprint listings stored before repost detection existed
+  python db.py index-duplicates
+
+  # Build the relevance index and profile scores for listings already stored
+  python db.py index-relevance
+
+  # Work on a different database file
+  python db.py --db data/other.db rebuild-fts
+        """
+    )
+
+    parser.add_argument(
+        "--db",
+        default="data/jobs.db",
+        help="Path to the SQLite database (default: data/jobs.db)"
+    )
+
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser(
+        "rebuild-fts",
+        help="Rebuild the full-text search index from all stored listings"
+    )
+    index_duplicates = commands.add_parser(
+        "index-duplicates",
+        help="Fingerprint listings that have none yet and link reposts to their original; resumable"
+    )
+    index_duplicates.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Listings fingerprinted per transaction (default: 1000)"
+    )
+
+    index_relevance = commands.add_parser(
+        "index-relevance",
+        help="Add stored listings missing from the relevance index and refresh profile scores"
+    )
+    index_relevance.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Discard the index and build it again from every listing"
+    )
+
+    return parser
+
+def main():
+    parser = setup_argparse()
+    args = parser.parse_args()
+
+    store = SQLiteStore(args.db)
+    try:
+        if args.command == "rebuild-fts":
+            print("Rebuilding full-text search index...")
+            start = time.perf_counter()
+            indexed = store.rebuild_search_index()
+            print(f"Indexed {indexed} listings in {time.perf_counter() - start:.1f}s")
+        elif args.command == "index-duplicates":
+            print("Fingerprinting listings for repost detection...")
+            start = time.perf_counter()
+            indexed, linked = store.index_near_duplicates(batch_size=args.batch_size)
+            print(f"Fingerprinted {indexed} listings in {time.perf_counter() - start:.1f}s, {linked} linked as reposts")
+        elif args.command == "index-relevance":
+            relevance = RelevanceIndex.for_database(args.db)
+            if args.rebuild:
+                shutil.rmtree(relevance.path, ignore_errors=True)
+            print(f"Updating relevance index in {relevance.path}...")
+            start = time.perf_counter()
+            indexed, scored = relevance.update(store)
+            print(f"Indexed {indexed} listings and scored {scored} in {time.perf_counter() - start:.1f}s ({len(relevance)} in the index)")
+        return 0
+    except KeyboardInterrupt:
+        print("\nStopped")
+        return 1
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    exit(main())
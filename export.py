@@ -0,0 +1,132 @@
+import argparse
+import sys
+from datetime import datetime
+from store.export import MIMETYPES, export_rows
+from store.models import JobQuery
+from store.sqlite import SQLiteStore
+
+def setup_argparse() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Job Exporter - Stream analyzed jobs as NDJSON, JSON or CSV",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Export everything as NDJSON to stdout
+  python export.py
+
+  # Well-matched jobs as CSV
+  python export.py --format csv --min-ai-score 0.7 --output jobs.csv
+
+  # Include reposts of listings that are already analyzed
+  python export.py --show-duplicates
+
+  # Only analyses stored after the last row of a previous pull
+  python export.py --after-id 1234
+
+  # Only analyses made after a point in time
+  python export.py --since "2025-06-01 12:00:00+00:00"
+        """
+    )
+
+    parser.add_argument(
+        "--format",
+        choices=sorted(MIMETYPES),
+        default="ndjson",
+        help="Output format (default: ndjson)"
+    )
+
+    parser.add_argument(
+        "--output",
+        default="-",
+        help="File to write to, - for stdout (default: -)"
+    )
+
+    parser.add_argument(
+        "--after-id",
+        type=int,
+        help="Only export analyses stored after this analysis_id, the last one of a previous pull"
+    )
+
+    parser.add_argument(
+        "--since",
+        help="Only export analyses with analyzed_at after this ISO timestamp"
+    )
+
+    for name, label in (("ai", "AI"), ("remote", "remote"), ("applicable", "relevance"), ("european", "European")):
+        parser.add_argument(
+            f"--min-{name}-score",
+            type=float,
+            help=f"Lowest {label} score to export, 0 to 1"
+        )
+
+    parser.add_argument(
+        "--min-salary",
+        type=float,
+        help="Only export listings whose salary range reaches at least this much"
+    )
+
+    parser.add_argument(
+        "--max-salary",
+        type=float,
+        help="Only export listings whose salary range starts at or below this much"
+    )
+
+    parser.add_argument(
+        "--show-duplicates",
+        action="store_true",
+        help="Also export reposts whose original listing is analyzed; canonical_id links them to it"
+    )
+
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Rows read from the database per fetch (default: 1000)"
+    )
+
+    parser.add_argument(
+        "--db",
+        default="data/jobs.db",
+        help="Path to the SQLite database (default: data/jobs.db)"
+    )
+
+    return parser
+
+def main():
+    parser = setup_argparse()
+    args = parser.parse_args()
+
+    try:
+        filters = JobQuery(
+            min_ai_score=args.min_ai_score,
+            min_remote_score=args.min_remote_score,
+            min_applicable_score=args.min_applicable_score,
+            min_european_score=args.min_european_score,
+            min_salary=args.min_salary,
+            max_salary=args.max_salary,
+            duplicates="show" if args.show_duplicates else "collapse"
+        )
+        if args.since:
+            datetime.fromisoformat(args.since)
+    except ValueError as e:
+        parser.error(str(e))
+
+    store = SQLiteStore(args.db, read_only=True)
+    output = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        rows = store.iter_analyzed_listings(filters, since=args.since, after_id=args.after_id, batch_size=args.batch_size)
+        for chunk in export_rows(rows, args.format):
+            output.write(chunk)
+        return 0
+    except KeyboardInterrupt:
+        return 1
+    except BrokenPipeError:
+        # Output was piped into something like head that stopped reading.
+        return 0
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        store.close()
+
+if __name__ == "__main__":
+    exit(main())
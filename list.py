@@ -1,49 +1,327 @@
-from flask import Flask, render_template
+import base64
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, UTC
+from flask import Flask, Response, abort, g, redirect, render_template, request, stream_template, stream_with_context, url_for
+from markupsafe import Markup, escape
+from pydantic import ValidationError
+from werkzeug.http import is_resource_modified
+from analyze.relevance import RelevanceIndex
+from store.export import MIMETYPES, export_rows
+from store.models import JobQuery
 from store.sqlite import SQLiteStore
-from datetime import datetime
-from contextlib import contextmanager
+from telemetry import metrics
 
 app = Flask(__name__)
 
-@contextmanager
-def get_store():
-    store = SQLiteStore()
-    try:
-        yield store
-    finally:
-        store.close()
+DB_PATH = os.getenv("JOBS_DB_PATH", "data/jobs.db")
+# Page cache per connection; the hot pages of the list query stay in memory between requests.
+CACHE_SIZE_KB = int(os.getenv("WEB_SQLITE_CACHE_KB", "16384"))
+# Pages with at least this many rows are streamed to the browser while they render.
+STREAM_THRESHOLD = 200
+# Rendered pages kept in memory, one per distinct query string.
+PAGE_CACHE_SIZE = int(os.getenv("WEB_PAGE_CACHE_SIZE", "64"))
+# Part of every ETag so a restart with a changed template never answers 304 to a stale page.
+BOOT_ID = uuid.uuid4().hex[:8]
+
+# Query parameters kept when following sort, filter and next-page links.
+QUERY_PARAMS = ("sort", "direction", "min_ai_score", "min_remote_score", "min_applicable_score", "min_european_score", "min_salary", "max_salary", "duplicates", "limit")
+
+REQUEST_SECONDS = metrics.histogram("web_request_seconds", "Time to build a response, by endpoint and status", ("endpoint", "status"))
+PAGE_CACHE_PAGES = metrics.gauge("web_page_cache_lookups", "Rendered page cache lookups since start, by result", ("result",))
+QUEUE_JOBS = metrics.gauge("analysis_queue_jobs", "Jobs in the analysis queue, by state", ("status",))
+SNAPSHOT_AGE = metrics.gauge("metrics_snapshot_age_seconds", "Seconds since each other process last wrote its metrics", ("source",))
+
+_store = None
+_store_lock = threading.Lock()
+_relevance = None
+
+class PageCache:
+    def __init__(self, max_entries: int):
+        """
+        Bounded LRU of rendered pages that empties itself whenever the data changes.
+
+        Args:
+            max_entries: Number of pages kept before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self.token = None
+        self.pages: OrderedDict[str, str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, token, key: str) -> str | None:
+        with self._lock:
+            if token != self.token:
+                self.token = token
+                self.pages.clear()
+            page = self.pages.get(key)
+            if page is None:
+                self.misses += 1
+                return None
+            self.pages.move_to_end(key)
+            self.hits += 1
+            return page
+
+    def put(self, token, key: str, page: str):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if token != self.token:
+                return
+            self.pages[key] = page
+            self.pages.move_to_end(key)
+            while len(self.pages) > self.max_entries:
+                self.pages.popitem(last=False)
+
+page_cache = PageCache(PAGE_CACHE_SIZE)
+
+def get_store() -> SQLiteStore:
+    """
+    Return the shared read-only store, opening it on first use.
+
+    The web UI never writes, so it skips schema setup and opens the database
+    with mode=ro. Connections are reused across requests rather than opened
+    per page view.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                # Create or migrate the database once at startup, then only ever read.
+                SQLiteStore(DB_PATH).close()
+                _store = SQLiteStore(DB_PATH, read_only=True, cache_size_kb=CACHE_SIZE_KB)
+    return _store
+
+def get_relevance() -> RelevanceIndex:
+    """
+    Return the relevance index beside the database, mapped on first use.
+
+    The scraper appends to it; the web UI only reads and picks up new rows
+    when the files change.
+    """
+    global _relevance
+    if _relevance is None:
+        with _store_lock:
+            if _relevance is None:
+                _relevance = RelevanceIndex.for_database(DB_PATH)
+    return _relevance
+
+@app.teardown_appcontext
+def release_connection(exception=None):
+    if _store is not None:
+        _store.release_connection()
+
+@app.before_request
+def start_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request(response: Response) -> Response:
+    # Streamed pages are timed up to their first chunk, which is what the browser waits on.
+    if "request_started" in g and request.endpoint != "metrics_page":
+        REQUEST_SECONDS.labels(request.endpoint or "unknown", response.status_code).observe(time.perf_counter() - g.request_started)
+    return response
+
+def encode_cursor(after: tuple) -> str:
+    return base64.urlsafe_b64encode(json.dumps(after).encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> tuple:
+    return tuple(json.loads(base64.urlsafe_b64decode(cursor.encode("ascii"))))
+
+def parse_query(args) -> JobQuery:
+    """Build a JobQuery from request arguments, ignoring empty form fields."""
+    values = {name: args[name] for name in QUERY_PARAMS if args.get(name)}
+    if args.get("after"):
+        values["after"] = decode_cursor(args["after"])
+    return JobQuery(**values)
+
+_TAG = re.compile(r"<[^>]*>|^[^<]*?>|<[^>]*$")
+_WHITESPACE = re.compile(r"\s+")
+
+@app.template_filter('highlight')
+def highlight(snippet: str) -> Markup:
+    """Render a search snippet as plain text with matches in <mark>."""
+    text = _WHITESPACE.sub(" ", _TAG.sub(" ", snippet)).strip()
+    text = str(escape(text)).replace("\x02", "<mark>").replace("\x03", "</mark>")
+    return Markup(text)
+
+def last_modified_from(analyzed_at: str | None) -> datetime | None:
+    if not analyzed_at:
+        return None
+    value = datetime.fromisoformat(analyzed_at)
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+def page_url(query: JobQuery, endpoint: str = 'list_jobs', **changes) -> str:
+    """URL for the list with query's filters and sort, overridden by changes."""
+    params = {name: getattr(query, name) for name in QUERY_PARAMS}
+    params.update(changes)
+    defaults = JobQuery()
+    params = {
+        name: value for name, value in params.items()
+        if value is not None and (name not in QUERY_PARAMS or value != getattr(defaults, name))
+    }
+    return url_for(endpoint, **params)
 
 @app.route('/')
 def list_jobs():
-    with get_store() as store:
-        # Get all analyzed jobs with their analysis results
-        conn = store._get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT 
-                jl.title,
-                jl.url,
-                jl.salary_min as salary_from,
-                jl.salary_max as salary_to,
-                aj.is_remote_score,
-                aj.is_applicable_score,
-                aj.is_european_score,
-                aj.analyzed_at
-            FROM job_listings jl
-            JOIN analyzed_jobs aj ON jl.id = aj.job_listing_id
-            ORDER BY aj.analyzed_at DESC
-        """)
-        rows = cursor.fetchall()
-        
-        # Convert rows to list of dicts with proper datetime objects
-        jobs = []
-        for row in rows:
-            job = dict(row)
-            job['analyzed_at'] = datetime.fromisoformat(job['analyzed_at'])
-            jobs.append(job)
-            
-        return render_template('jobs.html', jobs=jobs)
+    try:
+        query = parse_query(request.args)
+    except (ValidationError, ValueError) as e:
+        abort(400, description=str(e))
+
+    store = get_store()
+    token = store.get_analyses_version()
+    etag = f"{BOOT_ID}-{token[0]}-{token[2]}-{token[3]}"
+    last_modified = last_modified_from(token[1])
+
+    def conditional(response: Response) -> Response:
+        response.set_etag(etag)
+        response.last_modified = last_modified
+        # Let browsers keep the page but revalidate it on every refresh.
+        response.cache_control.no_cache = True
+        return response
+
+    # Auto-refreshing tabs end here without touching the job tables or the template.
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        return conditional(Response(status=304))
+
+    cache_key = request.query_string.decode("utf-8")
+    html = page_cache.get(token, cache_key)
+    if html is not None:
+        return conditional(Response(html, mimetype="text/html"))
+
+    # Get one page of analyzed jobs with their analysis results
+    page = store.get_analyzed_listings(query)
+    next_url = page_url(query, after=encode_cursor(page.next_after)) if page.next_after else None
+    context = dict(
+        jobs=page.rows,
+        query=query,
+        next_url=next_url,
+        first_url=page_url(query) if query.after else None,
+        page_url=page_url
+    )
+
+    # Large pages are streamed as they render rather than held in the cache.
+    if len(page.rows) >= STREAM_THRESHOLD:
+        return conditional(Response(stream_template('jobs.html', **context), mimetype="text/html"))
+
+    html = render_template('jobs.html', **context)
+    page_cache.put(token, cache_key, html)
+    return conditional(Response(html, mimetype="text/html"))
+
+@app.route('/search')
+def search_jobs():
+    text = request.args.get("q", "").strip()
+    try:
+        query = parse_query(request.args)
+    except (ValidationError, ValueError) as e:
+        abort(400, description=str(e))
+    if not text:
+        return redirect(page_url(query))
+    offset = max(0, request.args.get("offset", 0, type=int))
+
+    # Best text matches first, narrowed by the same score and salary filters as the list
+    rows = get_store().search(text, limit=query.limit + 1, offset=offset, filters=query)
+    next_url = None
+    if len(rows) > query.limit:
+        rows = rows[:query.limit]
+        next_url = page_url(query, 'search_jobs', q=text, offset=offset + query.limit)
+
+    return render_template(
+        'jobs.html',
+        jobs=rows,
+        query=query,
+        search_text=text,
+        next_url=next_url,
+        first_url=page_url(query, 'search_jobs', q=text) if offset else None,
+        page_url=page_url
+    )
+
+@app.route('/export.<format>')
+def export_jobs(format: str):
+    """
+    Stream all analyzed jobs matching the list filters as NDJSON, JSON or CSV.
+
+    Pass after_id=<analysis_id of the last row already pulled> to fetch only
+    analyses stored since. Rows go out as they are read, so memory use doesn't
+    grow with the export.
+    """
+    if format not in MIMETYPES:
+        abort(404)
+    try:
+        query = parse_query(request.args)
+        since = request.args.get("since") or None
+        if since:
+            datetime.fromisoformat(since)
+        after_id = request.args.get("after_id")
+        after_id = int(after_id) if after_id else None
+    except (ValidationError, ValueError) as e:
+        abort(400, description=str(e))
+
+    rows = get_store().iter_analyzed_listings(query, since=since, after_id=after_id)
+    response = Response(stream_with_context(export_rows(rows, format)), mimetype=MIMETYPES[format])
+    response.headers["Content-Disposition"] = f"attachment; filename=jobs.{format}"
+    return response
+
+@app.route('/similar/<int:job_id>')
+def similar_jobs(job_id: int):
+    """Listings whose wording is closest to one listing, from the local TF-IDF index."""
+    limit = min(max(1, request.args.get("limit", 20, type=int)), 100)
+    store = get_store()
+    source = store.get_listings([job_id])
+    if not source:
+        abort(404)
+    source = source[0]
+
+    # Reposts of the same role would fill the top of the list, so they are left out.
+    root = source["canonical_id"] or job_id
+    matches = get_relevance().similar(job_id, limit=limit * 2)
+    similarity = dict(matches)
+    rows = [
+        dict(row, similarity=similarity[row["listing_id"]])
+        for row in store.get_listings([match_id for match_id, _ in matches])
+        if (row["canonical_id"] or row["listing_id"]) != root
+    ][:limit]
+
+    return render_template(
+        'jobs.html',
+        jobs=rows,
+        query=JobQuery(),
+        similar_to=source,
+        page_url=page_url
+    )
+
+@app.route('/metrics')
+def metrics_page():
+    """
+    Prometheus metrics for the web UI plus the latest snapshots written by the
+    scraper and analyzer processes, each sample labelled with its process.
+    """
+    if not metrics.ENABLED:
+        abort(404)
+    PAGE_CACHE_PAGES.labels("hit").set(page_cache.hits)
+    PAGE_CACHE_PAGES.labels("miss").set(page_cache.misses)
+    for status, count in get_store().queue_counts().items():
+        QUEUE_JOBS.labels(status).set(count)
+
+    process = metrics.PROCESS_NAME or "web"
+    snapshots = metrics.read_snapshots(exclude=process)
+    now = time.time()
+    for source, data in snapshots.items():
+        SNAPSHOT_AGE.labels(source).set(round(now - data.get("written_at", now), 3))
+
+    body = metrics.render_prometheus({
+        process: metrics.snapshot(),
+        **{source: data["metrics"] for source, data in snapshots.items()}
+    })
+    return Response(body, mimetype="text/plain; version=0.0.4")
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
-
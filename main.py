@@ -1,9 +1,17 @@
 import argparse
+import importlib
+import random
+import signal
 import subprocess
 import sys
 import time
 import os
+import threading
+from pathlib import Path
 from threading import Thread
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parent
 
 def setup_argparse() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
@@ -18,6 +26,12 @@ Examples:
   python main.py --scraper --analyzer
   python main.py --web
 
+  # Rescrape every 30 minutes with two analyzer workers
+  python main.py --all --scrape-interval 1800 --analyzer-workers 2
+
+  # Start each component as its own python process, as before
+  python main.py --all --subprocess
+
   # Run with debug logging
   python main.py --all --debug
         """
@@ -47,6 +61,59 @@ Examples:
         help="Run the web interface"
     )
     
+    parser.add_argument(
+        "--scrape-interval",
+        type=float,
+        default=3600,
+        help="Seconds between scraper runs, 0 to scrape once (default: 3600)"
+    )
+    
+    parser.add_argument(
+        "--scrape-jitter",
+        type=float,
+        default=0.1,
+        help="Fraction the scrape interval is randomly shortened or lengthened by (default: 0.1)"
+    )
+    
+    parser.add_argument(
+        "--analyzer-workers",
+        type=int,
+        default=1,
+        help="Number of analyzer workers claiming from the queue (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Maximum number of jobs each analyzer worker analyzes at once (default: 4)"
+    )
+    
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Address the web interface listens on (default: 127.0.0.1)"
+    )
+    
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=5000,
+        help="Port the web interface listens on (default: 5000)"
+    )
+    
+    parser.add_argument(
+        "--db",
+        default=os.getenv("JOBS_DB_PATH", "data/jobs.db"),
+        help="SQLite database shared by all components (default: $JOBS_DB_PATH or data/jobs.db)"
+    )
+    
+    parser.add_argument(
+        "--subprocess",
+        action="store_true",
+        help="Start each component as a separate python process instead of supervising them in this one"
+    )
+    
     parser.add_argument(
         "--debug",
         action="store_true",
@@ -56,21 +123,181 @@ Examples:
     return parser
 
 def run_scraper(debug=False):
-    cmd = ["python", "scraper.py"]
+    cmd = [sys.executable, str(ROOT / "scraper.py")]
     if debug:
         cmd.append("--debug")
     subprocess.run(cmd)
 
 def run_analyzer(debug=False):
-    cmd = ["python", "analyzer.py"]
+    cmd = [sys.executable, str(ROOT / "analyzer.py")]
     if debug:
         cmd.append("--debug")
     subprocess.run(cmd)
 
 def run_web():
-    cmd = ["python", "list.py"]
+    cmd = [sys.executable, str(ROOT / "list.py")]
     subprocess.run(cmd)
 
+class Supervisor:
+    def __init__(self, base_backoff: float = 1.0, max_backoff: float = 300.0, healthy_after: float = 60.0, shutdown_timeout: float = 30.0, debug: bool = False):
+        """
+        Runs components as threads of this process and restarts the ones that fail.
+
+        Args:
+            base_backoff: Seconds before the first restart of a failed component
+            max_backoff: Upper bound for the doubling restart delay
+            healthy_after: Seconds a component must run before its backoff starts over
+            shutdown_timeout: Seconds to wait for components to finish after a stop signal
+            debug: Print tracebacks of component failures
+        """
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.healthy_after = healthy_after
+        self.shutdown_timeout = shutdown_timeout
+        self.debug = debug
+        self.stop = threading.Event()
+        self.components: list[tuple[str, Callable[[threading.Event], None], bool]] = []
+
+    def add(self, name: str, target: Callable[[threading.Event], None], run_once: bool = False):
+        """
+        Register a component.
+
+        Args:
+            name: Name used in log lines
+            target: Runs the component until the stop event passed to it is set
+            run_once: The component is done when target returns, rather than having exited unexpectedly
+        """
+        self.components.append((name, target, run_once))
+
+    def backoff(self, failures: int) -> float:
+        """Restart delay after consecutive failures, doubled each time with jitter so restarts don't align."""
+        delay = min(self.max_backoff, self.base_backoff * 2 ** (failures - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def supervise(self, name: str, target: Callable[[threading.Event], None], run_once: bool):
+        failures = 0
+        while not self.stop.is_set():
+            started = time.monotonic()
+            try:
+                target(self.stop)
+                if self.stop.is_set() or run_once:
+                    return
+                print(f"{name} exited unexpectedly")
+            except Exception as e:
+                if self.debug:
+                    import traceback
+                    traceback.print_exc()
+                print(f"{name} failed: {str(e)}")
+
+            if time.monotonic() - started >= self.healthy_after:
+                failures = 0
+            failures += 1
+            delay = self.backoff(failures)
+            print(f"Restarting {name} in {delay:.1f} seconds (failure {failures})")
+            self.stop.wait(delay)
+
+    def request_stop(self, signum=None, frame=None):
+        if not self.stop.is_set():
+            print("\nStopping all components...")
+        self.stop.set()
+
+    def run(self) -> int:
+        """Start every component and block until they finish or SIGTERM/SIGINT arrives."""
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+
+        threads = []
+        for name, target, run_once in self.components:
+            thread = Thread(target=self.supervise, args=(name, target, run_once), name=name, daemon=True)
+            thread.start()
+            threads.append(thread)
+
+        # Wake regularly so signal handlers run promptly on the main thread.
+        while not self.stop.wait(0.5):
+            if not any(thread.is_alive() for thread in threads):
+                return 0
+
+        deadline = time.monotonic() + self.shutdown_timeout
+        for thread in threads:
+            thread.join(max(0, deadline - time.monotonic()))
+        stuck = [thread.name for thread in threads if thread.is_alive()]
+        if stuck:
+            print(f"Gave up waiting for: {', '.join(stuck)}")
+            return 1
+        return 0
+
+def scheduled(task: Callable[[], None], interval: float, jitter: float) -> Callable[[threading.Event], None]:
+    """
+    Wrap task into a component that runs it now and then every interval seconds.
+
+    Each wait is randomly stretched or shrunk by up to jitter times the
+    interval, so restarts and several instances don't hit providers in step.
+    """
+    def target(stop: threading.Event):
+        while not stop.is_set():
+            task()
+            delay = interval * random.uniform(1 - jitter, 1 + jitter)
+            print(f"Next scrape in {delay / 60:.1f} minutes")
+            stop.wait(delay)
+    return target
+
+def supervise(args) -> int:
+    # Imported here so --subprocess and --help don't pay for loading every component.
+    from store.sqlite import SQLiteStore
+    from telemetry.metrics import set_process_name
+
+    set_process_name("main")
+    store = SQLiteStore(args.db)
+    supervisor = Supervisor(debug=args.debug)
+
+    if args.all or args.scraper:
+        from analyze.relevance import RelevanceIndex
+        from scrape.known import KnownURLs
+        from scraper import scrape
+        known = None
+        relevance = RelevanceIndex.for_database(args.db)
+
+        def scrape_once():
+            # Loaded on the first run and kept up to date by scrape(), so later runs skip the table scan.
+            nonlocal known
+            if known is None:
+                known = KnownURLs(store.iter_job_urls())
+            scrape(store, echo=args.debug, known=known, relevance=relevance)
+
+        if args.scrape_interval > 0:
+            supervisor.add("scraper", scheduled(scrape_once, args.scrape_interval, args.scrape_jitter))
+        else:
+            supervisor.add("scraper", lambda stop: scrape_once(), run_once=True)
+
+    if args.all or args.analyzer:
+        from analyze.analyzer import JobAnalyzer
+
+        def analyze(stop: threading.Event):
+            JobAnalyzer(store, concurrency=args.concurrency).run(stop=stop)
+
+        for worker in range(max(1, args.analyzer_workers)):
+            supervisor.add(f"analyzer-{worker + 1}", analyze)
+
+    if args.all or args.web:
+        from werkzeug.serving import make_server
+        web = importlib.import_module("list")
+        web.DB_PATH = args.db
+
+        def serve(stop: threading.Event):
+            server = make_server(args.host, args.port, web.app, threaded=True)
+            # Requests are accepted one poll at a time so the loop notices stop within the timeout.
+            server.timeout = 0.5
+            print(f"Web interface listening on http://{args.host}:{args.port}")
+            try:
+                while not stop.is_set():
+                    server.handle_request()
+            finally:
+                server.server_close()
+
+        supervisor.add("web", serve)
+
+    return supervisor.run()
+
 def main():
     parser = setup_argparse()
     args = parser.parse_args()
@@ -90,6 +317,16 @@ def main():
     print("Starting AI Job Hunter...")
     print("-" * 50)
     
+    if not args.subprocess:
+        try:
+            return supervise(args)
+        except Exception as e:
+            if args.debug:
+                import traceback
+                traceback.print_exc()
+            print(f"Error: {str(e)}")
+            return 1
+    
     try:
         threads = []
         
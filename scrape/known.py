@@ -0,0 +1,50 @@
+from array import array
+from bisect import bisect_left
+from typing import Iterable
+
+class KnownURLs:
+    def __init__(self, urls: Iterable[str] = (), merge_every: int = 10000):
+        """
+        Compact set of job URLs that are already stored, for skipping feed items early.
+
+        Each URL is kept as its 64-bit hash in a sorted array, about 8 bytes
+        per listing instead of a full string in a set, and looked up with a
+        binary search. Hashes are only compared within this process, so
+        Python's built-in string hash is enough. A collision would skip a new
+        listing, but at 64 bits that is vanishingly unlikely for the sizes
+        a job board produces.
+
+        Args:
+            urls: URLs to start from, typically SQLiteStore.iter_job_urls()
+            merge_every: URLs added after construction are held in a small set
+                and merged into the array once there are this many
+        """
+        self._hashes = array("q", sorted({hash(url) for url in urls}))
+        self._added: set[int] = set()
+        self.merge_every = merge_every
+
+    def _has(self, key: int) -> bool:
+        if key in self._added:
+            return True
+        index = bisect_left(self._hashes, key)
+        return index < len(self._hashes) and self._hashes[index] == key
+
+    def __contains__(self, url: str) -> bool:
+        return self._has(hash(url))
+
+    def __len__(self) -> int:
+        return len(self._hashes) + len(self._added)
+
+    def add(self, url: str):
+        """Remember a URL stored after the index was built."""
+        key = hash(url)
+        if self._has(key):
+            return
+        self._added.add(key)
+        if len(self._added) >= self.merge_every:
+            self._hashes = array("q", sorted([*self._hashes, *self._added]))
+            self._added.clear()
+
+    def memory_bytes(self) -> int:
+        """Approximate size of the hash array, excluding the pending set."""
+        return self._hashes.itemsize * len(self._hashes)
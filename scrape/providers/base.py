@@ -1,2 +1,119 @@
+from datetime import datetime
+from typing import Callable, Iterator, Sized
+from urllib.parse import urljoin
+import requests
+from scrape.known import KnownURLs
+from .client import HostPolicy, HTTPClient, get_client
+
+# Given a page's response, its URL and query parameters, return the next page's URL and parameters, or None after the last page.
+NextPage = Callable[[requests.Response, str, dict | None], tuple[str, dict | None] | None]
+
+def next_link(response: requests.Response, url: str, params: dict | None) -> tuple[str, dict | None] | None:
+    """Follow the Link: <...>; rel="next" header, as most paginated APIs send."""
+    link = response.links.get("next", {}).get("url")
+    # The next link already carries the query, so the first page's parameters aren't repeated.
+    return (urljoin(response.url, link), None) if link else None
+
+def page_number(param: str = "page", start: int = 1, items: Callable[[requests.Response], Sized] = lambda response: response.json(), page_size: int | None = None) -> NextPage:
+    """
+    Count a page number query parameter up until a page comes back empty.
+
+    Args:
+        param: Query parameter holding the page number
+        start: Number of the first page, when the first request doesn't set param
+        items: Returns the items of a page's response
+        page_size: Items on a full page; a shorter page is taken as the last one
+    """
+    def next_page(response: requests.Response, url: str, params: dict | None) -> tuple[str, dict | None] | None:
+        count = len(items(response))
+        if count == 0 or (page_size is not None and count < page_size):
+            return None
+        params = dict(params or {})
+        params[param] = int(params.get(param, start)) + 1
+        return url, params
+    return next_page
+
 class BaseScraper:
-    pass 
\ No newline at end of file
+    """
+    Base class for job board providers.
+
+    Before each run Scraper hands a provider the index of stored URLs and the
+    cutoff derived from its watermark. Providers call already_stored() on
+    every raw feed item before building a JobListing, so listings kept by
+    earlier runs cost neither validation nor hashing their descriptions.
+
+    Requests go through request() and paginate(), which share one pooled
+    HTTPClient across providers and keep to host_policy for the provider's
+    hosts. Providers are constructed with a use_cache keyword and listed in
+    scrape.providers.registry.
+    """
+    # Limits for the hosts this provider sends to; None uses the client's defaults.
+    host_policy: HostPolicy | None = None
+    # Client to send requests with; None uses the shared one from get_client().
+    client: HTTPClient | None = None
+    known: KnownURLs | None = None
+    since: datetime | None = None
+    items = 0
+    skipped = 0
+    newest: datetime | None = None
+
+    def begin_run(self, known: KnownURLs | None = None, since: datetime | None = None):
+        """
+        Reset per-run counters and set what counts as already stored.
+
+        Args:
+            known: URLs already in the store, or None to parse every item
+            since: Items published before this are skipped without a lookup, or None
+        """
+        self.known = known
+        self.since = since
+        self.items = 0
+        self.skipped = 0
+        self.newest = None
+
+    def already_stored(self, url: str, published_at: datetime) -> bool:
+        """Count a feed item and return True if an earlier run stored it."""
+        self.items += 1
+        if self.newest is None or published_at > self.newest:
+            self.newest = published_at
+        if (self.since is not None and published_at < self.since) or (self.known is not None and url in self.known):
+            self.skipped += 1
+            return True
+        return False
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the shared client, within the host's rate and concurrency limits."""
+        return (self.client or get_client()).request(method, url, policy=self.host_policy, **kwargs)
+
+    def paginate(self, url: str, params: dict | None = None, next_page: NextPage = next_link, max_pages: int = 1000, **kwargs) -> Iterator[requests.Response]:
+        """
+        Fetch a paginated listing page by page.
+
+        Each page is requested only once the previous one has been consumed,
+        so a provider that stops iterating, for example after reaching items
+        it already stored, sends no further requests.
+
+        Args:
+            url: First page
+            params: Query parameters of the first page
+            next_page: Finds the next page from a response; next_link or page_number(...)
+            max_pages: Stop after this many pages even if next_page goes on
+            **kwargs: Passed on to request()
+
+        Returns:
+            Iterator over each page's successful response
+        """
+        seen = set()
+        for _ in range(max_pages):
+            key = (url, tuple(sorted((params or {}).items())))
+            if key in seen:
+                # A board that links back to a page already read would otherwise loop until max_pages.
+                break
+            seen.add(key)
+            response = self.request("GET", url, params=params, **kwargs)
+            response.raise_for_status()
+            yield response
+            following = next_page(response, url, params)
+            if following is None:
+                break
+            url, params = following
@@ -0,0 +1,132 @@
+import gzip
+import os
+import time
+from hashlib import md5
+from pathlib import Path
+from typing import Iterable, Iterator
+from pydantic import BaseModel
+
+class CacheEntry(BaseModel):
+    url: str
+    etag: str | None = None
+    last_modified: str | None = None
+    stored_at: float
+    size: int = 0
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Headers that turn a GET into a conditional request for this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+class HTTPCache:
+    def __init__(self, cache_dir: str | Path = "data/http_cache", max_age: float = 24 * 3600, max_size: int = 50 * 1024 * 1024):
+        """
+        On-disk cache of provider responses with their validators.
+
+        Args:
+            cache_dir: Directory holding the metadata and gzip-compressed bodies
+            max_age: Seconds an entry may be revalidated before it is refetched in full
+            max_size: Total bytes of compressed bodies kept; oldest entries are evicted first
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self.max_size = max_size
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = md5(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.gz"
+
+    def get(self, url: str) -> CacheEntry | None:
+        """Return the cached entry for url, or None if missing or older than max_age."""
+        meta_path, body_path = self._paths(url)
+        try:
+            entry = CacheEntry.model_validate_json(meta_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.stored_at > self.max_age or not body_path.exists():
+            self._remove(url)
+            return None
+        return entry
+
+    def read_body(self, url: str) -> bytes | None:
+        """Return the decompressed body stored for url."""
+        _, body_path = self._paths(url)
+        try:
+            with gzip.open(body_path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, url: str, body: bytes, etag: str | None = None, last_modified: str | None = None) -> CacheEntry:
+        """Store a response body compressed on disk along with its validators."""
+        for _ in self.store_stream(url, [body], etag=etag, last_modified=last_modified):
+            pass
+        return self.get(url)
+
+    def store_stream(self, url: str, chunks: Iterable[bytes], etag: str | None = None, last_modified: str | None = None) -> Iterator[bytes]:
+        """
+        Pass chunks through while compressing them to disk.
+
+        The entry is only committed once every chunk has been consumed, so an
+        interrupted download never replaces a good cached copy.
+        """
+        meta_path, body_path = self._paths(url)
+
+        # Write to temporary files first so a crash never leaves a half-written entry.
+        tmp_body = body_path.with_suffix(".gz.tmp")
+        try:
+            with gzip.open(tmp_body, "wb", compresslevel=6) as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    yield chunk
+        except BaseException:
+            tmp_body.unlink(missing_ok=True)
+            raise
+
+        entry = CacheEntry(
+            url=url,
+            etag=etag,
+            last_modified=last_modified,
+            stored_at=time.time(),
+            size=tmp_body.stat().st_size
+        )
+        tmp_meta = meta_path.with_suffix(".json.tmp")
+        tmp_meta.write_text(entry.model_dump_json())
+        os.replace(tmp_body, body_path)
+        os.replace(tmp_meta, meta_path)
+
+        self._enforce_size_limit()
+
+    def touch(self, url: str):
+        """Mark an entry as freshly revalidated after a 304 response."""
+        entry = self.get(url)
+        if entry is None:
+            return
+        meta_path, _ = self._paths(url)
+        entry.stored_at = time.time()
+        meta_path.write_text(entry.model_dump_json())
+
+    def _remove(self, url: str):
+        for path in self._paths(url):
+            path.unlink(missing_ok=True)
+
+    def _enforce_size_limit(self):
+        entries = []
+        for meta_path in self.cache_dir.glob("*.json"):
+            try:
+                entries.append(CacheEntry.model_validate_json(meta_path.read_text()))
+            except (OSError, ValueError):
+                meta_path.unlink(missing_ok=True)
+
+        total = sum(entry.size for entry in entries)
+        for entry in sorted(entries, key=lambda e: e.stored_at):
+            if total <= self.max_size:
+                break
+            self._remove(entry.url)
+            total -= entry.size
@@ -0,0 +1,246 @@
+"""
+Shared HTTP client for job board providers.
+
+Every provider sends its requests through one pooled requests.Session, so
+connections to a board are kept alive across pages, runs and providers.
+Each host gets its own rate limit and cap on requests in flight, shared by
+all threads. 429 responses are retried with backoff, and so are 5xx responses
+and connection errors for idempotent methods.
+"""
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, UTC
+from urllib.parse import urlsplit
+import requests
+from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from telemetry.metrics import counter, histogram
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# A 5xx or a dropped connection may come after the server acted on the
+# request, so only these are sent again then. A 429 means it wasn't handled
+# at all, which makes it safe to retry for any method.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+USER_AGENT = os.getenv("SCRAPER_USER_AGENT", "ai-job-hunter/1.0 (+https://github.com/prodigeris/ai-job-hunter)")
+
+HTTP_REQUESTS = counter("scraper_http_requests_total", "Provider HTTP responses by host and status", ("host", "status"))
+HTTP_RETRIES = counter("scraper_http_retries_total", "Provider requests retried by host and reason", ("host", "reason"))
+HTTP_THROTTLE_SECONDS = counter("scraper_http_throttle_seconds_total", "Seconds requests waited for their host's rate limit", ("host",))
+HTTP_REQUEST_SECONDS = histogram("scraper_http_request_seconds", "Time until provider response headers arrived", ("host",))
+
+class HostPolicy(BaseModel):
+    # Sustained requests per second; None disables the rate limit.
+    rate: float | None = 2.0
+    # Requests that may be sent back to back before the rate applies.
+    burst: int = 1
+    # Requests to the host in flight at once, including streamed bodies still being read.
+    concurrency: int = 4
+
+class _Host:
+    def __init__(self, policy: HostPolicy):
+        self.policy = policy
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(max(1, policy.concurrency))
+        # Earliest time the next request may start when no burst is left.
+        self.next_at = 0.0
+
+    def reserve(self) -> float:
+        """Claim the next send slot and return how long to wait for it."""
+        if not self.policy.rate:
+            return 0.0
+        interval = 1 / self.policy.rate
+        tolerance = interval * (max(1, self.policy.burst) - 1)
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_at - tolerance)
+            self.next_at = max(self.next_at, now) + interval
+            return start - now
+
+    def hold_off(self, seconds: float):
+        """Keep every thread from sending to this host for the given time, as asked by Retry-After."""
+        with self.lock:
+            self.next_at = max(self.next_at, time.monotonic() + seconds)
+
+def retry_after(response: requests.Response) -> float | None:
+    """Seconds the Retry-After header asks to wait, from either of its forms."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(UTC)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+class HTTPClient:
+    def __init__(
+        self,
+        pool_size: int = 16,
+        policy: HostPolicy | None = None,
+        retries: int = 4,
+        backoff: float = 0.5,
+        max_backoff: float = 30,
+        max_retry_after: float = 120,
+        timeout: float = 30
+    ):
+        """
+        Pooled session with per-host politeness limits and retries.
+
+        Args:
+            pool_size: Keep-alive connections kept per host
+            policy: Limits for hosts no provider has set its own for
+            retries: Times a request is retried after a 429, or after a 5xx or
+                connection error if its method is idempotent
+            backoff: Seconds before the first retry; doubled on each further attempt
+            max_backoff: Upper bound on the backoff between attempts
+            max_retry_after: Longest Retry-After honoured; a longer one fails the request
+            timeout: Default seconds to wait for the connection and each read
+        """
+        self.policy = policy or HostPolicy()
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.timeout = timeout
+        self._hosts: dict[str, _Host] = {}
+        self._hosts_lock = threading.Lock()
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _host(self, host: str, policy: HostPolicy | None) -> _Host:
+        with self._hosts_lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = _Host(policy or self.policy)
+            return state
+
+    def set_policy(self, host: str, policy: HostPolicy):
+        """Replace the limits for host, for requests started from now on."""
+        with self._hosts_lock:
+            self._hosts[host] = _Host(policy)
+
+    def _delay(self, attempt: int, response: requests.Response | None) -> float:
+        requested = retry_after(response) if response is not None else None
+        if requested is not None:
+            return requested
+        # Equal jitter: at least half the exponential step, so retries from
+        # several threads spread out without any of them retrying at once.
+        step = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return step / 2 + random.uniform(0, step / 2)
+
+    def request(self, method: str, url: str, policy: HostPolicy | None = None, **kwargs) -> requests.Response:
+        """
+        Send a request within its host's limits, retrying 429 and, for idempotent methods, 5xx and connection errors.
+
+        A streamed response keeps its concurrency slot until it is closed, so
+        use it as a context manager or read it to the end.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            policy: Limits used if this is the first request to the host
+            **kwargs: Passed on to requests.Session.request
+
+        Returns:
+            The final response; its status may still be an error once retries are exhausted
+        """
+        host = urlsplit(url).netloc
+        state = self._host(host, policy)
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+        while True:
+            state.slots.acquire()
+            released = False
+
+            def release():
+                nonlocal released
+                if not released:
+                    released = True
+                    state.slots.release()
+
+            try:
+                wait = state.reserve()
+                if wait > 0:
+                    HTTP_THROTTLE_SECONDS.labels(host).inc(wait)
+                    time.sleep(wait)
+                with HTTP_REQUEST_SECONDS.labels(host).time():
+                    response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                release()
+                if attempt >= self.retries or not idempotent:
+                    raise
+                HTTP_RETRIES.labels(host, type(e).__name__).inc()
+                delay = self._delay(attempt, None)
+                print(f"Request to {host} failed ({str(e)}), retrying in {delay:.1f}s", flush=True)
+                time.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                release()
+                raise
+
+            HTTP_REQUESTS.labels(host, str(response.status_code)).inc()
+            retryable = response.status_code == 429 or (response.status_code in RETRY_STATUSES and idempotent)
+            if retryable and attempt < self.retries:
+                delay = self._delay(attempt, response)
+                response.close()
+                release()
+                if delay > self.max_retry_after:
+                    raise requests.HTTPError(f"{host} asked to retry after {delay:.0f}s, longer than {self.max_retry_after:.0f}s", response=response)
+                if response.status_code == 429:
+                    # Everyone else sending to this host waits too, not only this request.
+                    state.hold_off(delay)
+                HTTP_RETRIES.labels(host, str(response.status_code)).inc()
+                print(f"{host} answered {response.status_code}, retrying in {delay:.1f}s", flush=True)
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            if kwargs.get("stream"):
+                close = response.close
+
+                def close_and_release():
+                    try:
+                        close()
+                    finally:
+                        release()
+
+                response.close = close_and_release
+            else:
+                release()
+            return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+_client: HTTPClient | None = None
+_client_lock = threading.Lock()
+
+def get_client() -> HTTPClient:
+    """
+    Return the HTTP client shared by all providers, creating it on first use.
+
+    SCRAPER_RATE_LIMIT and SCRAPER_HOST_CONCURRENCY set the default limits
+    for hosts whose provider doesn't declare its own.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                rate = float(os.getenv("SCRAPER_RATE_LIMIT", "2"))
+                _client = HTTPClient(policy=HostPolicy(
+                    rate=rate if rate > 0 else None,
+                    concurrency=int(os.getenv("SCRAPER_HOST_CONCURRENCY", "4"))
+                ))
+    return _client
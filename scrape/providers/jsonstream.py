@@ -0,0 +1,75 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Incrementally decode a top-level JSON array, yielding each element as soon as it is complete.
+
+    Only the element currently being decoded is buffered, so memory stays bounded by the
+    largest single element rather than the whole payload.
+
+    Args:
+        chunks: Raw UTF-8 bytes of the payload, in order
+
+    Returns:
+        Iterator over the decoded array elements
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buf = ""
+    pos = 0
+    started = False
+    exhausted = False
+
+    def more() -> bool:
+        nonlocal buf, pos, exhausted
+        if exhausted:
+            return False
+        for chunk in chunks:
+            if chunk:
+                # Drop the consumed prefix so the buffer never grows with the payload.
+                buf = buf[pos:] + decoder.decode(chunk)
+                pos = 0
+                return True
+        buf = buf[pos:] + decoder.decode(b"", final=True)
+        pos = 0
+        exhausted = True
+        return False
+
+    while True:
+        while pos < len(buf) and buf[pos] in _WHITESPACE or (started and pos < len(buf) and buf[pos] == ","):
+            pos += 1
+        if pos >= len(buf):
+            if not more():
+                if started:
+                    raise ValueError("Unexpected end of JSON array")
+                return
+            continue
+
+        if not started:
+            if buf[pos] != "[":
+                raise ValueError("Expected a JSON array")
+            started = True
+            pos += 1
+            continue
+
+        if buf[pos] == "]":
+            return
+
+        try:
+            item, end = _decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if not more():
+                raise
+            continue
+        # A number cut off at the chunk boundary (e.g. "12" or "4." of "4.5") still
+        # decodes, so only trust a match that is followed by a delimiter.
+        if not exhausted and (end >= len(buf) or buf[end] not in _WHITESPACE + ",]"):
+            more()
+            continue
+        pos = end
+        yield item
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl
 from datetime import datetime, UTC
 from hashlib import md5
 
@@ -7,12 +7,14 @@ class JobListing(BaseModel):
     url: HttpUrl
     content: str
     _checksum: str = ""
-    published_at: datetime = datetime.now(UTC)
-    created_at: datetime = datetime.now(UTC)
+    published_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     salary_min: float | None = None
     salary_max: float | None = None
     location: str | None = None
     title: str | None = None
+    # Id of the earlier listing this one reposts, set by the store.
+    canonical_id: int | None = None
 
     @property
     def checksum(self) -> str:
@@ -0,0 +1,113 @@
+"""
+Names of the job board providers the scraper can run.
+
+Providers are registered as "module:Class" strings and only imported when a
+run uses them, so a broken or slow-to-import provider costs nothing until it
+is enabled. Besides the built-in ones, installed packages can add providers
+under the "ai_job_hunter.providers" entry point group, and SCRAPER_PROVIDERS
+can name a provider class directly.
+"""
+import importlib
+import os
+import threading
+from importlib.metadata import entry_points
+from typing import Callable
+
+ENTRY_POINT_GROUP = "ai_job_hunter.providers"
+DEFAULT_PROVIDERS = "remoteok"
+
+_providers: dict[str, str] = {
+    "remoteok": "scrape.providers.remoteok:RemoteOKScraper",
+}
+_loaded: dict[str, type] = {}
+_lock = threading.Lock()
+_entry_points_read = False
+
+def register(name: str, target: str):
+    """
+    Make a provider available under name.
+
+    Args:
+        name: Name used in SCRAPER_PROVIDERS and --providers
+        target: "package.module:Class" of a BaseScraper subclass, imported on first use
+    """
+    if ":" not in target:
+        raise ValueError(f"Provider target must look like 'module:Class', got {target!r}")
+    with _lock:
+        _providers[name] = target
+        _loaded.pop(name, None)
+
+def _read_entry_points():
+    global _entry_points_read
+    if _entry_points_read:
+        return
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        # Built-in names win, so an installed package can't silently replace one.
+        _providers.setdefault(entry_point.name, entry_point.value)
+    _entry_points_read = True
+
+def available() -> dict[str, str]:
+    """Return every registered provider name with its "module:Class" target."""
+    with _lock:
+        _read_entry_points()
+        return dict(_providers)
+
+def load(name: str) -> type:
+    """
+    Import and return the provider class registered as name.
+
+    Raises:
+        KeyError: If no provider is registered under name
+    """
+    with _lock:
+        if name in _loaded:
+            return _loaded[name]
+        _read_entry_points()
+        if name not in _providers:
+            raise KeyError(f"Unknown provider {name!r}; available: {', '.join(sorted(_providers))}")
+        module_name, _, attribute = _providers[name].partition(":")
+        provider = getattr(importlib.import_module(module_name), attribute)
+        _loaded[name] = provider
+        return provider
+
+def parse(spec: str | None = None) -> list[str]:
+    """
+    Resolve a provider list into registered names.
+
+    Entries are comma-separated names, or name=module:Class to register a
+    provider in the same breath. Defaults to SCRAPER_PROVIDERS, then to
+    the built-in providers.
+    """
+    spec = spec or os.getenv("SCRAPER_PROVIDERS") or DEFAULT_PROVIDERS
+    names = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, separator, target = entry.partition("=")
+        name = name.strip()
+        if separator:
+            register(name, target.strip())
+        names.append(name)
+    return names
+
+def factories(names: list[str], **options) -> list[Callable]:
+    """
+    Build a provider factory per name, for Scraper.
+
+    Classes are imported here rather than when the registry is read, and a
+    provider that fails to import is reported and left out of the run.
+
+    Args:
+        names: Registered provider names
+        **options: Keyword arguments every provider is constructed with, such as use_cache
+    """
+    result = []
+    for name in names:
+        try:
+            provider = load(name)
+        except Exception as e:
+            print(f"Failed to load provider {name}: {str(e)}")
+            continue
+        result.append(lambda provider=provider: provider(**options))
+    return result
@@ -1,55 +1,94 @@
-import requests
 from datetime import datetime, UTC
+from typing import Iterator
 from .base import BaseScraper
+from .client import HostPolicy
+from .cache import HTTPCache
+from .jsonstream import iter_json_array
 from .models import JobListing
 
 class RemoteOKScraper(BaseScraper):
-    def fetch_jobs(self):
+    api_url = "https://remoteok.com/api"
+    # One feed request per run; RemoteOK asks API users to keep the request rate low.
+    host_policy = HostPolicy(rate=1.0, burst=2, concurrency=1)
+
+    def __init__(self, api_url: str | None = None, cache: HTTPCache | None = None, use_cache: bool = True):
+        self.api_url = api_url or self.api_url
+        self.cache = cache if cache is not None else (HTTPCache() if use_cache else None)
+
+    def fetch_jobs(self) -> Iterator[JobListing]:
+        """Yield job listings as the RemoteOK feed is downloaded and decoded."""
         print("Fetching jobs from RemoteOK API...", flush=True)
-        res = requests.get("https://remoteok.com/api", timeout=30)
-        data = res.json()
+        entry = self.cache.get(self.api_url) if self.cache else None
+        headers = entry.conditional_headers() if entry else {}
+
+        with self.request("GET", self.api_url, headers=headers, stream=True) as res:
+            if res.status_code == 304:
+                # Nothing changed since the cached copy, so there is nothing new to parse or store.
+                self.cache.touch(self.api_url)
+                print("RemoteOK feed not modified since last fetch, skipping", flush=True)
+                return
+            res.raise_for_status()
+
+            chunks = res.iter_content(chunk_size=64 * 1024)
+            etag = res.headers.get("ETag")
+            last_modified = res.headers.get("Last-Modified")
+            if self.cache and (etag or last_modified):
+                chunks = self.cache.store_stream(self.api_url, chunks, etag=etag, last_modified=last_modified)
+
+            count = 0
+            for item in iter_json_array(chunks):
+                job = self._parse_item(item)
+                if job is not None:
+                    count += 1
+                    yield job
 
-        jobs = []
-        for item in data:
-            if item.get("position") is None:
-                continue
+            # Drain the stream so the cache sees the complete body and commits it.
+            for _ in chunks:
+                pass
 
-            # Parse the date string to timestamp
-            date_str = item.get("date", "")
+        print(f"Successfully fetched {count} jobs ({self.skipped} of {self.items} feed items already stored)", flush=True)
+
+    def _parse_item(self, item: dict) -> JobListing | None:
+        if not isinstance(item, dict) or item.get("position") is None:
+            return None
+
+        # Parse the date string to timestamp
+        date_str = item.get("date", "")
+        try:
+            timestamp = int(float(date_str)) if date_str else int(datetime.now().timestamp())
+        except (ValueError, TypeError):
+            timestamp = int(datetime.now().timestamp())
+        published_at = datetime.fromtimestamp(timestamp, UTC)
+
+        url = item.get("url", "")
+        if self.already_stored(url, published_at):
+            return None
+
+        # Parse salary range if available
+        salary_str = item.get("salary", "")
+        salary_min = None
+        salary_max = None
+        if salary_str:
             try:
-                timestamp = int(float(date_str)) if date_str else int(datetime.now().timestamp())
+                # Remove currency symbols and 'k' suffix, convert to float
+                salary_clean = salary_str.replace("$", "").replace("k", "000")
+                if "-" in salary_clean:
+                    min_str, max_str = salary_clean.split("-")
+                    salary_min = float(min_str.strip())
+                    salary_max = float(max_str.strip())
+                else:
+                    salary_val = float(salary_clean)
+                    salary_min = salary_max = salary_val
             except (ValueError, TypeError):
-                timestamp = int(datetime.now().timestamp())
-
-            # Parse salary range if available
-            salary_str = item.get("salary", "")
-            salary_min = None
-            salary_max = None
-            if salary_str:
-                try:
-                    # Remove currency symbols and 'k' suffix, convert to float
-                    salary_clean = salary_str.replace("$", "").replace("k", "000")
-                    if "-" in salary_clean:
-                        min_str, max_str = salary_clean.split("-")
-                        salary_min = float(min_str.strip())
-                        salary_max = float(max_str.strip())
-                    else:
-                        salary_val = float(salary_clean)
-                        salary_min = salary_max = salary_val
-                except (ValueError, TypeError):
-                    pass
-
-            job = JobListing(
-                url=item.get("url", ""),
-                content=item.get("description", ""),
-                published_at=datetime.fromtimestamp(timestamp, UTC),
-                created_at=datetime.now(UTC),
-                location=item.get("location"),
-                salary_min=salary_min,
-                salary_max=salary_max,
-                title=item.get("position")
-            )
-            jobs.append(job)
-
-        print(f"Successfully fetched {len(jobs)} jobs", flush=True)
-        return jobs
+                pass
+
+        return JobListing(
+            url=url,
+            content=item.get("description", ""),
+            published_at=published_at,
+            created_at=datetime.now(UTC),
+            location=item.get("location"),
+            salary_min=salary_min,
+            salary_max=salary_max,
+            title=item.get("position")
+        )
@@ -1,33 +1,196 @@
-from typing import List, Type
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Iterator, List, Type
+from telemetry.metrics import counter, histogram
+from .known import KnownURLs
 from .providers.models import JobListing
 
+PROVIDER_FETCH_SECONDS = histogram("scraper_provider_fetch_seconds", "Time each provider fetch took", ("provider",))
+PROVIDER_FETCHES = counter("scraper_provider_fetches_total", "Provider fetches by how they finished", ("provider", "status"))
+PROVIDER_JOBS = counter("scraper_provider_jobs_total", "Job listings yielded by each provider", ("provider",))
+PROVIDER_SKIPPED = counter("scraper_provider_skipped_total", "Feed items skipped before parsing because an earlier run stored them", ("provider",))
+
 class Scraper:
-    def __init__(self, providers: List[Type]):
+    def __init__(
+        self,
+        providers: List[Type],
+        max_workers: int = 4,
+        provider_timeout: float | None = 60,
+        total_timeout: float | None = 120,
+        buffer_size: int = 1000,
+        known: KnownURLs | None = None,
+        watermarks: dict[str, datetime] | None = None,
+        watermark_grace: float = 86400
+    ):
         """
         Initialize the scraper with a list of provider classes.
-        
+
         Args:
             providers: List of provider classes that inherit from BaseScraper
+            max_workers: Number of providers fetched concurrently
+            provider_timeout: Seconds a single provider may run before the rest of its results are dropped
+            total_timeout: Seconds the whole fetch may run before remaining providers are abandoned
+            buffer_size: Maximum number of parsed jobs held between providers and the consumer
+            known: URLs already stored; feed items with these URLs are skipped before parsing
+            watermarks: Newest published_at stored per provider name, from SQLiteStore.get_watermarks
+            watermark_grace: Seconds before a provider's watermark from which items are still
+                looked up rather than skipped, for feeds that list jobs slightly out of order
         """
         self.providers = [provider() for provider in providers]
+        self.max_workers = max(1, max_workers)
+        self.provider_timeout = provider_timeout
+        self.total_timeout = total_timeout
+        self.buffer_size = buffer_size
+        self.known = known
+        self.watermarks = watermarks or {}
+        self.watermark_grace = timedelta(seconds=watermark_grace)
+        self.timings: dict[str, dict] = {}
+
+    def _put(self, results: queue.Queue, message: tuple, cancelled: threading.Event) -> bool:
+        # The queue is bounded, so a slow consumer applies backpressure here.
+        while not cancelled.is_set():
+            try:
+                results.put(message, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fetch_provider(self, provider, results: queue.Queue, cancelled: threading.Event):
+        watermark = self.watermarks.get(provider.__class__.__name__)
+        provider.begin_run(self.known, watermark - self.watermark_grace if watermark else None)
+        start = time.monotonic()
+        count = 0
+        error = None
+        try:
+            for job in provider.fetch_jobs():
+                if not self._put(results, ("job", provider, job), cancelled):
+                    return
+                count += 1
+        except Exception as e:
+            error = e
+        self._put(results, ("done", provider, (count, error, time.monotonic() - start)), cancelled)
+
+    def iter_jobs(self) -> Iterator[JobListing]:
+        """
+        Stream jobs from all configured providers concurrently.
+
+        Jobs are yielded as soon as any provider parses them. A provider that
+        raises or exceeds its deadline is reported and skipped without
+        blocking the rest.
+
+        Returns:
+            Iterator over JobListing objects from all providers
+        """
+        self.timings = {}
+
+        results = queue.Queue(maxsize=self.buffer_size)
+        waiting = list(self.providers)
+        running = {}  # provider -> (start time, cancel event)
+        global_deadline = time.monotonic() + self.total_timeout if self.total_timeout else None
+
+        def start_next():
+            # Providers run in daemon threads so an abandoned one never blocks
+            # the remaining providers or interpreter shutdown.
+            while waiting and len(running) < self.max_workers:
+                provider = waiting.pop(0)
+                print(f"Fetching jobs from {provider.__class__.__name__}...")
+                cancelled = threading.Event()
+                running[provider] = (time.monotonic(), cancelled)
+                threading.Thread(
+                    target=self._fetch_provider,
+                    args=(provider, results, cancelled),
+                    name=f"fetch-{provider.__class__.__name__}",
+                    daemon=True
+                ).start()
+
+        def abandon(provider, reason: str):
+            start, cancelled = running.pop(provider)
+            cancelled.set()
+            self.timings[provider.__class__.__name__] = {"status": reason, "jobs": counts.get(provider, 0), "seconds": time.monotonic() - start, **feed_counts(provider)}
+
+        def feed_counts(provider) -> dict:
+            return {"items": provider.items, "skipped": provider.skipped, "newest": provider.newest}
+
+        counts = {}
+        start_next()
+        try:
+            while running:
+                now = time.monotonic()
+                deadlines = [start + self.provider_timeout for start, _ in running.values()] if self.provider_timeout else []
+                if global_deadline:
+                    deadlines.append(global_deadline)
+
+                try:
+                    timeout = max(0, min(deadlines) - now) if deadlines else None
+                    kind, provider, payload = results.get(timeout=timeout)
+                except queue.Empty:
+                    kind, provider = None, None
+
+                if provider in running:
+                    name = provider.__class__.__name__
+                    if kind == "job":
+                        counts[provider] = counts.get(provider, 0) + 1
+                        yield payload
+                    else:
+                        count, error, elapsed = payload
+                        del running[provider]
+                        if error is None:
+                            self.timings[name] = {"status": "ok", "jobs": count, "seconds": elapsed, **feed_counts(provider)}
+                            print(f"Successfully fetched {count} jobs from {name}")
+                        else:
+                            self.timings[name] = {"status": "error", "jobs": count, "seconds": elapsed, **feed_counts(provider)}
+                            print(f"Error fetching jobs from {name}: {str(error)}")
+
+                now = time.monotonic()
+                if global_deadline and now >= global_deadline:
+                    for provider in list(running):
+                        print(f"Global deadline reached, abandoning {provider.__class__.__name__}")
+                        abandon(provider, "timeout")
+                    for provider in waiting:
+                        self.timings[provider.__class__.__name__] = {"status": "skipped", "jobs": 0, "seconds": 0.0, "items": 0, "skipped": 0, "newest": None}
+                    waiting.clear()
+                    break
+
+                if self.provider_timeout:
+                    for provider, (start, _) in list(running.items()):
+                        if now - start >= self.provider_timeout:
+                            print(f"Timed out fetching jobs from {provider.__class__.__name__} after {self.provider_timeout}s")
+                            abandon(provider, "timeout")
+
+                start_next()
+        finally:
+            # Stop any providers still running if the consumer bails out early.
+            for provider in list(running):
+                abandon(provider, "cancelled")
+
+        self.record_metrics()
+        self.report_timings()
 
     def fetch_all_jobs(self) -> List[JobListing]:
         """
         Fetch jobs from all configured providers.
-        
+
         Returns:
             List of JobListing objects from all providers
         """
-        all_jobs = []
-        
-        for provider in self.providers:
-            try:
-                print(f"Fetching jobs from {provider.__class__.__name__}...")
-                jobs = provider.fetch_jobs()
-                all_jobs.extend(jobs)
-                print(f"Successfully fetched {len(jobs)} jobs from {provider.__class__.__name__}")
-            except Exception as e:
-                print(f"Error fetching jobs from {provider.__class__.__name__}: {str(e)}")
-                continue
+        return list(self.iter_jobs())
+
+    def record_metrics(self):
+        """Add this run's provider timings to the scraper metrics."""
+        for name, timing in self.timings.items():
+            PROVIDER_FETCHES.labels(name, timing["status"]).inc()
+            PROVIDER_JOBS.labels(name).inc(timing["jobs"])
+            PROVIDER_SKIPPED.labels(name).inc(timing["skipped"])
+            if timing["status"] != "skipped":
+                PROVIDER_FETCH_SECONDS.labels(name).observe(timing["seconds"])
 
-        return all_jobs
+    def report_timings(self):
+        """Print how long each provider took and how it finished."""
+        if not self.timings:
+            return
+        print("\nProvider timings:")
+        for name, timing in sorted(self.timings.items(), key=lambda item: -item[1]["seconds"]):
+            print(f"  {name}: {timing['status']}, {timing['jobs']} jobs parsed from {timing['items']} feed items ({timing['skipped']} already stored) in {timing['seconds']:.2f}s")
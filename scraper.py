@@ -1,7 +1,13 @@
 import argparse
+from analyze.relevance import RelevanceIndex
+from typing import Iterable, Iterator
+from scrape.known import KnownURLs
 from scrape.scraper import Scraper
-from scrape.providers.remoteok import RemoteOKScraper
+from scrape.providers.models import JobListing
+from scrape.providers import registry
+from store.models import IngestResult
 from store.sqlite import SQLiteStore
+from telemetry.metrics import write_snapshot
 
 def setup_argparse() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
@@ -14,9 +20,80 @@ Examples:
 
   # Run scraper with debug logging
   python scraper.py --debug
+
+  # Fetch up to 8 providers at once, giving each at most 20 seconds
+  python scraper.py --workers 8 --provider-timeout 20
+
+  # Only fetch RemoteOK, or add a provider class from an installed package
+  python scraper.py --providers remoteok
+  python scraper.py --providers remoteok,myboard=myboards.board:MyBoardScraper
+
+  # Parse every feed item, even those stored by earlier runs
+  python scraper.py --full
+
+  # Store jobs without updating the local relevance index
+  python scraper.py --no-relevance
         """
     )
     
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of providers to fetch concurrently (default: 4)"
+    )
+    
+    parser.add_argument(
+        "--providers",
+        help="Comma-separated providers to fetch, as names or name=module:Class "
+             "(default: $SCRAPER_PROVIDERS or remoteok)"
+    )
+    
+    parser.add_argument(
+        "--list-providers",
+        action="store_true",
+        help="Print the registered providers and exit"
+    )
+    
+    parser.add_argument(
+        "--provider-timeout",
+        type=float,
+        default=60,
+        help="Seconds a single provider may take before it is skipped (default: 60)"
+    )
+    
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=120,
+        help="Seconds the whole fetch may take across all providers (default: 120)"
+    )
+    
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Number of jobs written to the database per transaction (default: 500)"
+    )
+    
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always download full provider feeds instead of sending conditional requests"
+    )
+    
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Parse every feed item instead of skipping URLs and dates already stored"
+    )
+    
+    parser.add_argument(
+        "--no-relevance",
+        action="store_true",
+        help="Don't add new jobs to the relevance index or score them against the profile"
+    )
+    
     parser.add_argument(
         "--debug",
         action="store_true",
@@ -25,33 +102,121 @@ Examples:
     
     return parser
 
+def echo_jobs(jobs: Iterable[JobListing]) -> Iterator[JobListing]:
+    for job in jobs:
+        print(f"\nURL: {job.url}")
+        print(f"Published: {job.published_at}")
+        print(f"Content: {job.content[:200]}...")
+        yield job
+
+def scrape(
+    store: SQLiteStore,
+    workers: int = 4,
+    provider_timeout: float = 60,
+    total_timeout: float = 120,
+    batch_size: int = 500,
+    use_cache: bool = True,
+    echo: bool = True,
+    incremental: bool = True,
+    known: KnownURLs | None = None,
+    relevance: RelevanceIndex | None = None,
+    providers: str | None = None
+) -> IngestResult:
+    """
+    Fetch every provider once and store the new jobs.
+
+    Args:
+        store: Store the jobs are written to
+        workers: Number of providers fetched concurrently
+        provider_timeout: Seconds a single provider may take before it is skipped
+        total_timeout: Seconds the whole fetch may take across all providers
+        batch_size: Number of jobs written to the database per transaction
+        use_cache: Send conditional requests based on the previous download
+        echo: Print each job as it is stored
+        incremental: Skip feed items whose URL is stored or that predate the provider's watermark
+        known: Index of stored URLs to reuse across runs; loaded from the store when None.
+            URLs stored by this run are added to it.
+        relevance: Index the new jobs are appended to and scored with, or None to skip
+        providers: Comma-separated provider names, as for --providers; None uses
+            $SCRAPER_PROVIDERS or the built-in providers
+
+    Returns:
+        Counts of inserted and already known jobs
+    """
+    if incremental and known is None:
+        known = KnownURLs(store.iter_job_urls())
+        print(f"Loaded {len(known)} known job URLs ({known.memory_bytes() / 2**20:.1f} MiB)")
+
+    # Initialize scraper with list of providers
+    scraper = Scraper(
+        registry.factories(registry.parse(providers), use_cache=use_cache),
+        max_workers=workers,
+        provider_timeout=provider_timeout,
+        total_timeout=total_timeout,
+        known=known if incremental else None,
+        watermarks=store.get_watermarks() if incremental else None
+    )
+
+    # Stream jobs from all providers straight into batched database writes
+    jobs = scraper.iter_jobs()
+    if echo:
+        jobs = echo_jobs(jobs)
+    result = store.insert_jobs(jobs, batch_size=batch_size)
+    if incremental:
+        # Only committed listings count as known, so those of a failed batch are fetched again next run.
+        for url in result.stored_urls:
+            known.add(url)
+
+    # Watermarks only advance for providers whose whole feed was read and stored.
+    if result.failed:
+        print(f"Failed to store {result.failed} jobs; keeping provider watermarks so the next run fetches them again")
+    else:
+        for name, timing in scraper.timings.items():
+            if timing["status"] == "ok" and timing["newest"]:
+                store.set_watermark(name, timing["newest"])
+
+    items = sum(timing["items"] for timing in scraper.timings.values())
+    skipped = sum(timing["skipped"] for timing in scraper.timings.values())
+    print(f"\nRead {items} feed items: {skipped} skipped as already stored, {items - skipped} parsed")
+    print(f"Stored {result.inserted} new jobs in database ({result.skipped - result.failed} already known)")
+    if result.duplicates:
+        print(f"{result.duplicates} of the new jobs repost an earlier listing and will reuse its analysis")
+    if relevance is not None:
+        # Jobs are already stored, so a failure here only delays their relevance scores to the next run.
+        try:
+            indexed, scored = relevance.update(store)
+            print(f"Indexed {indexed} jobs for relevance ranking, scored {scored} against the profile")
+        except Exception as e:
+            print(f"Failed to update relevance index: {str(e)}")
+    write_snapshot("scraper")
+    return result
+
 def main():
     parser = setup_argparse()
     args = parser.parse_args()
     
+    if args.list_providers:
+        registry.parse(args.providers)
+        for name, target in sorted(registry.available().items()):
+            print(f"{name}: {target}")
+        return 0
+    
     print("Starting Job Scraper...")
     print("-" * 50)
     
     try:
-        # Initialize scraper with list of providers
-        scraper = Scraper([RemoteOKScraper])
         store = SQLiteStore()
-        
-        # Fetch jobs from all providers
-        jobs = scraper.fetch_all_jobs()
-
-        print(f"\nFound {len(jobs)} total jobs:")
-        stored_count = 0
-        for job in jobs:
-            print(f"\nURL: {job.url}")
-            print(f"Published: {job.published_at}")
-            print(f"Content: {job.content[:200]}...")
-            
-            # Store job in database
-            if store.insert_job(job):
-                stored_count += 1
-
-        print(f"\nStored {stored_count} new jobs in database")
+        scrape(
+            store,
+            workers=args.workers,
+            provider_timeout=args.provider_timeout,
+            total_timeout=args.timeout,
+            batch_size=args.batch_size,
+            use_cache=not args.no_cache,
+            incremental=not args.full,
+            relevance=None if args.no_relevance else RelevanceIndex.for_database(store.db_path),
+            providers=args.providers
+        )
         return 0
         
     except KeyboardInterrupt:
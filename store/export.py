@@ -0,0 +1,94 @@
+import csv
+import io
+import json
+from typing import Iterable, Iterator
+
+# Columns written by every export format, in CSV header order.
+EXPORT_FIELDS = [
+    "id",
+    "title",
+    "url",
+    "location",
+    "salary_min",
+    "salary_max",
+    "published_at",
+    "salary_from",
+    "salary_to",
+    "is_remote_score",
+    "is_applicable_score",
+    "is_european_score",
+    "ai_score",
+    "relevance_score",
+    "source",
+    "analyzed_at",
+    "canonical_id",
+    # Increases in commit order; pass the last one back as after_id for incremental pulls.
+    "analysis_id",
+]
+
+MIMETYPES = {
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+    "csv": "text/csv",
+}
+
+def _chunked(lines: Iterable[str], rows_per_chunk: int) -> Iterator[str]:
+    """Join lines into larger strings so each write or HTTP chunk carries many rows."""
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= rows_per_chunk:
+            yield "".join(chunk)
+            chunk.clear()
+    if chunk:
+        yield "".join(chunk)
+
+def iter_ndjson(rows: Iterable[dict], rows_per_chunk: int = 500) -> Iterator[str]:
+    """One JSON object per line."""
+    return _chunked((json.dumps(row, ensure_ascii=False) + "\n" for row in rows), rows_per_chunk)
+
+def iter_json(rows: Iterable[dict], rows_per_chunk: int = 500) -> Iterator[str]:
+    """A single JSON array, written element by element."""
+    def lines():
+        yield "["
+        for index, row in enumerate(rows):
+            yield ("," if index else "") + "\n" + json.dumps(row, ensure_ascii=False)
+        yield "\n]\n"
+    return _chunked(lines(), rows_per_chunk)
+
+def iter_csv(rows: Iterable[dict], rows_per_chunk: int = 500) -> Iterator[str]:
+    """CSV with a header row of EXPORT_FIELDS."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+
+    def lines():
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    return _chunked(lines(), rows_per_chunk)
+
+WRITERS = {
+    "ndjson": iter_ndjson,
+    "json": iter_json,
+    "csv": iter_csv,
+}
+
+def export_rows(rows: Iterable[dict], format: str) -> Iterator[str]:
+    """
+    Serialise rows lazily in the given format.
+
+    Args:
+        rows: Row dicts, typically from SQLiteStore.iter_analyzed_listings
+        format: One of "ndjson", "json" or "csv"
+
+    Returns:
+        Iterator of text chunks, each holding many rows
+    """
+    if format not in WRITERS:
+        raise ValueError(f"Unsupported export format {format!r}, expected one of {', '.join(WRITERS)}")
+    return WRITERS[format](rows)
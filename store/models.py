@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Literal
+from pydantic import BaseModel, Field
+
+@dataclass(slots=True)
+class JobRecord:
+    """
+    A job listing as read back from the database.
+
+    Listings are validated as JobListing when a provider hands them over, so
+    rows coming back out are trusted and mapped without pydantic. It has the
+    same attributes the analyzer reads from a JobListing.
+    """
+    id: int
+    url: str
+    content: str
+    checksum: str
+    published_at: datetime
+    created_at: datetime
+    salary_min: float | None = None
+    salary_max: float | None = None
+    location: str | None = None
+    title: str | None = None
+    canonical_id: int | None = None
+
+class IngestResult(BaseModel):
+    inserted: int = 0
+    skipped: int = 0
+    # New listings linked to an earlier listing they repost.
+    duplicates: int = 0
+    ids: list[int] = []
+    # Listings in batches whose write failed; they are counted in skipped too.
+    failed: int = 0
+    # URL of every listing in a committed batch, inserted or already stored.
+    stored_urls: list[str] = []
+
+# Sortable columns of the job list, each backed by an index on analyzed_jobs.
+SORT_COLUMNS = ("ai_score", "analyzed_at", "is_remote_score", "is_applicable_score", "is_european_score", "relevance_score")
+
+class JobQuery(BaseModel):
+    """Filters, sort order and keyset position for one page of analyzed jobs."""
+    sort: Literal["ai_score", "analyzed_at", "is_remote_score", "is_applicable_score", "is_european_score", "relevance_score"] = "ai_score"
+    direction: Literal["asc", "desc"] = "desc"
+    min_ai_score: float | None = Field(None, ge=0, le=1)
+    min_remote_score: float | None = Field(None, ge=0, le=1)
+    min_applicable_score: float | None = Field(None, ge=0, le=1)
+    min_european_score: float | None = Field(None, ge=0, le=1)
+    min_salary: float | None = Field(None, ge=0)
+    max_salary: float | None = Field(None, ge=0)
+    # "collapse" hides reposts whose original is analyzed; the original shows how many it has.
+    duplicates: Literal["collapse", "show"] = "collapse"
+    # Sort value and analyzed_jobs.id of the last row on the previous page.
+    after: tuple[float | str | None, int] | None = None
+    limit: int = Field(50, ge=1, le=500)
+
+class JobPage(BaseModel):
+    rows: list[dict]
+    next_after: tuple[float | str | None, int] | None = None
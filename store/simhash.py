@@ -0,0 +1,118 @@
+"""
+SimHash fingerprints of job listings for finding reposts of the same role.
+
+A fingerprint is 64 bits. Listings whose fingerprints differ in only a few
+bits share nearly all of their word sequences. Numbers, URLs and month and
+weekday names are dropped before fingerprinting, so a changed date line,
+salary or tracking parameter doesn't move a repost away from the original.
+"""
+import html
+import re
+import string
+import struct
+from hashlib import blake2b
+from operator import xor
+
+BITS = 64
+# Four 16-bit bands: by pigeonhole, fingerprints within distance 3 agree on at least one band.
+BANDS = 4
+BAND_BITS = BITS // BANDS
+MAX_DISTANCE = 3
+SHINGLE_SIZE = 3
+# Below this many shingles there is too little text to tell a repost from a similar role.
+MIN_SHINGLES = 8
+
+_MASK = (1 << BITS) - 1
+_MIX = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F)
+_TAG = re.compile(r"<[^>]*>")
+_URL = re.compile(r"(?:https?://|www\.)\S+")
+_DATE_WORDS = frozenset(
+    "january february march april may june july august september october november december "
+    "jan feb mar apr jun jul aug sep sept oct nov dec "
+    "monday tuesday wednesday thursday friday saturday sunday mon tue wed thu fri sat sun "
+    "today yesterday ago".split()
+)
+# Punctuation becomes a word break; splitting on whitespace is several times faster than a word regex.
+_PUNCTUATION = str.maketrans({char: " " for char in string.punctuation + "‘’“”–—…•·"})
+
+class _WordHashes(dict):
+    """
+    Stable 64-bit hashes per distinct word, one per position in a shingle.
+
+    Position 1 and 2 hashes are the word's hash multiplied by odd constants,
+    so XOR-ing the three gives an order-sensitive shingle hash without any
+    arithmetic per shingle. Tokens that aren't words, such as numbers, ids and
+    dates, map to None, which makes the lookup double as the word filter.
+    """
+    def __missing__(self, word: str) -> tuple[int, int, int] | None:
+        if len(self) >= 200_000:
+            self.clear()
+        if not word.isalpha() or word in _DATE_WORDS:
+            hashes = None
+        else:
+            value = int.from_bytes(blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+            hashes = (value, (value * _MIX[0]) & _MASK, (value * _MIX[1]) & _MASK)
+        self[word] = hashes
+        return hashes
+
+_word_hashes = _WordHashes()
+
+def _tokens(title: str | None, content: str) -> list[str]:
+    text = f"{title or ''} {html.unescape(_TAG.sub(' ', content or ''))}".lower()
+    if "http" in text or "www." in text:
+        text = _URL.sub(" ", text)
+    return text.translate(_PUNCTUATION).split()
+
+def words(title: str | None, content: str) -> list[str]:
+    """Lowercased words of the title and the description with markup, URLs, numbers and dates removed."""
+    # Tokens with digits are ids, dates, amounts or tracking codes; none of them identify a role.
+    return [word for word in _tokens(title, content) if word.isalpha() and word not in _DATE_WORDS]
+
+def simhash(title: str | None, content: str) -> int | None:
+    """
+    Fingerprint a listing from the distinct word 3-grams of its title and description.
+
+    Returns:
+        64-bit fingerprint as an unsigned int, or None when the listing has too
+        little text for a match to mean anything
+    """
+    hashes = [value for value in map(_word_hashes.__getitem__, _tokens(title, content)) if value is not None]
+    if len(hashes) < SHINGLE_SIZE:
+        return None
+    first, second, third = zip(*hashes)
+    # Each distinct shingle votes once, so a phrase repeated throughout one
+    # listing doesn't outweigh the rest of its text.
+    shingles = set(map(xor, map(xor, first, second[1:]), third[2:]))
+    count = len(shingles)
+    if count < MIN_SHINGLES:
+        return None
+
+    # Bit i of the fingerprint is set when more than half of the shingles have
+    # it set. Each byte column of the shingle hashes is read as one big integer,
+    # so counting a bit across every shingle is a single mask and popcount.
+    raw = struct.pack(f"<{count}Q", *shingles)
+    ones = int.from_bytes(b"\x01" * count, "little")
+    masks = [ones << bit for bit in range(8)]
+    fingerprint = 0
+    for byte in range(BITS // 8):
+        column = int.from_bytes(raw[byte::8], "little")
+        for bit, mask in enumerate(masks):
+            if 2 * (column & mask).bit_count() > count:
+                fingerprint |= 1 << (8 * byte + bit)
+    return fingerprint
+
+def bands(fingerprint: int) -> tuple[int, ...]:
+    """Split a fingerprint into the BANDS values it is looked up by."""
+    mask = (1 << BAND_BITS) - 1
+    return tuple((fingerprint >> (BAND_BITS * band)) & mask for band in range(BANDS))
+
+def distance(a: int, b: int) -> int:
+    """Number of bits two fingerprints differ in."""
+    return ((a ^ b) & _MASK).bit_count()
+
+def to_sql(fingerprint: int) -> int:
+    """Fingerprint as a signed 64-bit value, the range SQLite INTEGER holds."""
+    return fingerprint - (1 << BITS) if fingerprint >> (BITS - 1) else fingerprint
+
+def from_sql(value: int) -> int:
+    return value & _MASK
@@ -1,68 +1,579 @@
+import random
+import re
 import sqlite3
 import threading
+import time
+from collections import deque
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, UTC
 from scrape.providers.models import JobListing
 from analyze.models import AnalyzedJob
-from typing import List, Optional
+from store.models import IngestResult, JobPage, JobQuery, JobRecord, SORT_COLUMNS
+from store import simhash
+from telemetry.metrics import counter, histogram
+from typing import Callable, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+WRITE_SECONDS = histogram("sqlite_write_seconds", "Duration of write transactions, including waits for the lock", ("operation",))
+BUSY_RETRIES = counter("sqlite_busy_retries_total", "Write transactions retried because the database was locked")
+JOBS_INSERTED = counter("store_jobs_inserted_total", "New job listings stored")
+ANALYSES_SAVED = counter("store_analyses_saved_total", "Analyses stored")
+NEAR_DUPLICATES = counter("store_near_duplicates_total", "Listings linked to an earlier listing they repost")
+
+def _add_column_if_missing(cursor: sqlite3.Cursor, table: str, column: str, definition: str):
+    columns = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+    if column not in columns:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+def _migration_base_schema(cursor: sqlite3.Cursor):
+    """Tables from before versioned migrations. IF NOT EXISTS keeps older databases intact."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS job_listings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT NOT NULL UNIQUE,
+            content TEXT NOT NULL,
+            checksum TEXT NOT NULL,
+            published_at TIMESTAMP NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            salary_min REAL,
+            salary_max REAL,
+            location TEXT,
+            title TEXT,
+            UNIQUE(checksum)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS analyzed_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_listing_id INTEGER NOT NULL,
+            url TEXT NOT NULL,
+            salary_from TEXT,
+            salary_to TEXT, 
+            is_remote_score REAL NOT NULL DEFAULT 0.0,
+            is_applicable_score REAL NOT NULL DEFAULT 0.0,
+            is_european_score REAL NOT NULL DEFAULT 0.0,
+            analyzed_at TIMESTAMP NOT NULL,
+            source TEXT NOT NULL DEFAULT 'llm',
+            FOREIGN KEY (job_listing_id) REFERENCES job_listings(id),
+            UNIQUE(job_listing_id)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS analysis_cache (
+            cache_key TEXT PRIMARY KEY,
+            prompt_version TEXT NOT NULL,
+            salary_from TEXT,
+            salary_to TEXT,
+            is_remote_score REAL NOT NULL DEFAULT 0.0,
+            is_applicable_score REAL NOT NULL DEFAULT 0.0,
+            is_european_score REAL NOT NULL DEFAULT 0.0,
+            tokens_used INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS analysis_queue (
+            job_listing_id INTEGER PRIMARY KEY,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            available_at REAL NOT NULL,
+            lease_owner TEXT,
+            lease_expires_at REAL,
+            last_error TEXT,
+            FOREIGN KEY (job_listing_id) REFERENCES job_listings(id)
+        )
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_analysis_queue_status
+        ON analysis_queue (status, available_at)
+    """)
+    _add_column_if_missing(cursor, "analyzed_jobs", "source", "TEXT NOT NULL DEFAULT 'llm'")
+
+def _migration_hot_query_indexes(cursor: sqlite3.Cursor):
+    """Stored analysis status and AI score, plus indexes for the analyzer and list page queries."""
+    cursor.execute("ALTER TABLE job_listings ADD COLUMN analysis_status TEXT NOT NULL DEFAULT 'pending'")
+    cursor.execute("""
+        UPDATE job_listings SET analysis_status = 'analyzed'
+        WHERE id IN (SELECT job_listing_id FROM analyzed_jobs)
+    """)
+    # Partial index: only pending rows are indexed, so it stays tiny however large the table grows.
+    cursor.execute("""
+        CREATE INDEX idx_job_listings_pending
+        ON job_listings (id) WHERE analysis_status = 'pending'
+    """)
+    cursor.execute("CREATE INDEX idx_job_listings_published_at ON job_listings (published_at)")
+
+    cursor.execute("ALTER TABLE analyzed_jobs ADD COLUMN ai_score REAL NOT NULL DEFAULT 0.0")
+    cursor.execute("""
+        UPDATE analyzed_jobs
+        SET ai_score = (is_remote_score + is_applicable_score + is_european_score) / 3.0
+    """)
+    cursor.execute("CREATE INDEX idx_analyzed_jobs_analyzed_at ON analyzed_jobs (analyzed_at)")
+    cursor.execute("CREATE INDEX idx_analyzed_jobs_ai_score ON analyzed_jobs (ai_score)")
+
+def _migration_list_sort_indexes(cursor: sqlite3.Cursor):
+    """Indexes for sorting the job list by each score; the implicit rowid doubles as the keyset tie-breaker."""
+    cursor.execute("CREATE INDEX idx_analyzed_jobs_is_remote_score ON analyzed_jobs (is_remote_score)")
+    cursor.execute("CREATE INDEX idx_analyzed_jobs_is_applicable_score ON analyzed_jobs (is_applicable_score)")
+    cursor.execute("CREATE INDEX idx_analyzed_jobs_is_european_score ON analyzed_jobs (is_european_score)")
+
+def _migration_full_text_search(cursor: sqlite3.Cursor):
+    """
+    FTS5 index over listing titles and descriptions, kept in sync by triggers.
+
+    The index reads text from job_listings (external content) rather than
+    storing a second copy. Listings that existed before this migration are
+    indexed by `python db.py rebuild-fts`, so upgrading a large database
+    doesn't hold the write lock while every description is tokenized.
+    """
+    cursor.execute("""
+        CREATE VIRTUAL TABLE job_listings_fts USING fts5(
+            title,
+            content,
+            content='job_listings',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER job_listings_fts_insert AFTER INSERT ON job_listings BEGIN
+            INSERT INTO job_listings_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER job_listings_fts_delete AFTER DELETE ON job_listings BEGIN
+            INSERT INTO job_listings_fts (job_listings_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER job_listings_fts_update AFTER UPDATE OF title, content ON job_listings BEGIN
+            INSERT INTO job_listings_fts (job_listings_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+            INSERT INTO job_listings_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+        END
+    """)
+
+def _migration_provider_watermarks(cursor: sqlite3.Cursor):
+    """Newest published_at stored from each provider, so later runs can skip older feed items."""
+    cursor.execute("""
+        CREATE TABLE provider_watermarks (
+            provider TEXT PRIMARY KEY,
+            published_at TIMESTAMP NOT NULL,
+            updated_at TIMESTAMP NOT NULL
+        )
+    """)
+
+def _migration_near_duplicates(cursor: sqlite3.Cursor):
+    """
+    SimHash fingerprints for finding reposts, and a link from each repost to its original.
+
+    Each fingerprint is stored with its four bands, each indexed, so candidates
+    are found with index lookups rather than by scanning every fingerprint.
+    Listings that existed before this migration are fingerprinted by
+    `python db.py index-duplicates`.
+    """
+    cursor.execute("ALTER TABLE job_listings ADD COLUMN canonical_id INTEGER REFERENCES job_listings(id)")
+    cursor.execute("CREATE INDEX idx_job_listings_canonical_id ON job_listings (canonical_id) WHERE canonical_id IS NOT NULL")
+    # fingerprint and bands are NULL for listings with too little text to fingerprint.
+    cursor.execute("""
+        CREATE TABLE job_fingerprints (
+            job_listing_id INTEGER PRIMARY KEY REFERENCES job_listings(id),
+            fingerprint INTEGER,
+            band0 INTEGER,
+            band1 INTEGER,
+            band2 INTEGER,
+            band3 INTEGER
+        )
+    """)
+    for band in range(simhash.BANDS):
+        cursor.execute(f"""
+            CREATE INDEX idx_job_fingerprints_band{band}
+            ON job_fingerprints (band{band}, fingerprint) WHERE band{band} IS NOT NULL
+        """)
+
+def _migration_relevance(cursor: sqlite3.Cursor):
+    """
+    Profile relevance scores from analyze/relevance.py.
+
+    Scores are kept on listings, where they are written as soon as a listing is
+    indexed, and copied to analyzed_jobs so the list can sort by them through
+    an index like the other scores. relevance_profile records which profile and
+    corpus size the scores come from, and a version that changes with them.
+    """
+    cursor.execute("ALTER TABLE job_listings ADD COLUMN relevance_score REAL")
+    cursor.execute("CREATE INDEX idx_job_listings_unscored ON job_listings (id) WHERE relevance_score IS NULL")
+    cursor.execute("ALTER TABLE analyzed_jobs ADD COLUMN relevance_score REAL NOT NULL DEFAULT 0.0")
+    cursor.execute("CREATE INDEX idx_analyzed_jobs_relevance_score ON analyzed_jobs (relevance_score)")
+    cursor.execute("""
+        CREATE TABLE relevance_profile (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            fingerprint TEXT NOT NULL,
+            listings INTEGER NOT NULL,
+            version INTEGER NOT NULL,
+            updated_at TIMESTAMP NOT NULL
+        )
+    """)
+
+def _migration_duplicate_links_version(cursor: sqlite3.Cursor):
+    """
+    Change marker for near-duplicate links.
+
+    Linking a repost changes which rows the collapsed job list hides and
+    their repost counts without inserting an analysis, so the list's change
+    token also reads this version, which every transaction that links
+    listings bumps.
+    """
+    cursor.execute("""
+        CREATE TABLE duplicate_links_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL,
+            updated_at TIMESTAMP NOT NULL
+        )
+    """)
+
+def _migration_unknown_scores(cursor: sqlite3.Cursor):
+    """
+    Allow NULL for scores an analysis doesn't know.
+
+    Pre-filter rules only prove some scores, such as a US-only location
+    proving the job can't be done from Europe; the others are stored as NULL
+    rather than as zeros that look like analysis results. SQLite can't drop
+    NOT NULL from a column, so the table is rebuilt with its ids kept.
+    """
+    cursor.execute("""
+        CREATE TABLE analyzed_jobs_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_listing_id INTEGER NOT NULL,
+            url TEXT NOT NULL,
+            salary_from TEXT,
+            salary_to TEXT,
+            is_remote_score REAL,
+            is_applicable_score REAL,
+            is_european_score REAL,
+            analyzed_at TIMESTAMP NOT NULL,
+            source TEXT NOT NULL DEFAULT 'llm',
+            ai_score REAL NOT NULL DEFAULT 0.0,
+            relevance_score REAL NOT NULL DEFAULT 0.0,
+            FOREIGN KEY (job_listing_id) REFERENCES job_listings(id),
+            UNIQUE(job_listing_id)
+        )
+    """)
+    columns = "id, job_listing_id, url, salary_from, salary_to, is_remote_score, is_applicable_score, is_european_score, analyzed_at, source, ai_score, relevance_score"
+    cursor.execute(f"INSERT INTO analyzed_jobs_new ({columns}) SELECT {columns} FROM analyzed_jobs")
+    cursor.execute("DROP TABLE analyzed_jobs")
+    cursor.execute("ALTER TABLE analyzed_jobs_new RENAME TO analyzed_jobs")
+    for column in ("analyzed_at", "ai_score", "is_remote_score", "is_applicable_score", "is_european_score", "relevance_score"):
+        cursor.execute(f"CREATE INDEX idx_analyzed_jobs_{column} ON analyzed_jobs ({column})")
+
+def _migration_dead_listings(cursor: sqlite3.Cursor):
+    """Take listings whose queue item was dead-lettered out of the pending state."""
+    cursor.execute("""
+        UPDATE job_listings SET analysis_status = 'dead'
+        WHERE analysis_status = 'pending'
+          AND id IN (SELECT job_listing_id FROM analysis_queue WHERE status = 'dead')
+    """)
+
+def _migration_repost_checksums(cursor: sqlite3.Cursor):
+    """
+    Let listings share a checksum, with the URL as each listing's identity.
+
+    The same description reposted under a new URL used to be dropped by
+    UNIQUE(checksum), so it never reached the analyzer's checksum-keyed
+    cache. Reposts are now stored, linked to their original and resolved from
+    the cache. SQLite can't drop a table constraint, so the table is rebuilt
+    with its ids kept, and its indexes, triggers and AUTOINCREMENT sequence
+    are restored as they were.
+    """
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(job_listings)")]
+    dependents = [row[0] for row in cursor.execute("""
+        SELECT sql FROM sqlite_master
+        WHERE tbl_name = 'job_listings' AND type IN ('index', 'trigger') AND sql IS NOT NULL
+    """)]
+    sequence = cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'job_listings'").fetchone()
+    cursor.execute("""
+        CREATE TABLE job_listings_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT NOT NULL UNIQUE,
+            content TEXT NOT NULL,
+            checksum TEXT NOT NULL,
+            published_at TIMESTAMP NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            salary_min REAL,
+            salary_max REAL,
+            location TEXT,
+            title TEXT,
+            analysis_status TEXT NOT NULL DEFAULT 'pending',
+            canonical_id INTEGER REFERENCES job_listings(id),
+            relevance_score REAL
+        )
+    """)
+    column_list = ", ".join(columns)
+    cursor.execute(f"INSERT INTO job_listings_new ({column_list}) SELECT {column_list} FROM job_listings")
+    cursor.execute("DROP TABLE job_listings")
+    cursor.execute("ALTER TABLE job_listings_new RENAME TO job_listings")
+    for sql in dependents:
+        cursor.execute(sql)
+    cursor.execute("CREATE INDEX idx_job_listings_checksum ON job_listings (checksum)")
+    if sequence is not None:
+        cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'job_listings'", (sequence[0],))
+
+def _migration_unknown_relevance(cursor: sqlite3.Cursor):
+    """
+    Allow NULL for the relevance score of analyses whose listing isn't scored.
+
+    Analyses saved before their listing was scored, or with relevance scoring
+    off, stored 0.0, which the list showed and sorted as a real score. The
+    table is rebuilt like in _migration_unknown_scores, taking each analysis's
+    relevance score from its listing, where NULL means not scored yet.
+    """
+    dependents = [row[0] for row in cursor.execute("""
+        SELECT sql FROM sqlite_master
+        WHERE tbl_name = 'analyzed_jobs' AND type IN ('index', 'trigger') AND sql IS NOT NULL
+    """)]
+    sequence = cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'analyzed_jobs'").fetchone()
+    cursor.execute("""
+        CREATE TABLE analyzed_jobs_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_listing_id INTEGER NOT NULL,
+            url TEXT NOT NULL,
+            salary_from TEXT,
+            salary_to TEXT,
+            is_remote_score REAL,
+            is_applicable_score REAL,
+            is_european_score REAL,
+            analyzed_at TIMESTAMP NOT NULL,
+            source TEXT NOT NULL DEFAULT 'llm',
+            ai_score REAL NOT NULL DEFAULT 0.0,
+            relevance_score REAL,
+            FOREIGN KEY (job_listing_id) REFERENCES job_listings(id),
+            UNIQUE(job_listing_id)
+        )
+    """)
+    columns = "id, job_listing_id, url, salary_from, salary_to, is_remote_score, is_applicable_score, is_european_score, analyzed_at, source, ai_score"
+    cursor.execute(f"""
+        INSERT INTO analyzed_jobs_new ({columns}, relevance_score)
+        SELECT {columns}, (SELECT jl.relevance_score FROM job_listings jl WHERE jl.id = analyzed_jobs.job_listing_id)
+        FROM analyzed_jobs
+    """)
+    cursor.execute("DROP TABLE analyzed_jobs")
+    cursor.execute("ALTER TABLE analyzed_jobs_new RENAME TO analyzed_jobs")
+    for sql in dependents:
+        cursor.execute(sql)
+    if sequence is not None:
+        cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'analyzed_jobs'", (sequence[0],))
+
+_SEARCH_TERM = re.compile(r'"([^"]*)"|(\S+)')
+
+def fts_query(text: str) -> str:
+    """
+    Turn free text from a search box into a safe FTS5 MATCH expression.
+
+    Every word is quoted so FTS5 operators and punctuation in user input
+    (C++, node.js, AND, NEAR, column filters) are matched literally. Quoted
+    phrases are kept as phrases and a trailing * makes a word a prefix search.
+    All terms must match.
+    """
+    terms = []
+    for phrase, word in _SEARCH_TERM.findall(text or ""):
+        term = phrase if phrase else word
+        prefix = not phrase and term.endswith("*")
+        term = term.rstrip("*").replace('"', '""').strip()
+        if term:
+            terms.append(f'"{term}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+def _is_busy(error: sqlite3.OperationalError) -> bool:
+    code = getattr(error, "sqlite_errorcode", None)
+    if code is not None:
+        # Extended codes such as SQLITE_BUSY_SNAPSHOT keep the primary code in the low byte.
+        return code & 0xFF in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+# analyzed_jobs scores that are NULL when unknown.
+NULLABLE_SCORES = ("is_remote_score", "is_applicable_score", "is_european_score", "relevance_score")
+
+# job_listings columns in JobRecord field order, as _row_to_job unpacks them.
+JOB_COLUMNS = ["id", "url", "content", "checksum", "published_at", "created_at", "salary_min", "salary_max", "location", "title", "canonical_id"]
+
+# Applied in order; a database's PRAGMA user_version records how many have run.
+# Append new migrations to the end and never edit one that has shipped.
+MIGRATIONS = [
+    _migration_base_schema,
+    _migration_hot_query_indexes,
+    _migration_list_sort_indexes,
+    _migration_full_text_search,
+    _migration_provider_watermarks,
+    _migration_near_duplicates,
+    _migration_relevance,
+    _migration_duplicate_links_version,
+    _migration_unknown_scores,
+    _migration_dead_listings,
+    _migration_repost_checksums,
+    _migration_unknown_relevance,
+]
 
 class SQLiteStore:
-    def __init__(self, db_path: str | Path = "data/jobs.db"):
-        # Ensure data directory exists
+    def __init__(
+        self,
+        db_path: str | Path = "data/jobs.db",
+        busy_timeout: float = 30.0,
+        write_retries: int = 5,
+        checkpoint_every: int = 200,
+        read_only: bool = False,
+        cached_statements: int = 128,
+        cache_size_kb: int | None = None,
+        detect_duplicates: bool = True
+    ):
+        """
+        Args:
+            db_path: SQLite database file, created along with its directory if missing
+            busy_timeout: Seconds a statement waits for another process's lock before failing
+            write_retries: Extra attempts for a write transaction that still hits SQLITE_BUSY
+            checkpoint_every: Write transactions between passive WAL checkpoints, 0 to leave it to SQLite
+            read_only: Open an existing database with mode=ro and skip schema setup, for readers such as the web UI
+            cached_statements: Prepared statements kept per connection for reuse by identical queries
+            cache_size_kb: Page cache per connection in KiB, or None for SQLite's default
+            detect_duplicates: Fingerprint new listings and link near-duplicates to the listing they repost
+        """
         db_path = Path(db_path)
-        db_path.parent.mkdir(parents=True, exist_ok=True)
+        if not read_only:
+            # Ensure data directory exists
+            db_path.parent.mkdir(parents=True, exist_ok=True)
         
         self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self.write_retries = write_retries
+        self.checkpoint_every = checkpoint_every
+        self.read_only = read_only
+        self.cached_statements = cached_statements
+        self.cache_size_kb = cache_size_kb
+        self.detect_duplicates = detect_duplicates
+        self._writes = 0
+        self._writes_lock = threading.Lock()
         self._local = threading.local()
-        self._init_db()
+        self._idle: deque[sqlite3.Connection] = deque()
+        if not read_only:
+            self._init_db()
     
+    def _connect(self) -> sqlite3.Connection:
+        if self.read_only:
+            # Read-only connections are handed between threads by release_connection.
+            conn = sqlite3.connect(
+                f"{self.db_path.resolve().as_uri()}?mode=ro",
+                uri=True,
+                timeout=self.busy_timeout,
+                cached_statements=self.cached_statements,
+                check_same_thread=False
+            )
+        else:
+            conn = sqlite3.connect(str(self.db_path), timeout=self.busy_timeout, cached_statements=self.cached_statements)
+            # Safe in WAL mode: a power loss can only drop the last commits, never corrupt the file.
+            conn.execute("PRAGMA synchronous = NORMAL")
+        conn.row_factory = sqlite3.Row
+        if self.cache_size_kb:
+            # Negative values are KiB rather than pages.
+            conn.execute(f"PRAGMA cache_size = -{int(self.cache_size_kb)}")
+        return conn
+
     def _get_connection(self) -> sqlite3.Connection:
         if not hasattr(self._local, 'conn'):
-            self._local.conn = sqlite3.connect(str(self.db_path))
-            self._local.conn.row_factory = sqlite3.Row
+            try:
+                self._local.conn = self._idle.pop()
+            except IndexError:
+                self._local.conn = self._connect()
         return self._local.conn
+
+    def release_connection(self):
+        """
+        Return this thread's read-only connection to the idle pool.
+
+        Web servers that start a thread per request call this when a request
+        ends, so the next request reuses the open connection along with its
+        page cache and prepared statements instead of connecting again.
+        """
+        conn = self._local.__dict__.pop('conn', None)
+        if conn is None:
+            return
+        if self.read_only and not conn.in_transaction:
+            self._idle.append(conn)
+        else:
+            conn.close()
     
     def _init_db(self):
         conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS job_listings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                url TEXT NOT NULL UNIQUE,
-                content TEXT NOT NULL,
-                checksum TEXT NOT NULL,
-                published_at TIMESTAMP NOT NULL,
-                created_at TIMESTAMP NOT NULL,
-                salary_min REAL,
-                salary_max REAL,
-                location TEXT,
-                title TEXT,
-                UNIQUE(checksum)
-            )
-        """)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS analyzed_jobs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                job_listing_id INTEGER NOT NULL,
-                url TEXT NOT NULL,
-                salary_from TEXT,
-                salary_to TEXT, 
-                is_remote_score REAL NOT NULL DEFAULT 0.0,
-                is_applicable_score REAL NOT NULL DEFAULT 0.0,
-                is_european_score REAL NOT NULL DEFAULT 0.0,
-                analyzed_at TIMESTAMP NOT NULL,
-                FOREIGN KEY (job_listing_id) REFERENCES job_listings(id),
-                UNIQUE(job_listing_id)
-            )
-        """)
-        conn.commit()
-    
+        # WAL lets the web UI and analyzer keep reading while the scraper writes.
+        # The mode is stored in the database file, so this only does work once.
+        self._retry_on_busy(lambda: conn.execute("PRAGMA journal_mode = WAL").fetchone())
+        self._migrate(conn)
+
+    def _migrate(self, conn: sqlite3.Connection):
+        """Apply any migrations newer than the database's user_version, one transaction each."""
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= len(MIGRATIONS):
+            return
+
+        for version, migration in enumerate(MIGRATIONS, start=1):
+            def apply(cursor: sqlite3.Cursor):
+                # Re-read inside the write lock in case another process just migrated.
+                if cursor.execute("PRAGMA user_version").fetchone()[0] >= version:
+                    return
+                migration(cursor)
+                cursor.execute(f"PRAGMA user_version = {version}")
+            self._write(apply)
+
+    def _retry_on_busy(self, operation: Callable[[], T]) -> T:
+        """Run operation, retrying with jittered exponential backoff while the database is busy."""
+        for attempt in range(self.write_retries + 1):
+            try:
+                return operation()
+            except sqlite3.OperationalError as e:
+                if not _is_busy(e) or attempt == self.write_retries:
+                    raise
+                BUSY_RETRIES.inc()
+                time.sleep(min(2.0, 0.05 * 2 ** attempt) * (0.5 + random.random()))
+
+    def _write(self, operation: Callable[[sqlite3.Cursor], T]) -> T:
+        """
+        Run operation(cursor) in a single write transaction and commit it.
+
+        BEGIN IMMEDIATE takes the write lock up front, so the busy timeout covers
+        the wait instead of failing midway when a read would have to upgrade.
+        The whole transaction is retried if the lock still can't be had.
+        """
+        conn = self._get_connection()
+
+        def transaction() -> T:
+            with conn:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                return operation(cursor)
+
+        # Label by the method that asked for the write, e.g. insert_jobs.<locals>.insert -> insert_jobs
+        operation_name = operation.__qualname__.split(".<locals>")[0].rsplit(".", 1)[-1]
+        with WRITE_SECONDS.labels(operation_name).time():
+            result = self._retry_on_busy(transaction)
+        self._after_write(conn)
+        return result
+
+    def _after_write(self, conn: sqlite3.Connection):
+        if not self.checkpoint_every:
+            return
+        with self._writes_lock:
+            self._writes += 1
+            due = self._writes % self.checkpoint_every == 0
+        if due:
+            # PASSIVE never blocks readers or writers; it copies what it can and
+            # keeps the WAL from growing without bound under constant reads.
+            try:
+                conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+            except sqlite3.OperationalError:
+                pass
+
     def insert_job(self, job: JobListing) -> bool:
         """Insert a job listing into the database. Returns True if inserted, False if already exists."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        try:
+        fingerprint = simhash.simhash(job.title, job.content) if self.detect_duplicates else False
+
+        def insert(cursor: sqlite3.Cursor) -> bool:
             cursor.execute("""
                 INSERT OR IGNORE INTO job_listings 
                 (url, content, checksum, published_at, created_at, salary_min, salary_max, location, title)
@@ -78,91 +589,283 @@ class SQLiteStore:
                 job.location,
                 job.title
             ))
-            conn.commit()
-            return cursor.rowcount > 0
-        except sqlite3.Error:
+            inserted = cursor.rowcount > 0
+            if inserted:
+                self._enqueue(cursor, [cursor.lastrowid])
+                if fingerprint is not False:
+                    self._link_near_duplicates(cursor, [(cursor.lastrowid, fingerprint)])
+            return inserted
+
+        try:
+            inserted = self._write(insert)
+        except sqlite3.Error as e:
+            print(f"Failed to insert job {job.url}: {e}")
             return False
+        if inserted:
+            JOBS_INSERTED.inc()
+        return inserted
+
+    def insert_jobs(self, jobs: Iterable[JobListing], batch_size: int = 500) -> IngestResult:
+        """
+        Insert many job listings, committing once per batch instead of once per row.
+
+        Args:
+            jobs: Job listings to insert, consumed lazily
+            batch_size: Number of listings written per transaction
+
+        Returns:
+            IngestResult with inserted/skipped counts, the ids of the new rows and
+            the URLs of every committed listing
+        """
+        result = IngestResult()
+        batch = []
+        for job in jobs:
+            batch.append(job)
+            if len(batch) >= batch_size:
+                self._insert_batch(batch, result)
+                batch = []
+        if batch:
+            self._insert_batch(batch, result)
+        return result
+
+    def _insert_batch(self, batch: list[JobListing], result: IngestResult):
+        rows = [
+            (
+                str(job.url),
+                job.content,
+                job.checksum,
+                job.published_at,
+                job.created_at,
+                job.salary_min,
+                job.salary_max,
+                job.location,
+                job.title
+            )
+            for job in batch
+        ]
+        # Fingerprinting is the slow part, so it happens before taking the write lock.
+        fingerprints = {
+            row[0]: simhash.simhash(job.title, job.content) for row, job in zip(rows, batch)
+        } if self.detect_duplicates else None
+
+        def insert(cursor: sqlite3.Cursor) -> tuple[int, list[int], int]:
+            # The write lock is held from the start of the transaction, so no other
+            # writer can slip rows in between reading MAX(id) and our insert.
+            # AUTOINCREMENT ids only grow, so every row above that maximum is ours.
+            last_id = cursor.execute("SELECT COALESCE(MAX(id), 0) FROM job_listings").fetchone()[0]
+            cursor.executemany("""
+                INSERT OR IGNORE INTO job_listings 
+                (url, content, checksum, published_at, created_at, salary_min, salary_max, location, title)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            inserted = cursor.rowcount
+            new_rows = cursor.execute(
+                "SELECT id, url FROM job_listings WHERE id > ? ORDER BY id", (last_id,)
+            ).fetchall()
+            new_ids = [row[0] for row in new_rows]
+            self._enqueue(cursor, new_ids)
+            linked = 0
+            if fingerprints is not None:
+                linked = self._link_near_duplicates(cursor, [(row[0], fingerprints.get(row[1])) for row in new_rows])
+            return inserted, new_ids, linked
+
+        try:
+            inserted, new_ids, linked = self._write(insert)
+        except sqlite3.Error as e:
+            print(f"Failed to insert batch of {len(batch)} jobs: {e}")
+            result.skipped += len(batch)
+            result.failed += len(batch)
+            return
+
+        JOBS_INSERTED.inc(inserted)
+        NEAR_DUPLICATES.inc(linked)
+        result.inserted += inserted
+        result.skipped += len(batch) - inserted
+        result.duplicates += linked
+        result.ids.extend(new_ids)
+        result.stored_urls.extend(row[0] for row in rows)
+
+    def _link_near_duplicates(self, cursor: sqlite3.Cursor, fingerprints: list[tuple[int, int | None]]) -> int:
+        """
+        Store fingerprints of new listings and link each near-duplicate to its original.
+
+        Candidates come from the band indexes; the closest one within
+        simhash.MAX_DISTANCE bits wins, the oldest on a tie. Links always point
+        at the first listing of a chain, so reposts of reposts share one
+        canonical_id. Listings are handled in order, so a repost can match an
+        original stored earlier in the same batch.
+
+        Args:
+            cursor: Cursor inside the caller's write transaction
+            fingerprints: (listing id, fingerprint or None) pairs in id order
+
+        Returns:
+            Number of listings linked to an original
+        """
+        linked = 0
+        for job_id, fingerprint in fingerprints:
+            if fingerprint is None:
+                cursor.execute("INSERT OR REPLACE INTO job_fingerprints (job_listing_id) VALUES (?)", (job_id,))
+                continue
+            match = self._closest_fingerprint(cursor, fingerprint)
+            if match is not None:
+                cursor.execute("""
+                    UPDATE job_listings
+                    SET canonical_id = (SELECT COALESCE(canonical_id, id) FROM job_listings WHERE id = ?)
+                    WHERE id = ?
+                """, (match, job_id))
+                linked += 1
+            cursor.execute(
+                "INSERT OR REPLACE INTO job_fingerprints (job_listing_id, fingerprint, band0, band1, band2, band3) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, simhash.to_sql(fingerprint), *simhash.bands(fingerprint))
+            )
+        if linked:
+            # In the same transaction as the links, so the list's change token moves exactly when they land.
+            cursor.execute("""
+                INSERT INTO duplicate_links_version (id, version, updated_at) VALUES (1, 1, ?)
+                ON CONFLICT (id) DO UPDATE SET version = version + 1, updated_at = excluded.updated_at
+            """, (datetime.now(UTC),))
+        return linked
+
+    def _closest_fingerprint(self, cursor: sqlite3.Cursor, fingerprint: int) -> int | None:
+        """Id of the stored listing closest to fingerprint within simhash.MAX_DISTANCE bits, oldest on a tie."""
+        # Any fingerprint within MAX_DISTANCE shares at least one band, so the
+        # band indexes narrow the search to a handful of rows.
+        candidates = cursor.execute(
+            "SELECT job_listing_id, fingerprint FROM job_fingerprints WHERE "
+            + " OR ".join(f"band{band} = ?" for band in range(simhash.BANDS)),
+            simhash.bands(fingerprint)
+        ).fetchall()
+        best = min(
+            ((simhash.distance(fingerprint, simhash.from_sql(other)), other_id) for other_id, other in candidates),
+            default=None
+        )
+        if best is None or best[0] > simhash.MAX_DISTANCE:
+            return None
+        return best[1]
+
+    def index_near_duplicates(self, batch_size: int = 1000) -> tuple[int, int]:
+        """
+        Fingerprint listings stored before near-duplicate detection existed.
+
+        Listings are processed oldest first, so a repost is linked to the
+        earliest listing it matches. Each batch is fingerprinted before its
+        write transaction starts, and the run can be stopped and resumed.
+
+        Returns:
+            Tuple of (listings fingerprinted, listings linked to an original)
+        """
+        conn = self._get_connection()
+        indexed = 0
+        linked = 0
+        last_id = 0
+        while True:
+            rows = conn.execute("""
+                SELECT id, title, content FROM job_listings jl
+                WHERE id > ? AND NOT EXISTS (SELECT 1 FROM job_fingerprints f WHERE f.job_listing_id = jl.id)
+                ORDER BY id
+                LIMIT ?
+            """, (last_id, batch_size)).fetchall()
+            if not rows:
+                return indexed, linked
+            fingerprints = [(row[0], simhash.simhash(row[1], row[2])) for row in rows]
+            count = self._write(lambda cursor: self._link_near_duplicates(cursor, fingerprints))
+            NEAR_DUPLICATES.inc(count)
+            linked += count
+            indexed += len(rows)
+            last_id = rows[-1][0]
         
-    def get_job_by_checksum(self, checksum: str) -> JobListing | None:
-        """Retrieve a job listing by its checksum."""
+    def _row_to_job(self, row: sqlite3.Row, include_content: bool = True) -> JobRecord:
+        """Map a row selected with _job_columns to a JobRecord; content is "" if it wasn't selected."""
+        # Unpacking by position is several times cheaper than looking up Row keys.
+        if include_content:
+            job_id, url, content, checksum, published_at, created_at, *rest = row
+        else:
+            job_id, url, checksum, published_at, created_at, *rest = row
+            content = ""
+        return JobRecord(
+            job_id,
+            url,
+            content,
+            checksum,
+            datetime.fromisoformat(published_at),
+            datetime.fromisoformat(created_at),
+            *rest
+        )
+
+    def _job_columns(self, include_content: bool) -> str:
+        return ", ".join(JOB_COLUMNS if include_content else [c for c in JOB_COLUMNS if c != "content"])
+
+    def _iter_jobs(self, where: str, params: Iterable, batch_size: int, include_content: bool) -> Iterator[JobRecord]:
+        cursor = self._get_connection().cursor()
+        try:
+            cursor.execute(f"SELECT {self._job_columns(include_content)} FROM job_listings {where}", tuple(params))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                for row in rows:
+                    yield self._row_to_job(row, include_content)
+        finally:
+            cursor.close()
+
+    def get_job_by_checksum(self, checksum: str) -> JobRecord | None:
+        """Retrieve the first stored job listing with this checksum."""
         conn = self._get_connection()
         cursor = conn.cursor()
         row = cursor.execute(
-            "SELECT * FROM job_listings WHERE checksum = ?", 
+            f"SELECT {self._job_columns(True)} FROM job_listings WHERE checksum = ? ORDER BY id LIMIT 1", 
             (checksum,)
         ).fetchone()
         
         if not row:
             return None
             
-        return JobListing(
-            url=row['url'],
-            content=row['content'],
-            _checksum=row['checksum'],
-            published_at=datetime.fromisoformat(row['published_at']),
-            created_at=datetime.fromisoformat(row['created_at']),
-            salary_min=row['salary_min'],
-            salary_max=row['salary_max'],
-            location=row['location'],
-            title=row['title']
-        )
+        return self._row_to_job(row)
     
-    def get_all_jobs(self) -> list[JobListing]:
+    def iter_all_jobs(self, batch_size: int = 500, include_content: bool = True) -> Iterator[JobRecord]:
+        """
+        Stream all job listings, reading batch_size rows at a time.
+
+        Args:
+            batch_size: Rows fetched from SQLite per round trip
+            include_content: Load descriptions; without them content is "" and can be fetched later with get_job_content
+        """
+        return self._iter_jobs("ORDER BY id", (), batch_size, include_content)
+
+    def iter_unanalyzed_jobs(self, batch_size: int = 500, include_content: bool = True) -> Iterator[JobRecord]:
+        """
+        Stream job listings that haven't been analyzed yet, reading batch_size rows at a time.
+
+        Listings whose queue item was dead-lettered are left out.
+
+        Args:
+            batch_size: Rows fetched from SQLite per round trip
+            include_content: Load descriptions; without them content is "" and can be fetched later with get_job_content
+        """
+        return self._iter_jobs("WHERE analysis_status = 'pending' ORDER BY id", (), batch_size, include_content)
+
+    def get_all_jobs(self) -> list[JobRecord]:
         """Retrieve all job listings."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        rows = cursor.execute("SELECT * FROM job_listings").fetchall()
-        
-        return [
-            JobListing(
-                url=row['url'],
-                content=row['content'],
-                _checksum=row['checksum'],
-                published_at=datetime.fromisoformat(row['published_at']),
-                created_at=datetime.fromisoformat(row['created_at']),
-                salary_min=row['salary_min'],
-                salary_max=row['salary_max'],
-                location=row['location'],
-                title=row['title']
-            )
-            for row in rows
-        ]
+        return list(self.iter_all_jobs())
     
-    def get_unanalyzed_jobs(self) -> list[JobListing]:
+    def get_unanalyzed_jobs(self) -> list[JobRecord]:
         """Retrieve job listings that haven't been analyzed yet."""
+        return list(self.iter_unanalyzed_jobs())
+
+    def get_job_content(self, job_id: int) -> str:
+        """Load the description of a job fetched without content."""
         conn = self._get_connection()
-        cursor = conn.cursor()
-        rows = cursor.execute("""
-            SELECT jl.* FROM job_listings jl
-            LEFT JOIN analyzed_jobs aj ON jl.id = aj.job_listing_id 
-            WHERE aj.job_listing_id IS NULL
-        """).fetchall()
-        
-        return [
-            JobListing(
-                id=row['id'],
-                url=row['url'],
-                content=row['content'],
-                _checksum=row['checksum'],
-                published_at=datetime.fromisoformat(row['published_at']),
-                created_at=datetime.fromisoformat(row['created_at']),
-                salary_min=row['salary_min'],
-                salary_max=row['salary_max'],
-                location=row['location'],
-                title=row['title']
-            )
-            for row in rows
-        ]
+        row = conn.execute("SELECT content FROM job_listings WHERE id = ?", (job_id,)).fetchone()
+        return row['content'] if row else ""
     
     def save_analysis(self, analysis: AnalyzedJob) -> bool:
         """Save job analysis results to the database."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        try:
+        def save(cursor: sqlite3.Cursor):
             cursor.execute("""
                 INSERT INTO analyzed_jobs 
-                (job_listing_id, url, salary_from, salary_to, is_remote_score, is_applicable_score, is_european_score, analyzed_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                (job_listing_id, url, salary_from, salary_to, is_remote_score, is_applicable_score, is_european_score, analyzed_at, source, ai_score, relevance_score)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, (SELECT relevance_score FROM job_listings WHERE id = ?))
             """, (
                 analysis.job_listing_id,
                 str(analysis.url), 
@@ -171,16 +874,652 @@ class SQLiteStore:
                 analysis.is_remote_score,
                 analysis.is_applicable_score,
                 analysis.is_european_score,
-                analysis.analyzed_at
+                analysis.analyzed_at,
+                analysis.source,
+                analysis.ai_score,
+                analysis.job_listing_id
             ))
-            conn.commit()
-            return True
+            self._complete(cursor, [analysis.job_listing_id])
+
+        try:
+            self._write(save)
         except sqlite3.Error as e:
             print(f"Failed to save analysis: {e}")
             return False
+        ANALYSES_SAVED.inc()
+        return True
+    
+    def save_analyses(self, analyses: list[AnalyzedJob]) -> int:
+        """
+        Save many analysis results in a single transaction and mark their queue items done.
+        Returns the number of rows saved.
+        """
+        if not analyses:
+            return 0
+
+        def save(cursor: sqlite3.Cursor) -> int:
+            cursor.executemany("""
+                INSERT OR IGNORE INTO analyzed_jobs 
+                (job_listing_id, url, salary_from, salary_to, is_remote_score, is_applicable_score, is_european_score, analyzed_at, source, ai_score, relevance_score)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, (SELECT relevance_score FROM job_listings WHERE id = ?))
+            """, [
+                (
+                    analysis.job_listing_id,
+                    str(analysis.url),
+                    analysis.salary_from,
+                    analysis.salary_to,
+                    analysis.is_remote_score,
+                    analysis.is_applicable_score,
+                    analysis.is_european_score,
+                    analysis.analyzed_at,
+                    analysis.source,
+                    analysis.ai_score,
+                    analysis.job_listing_id
+                )
+                for analysis in analyses
+            ])
+            saved = cursor.rowcount
+            self._complete(cursor, [analysis.job_listing_id for analysis in analyses])
+            return saved
+
+        try:
+            saved = self._write(save)
+        except sqlite3.Error as e:
+            print(f"Failed to save {len(analyses)} analyses: {e}")
+            return 0
+        ANALYSES_SAVED.inc(saved)
+        return saved
     
+    def get_analysis(self, job_listing_id: int) -> sqlite3.Row | None:
+        """Retrieve the stored analysis of a listing, or None if it hasn't been analyzed."""
+        conn = self._get_connection()
+        return conn.execute(
+            "SELECT * FROM analyzed_jobs WHERE job_listing_id = ?",
+            (job_listing_id,)
+        ).fetchone()
+
+    def get_cached_analysis(self, cache_key: str) -> sqlite3.Row | None:
+        """Retrieve a cached analysis result by its cache key."""
+        conn = self._get_connection()
+        return conn.execute(
+            "SELECT * FROM analysis_cache WHERE cache_key = ?",
+            (cache_key,)
+        ).fetchone()
+
+    def save_cached_analyses(self, entries: list[tuple[str, str, AnalyzedJob]]) -> bool:
+        """Store (cache_key, prompt_version, analysis) entries in the analysis cache."""
+        if not entries:
+            return True
+        rows = [
+            (
+                cache_key,
+                prompt_version,
+                analysis.salary_from,
+                analysis.salary_to,
+                analysis.is_remote_score,
+                analysis.is_applicable_score,
+                analysis.is_european_score,
+                analysis.tokens_used,
+                analysis.analyzed_at
+            )
+            for cache_key, prompt_version, analysis in entries
+        ]
+        try:
+            self._write(lambda cursor: cursor.executemany("""
+                INSERT OR REPLACE INTO analysis_cache
+                (cache_key, prompt_version, salary_from, salary_to, is_remote_score, is_applicable_score, is_european_score, tokens_used, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows))
+            return True
+        except sqlite3.Error as e:
+            print(f"Failed to save cached analyses: {e}")
+            return False
+
+    def prune_analysis_cache(self, prompt_version: str) -> int:
+        """Delete cached analyses produced by any other prompt version. Returns the number removed."""
+        return self._write(lambda cursor: cursor.execute(
+            "DELETE FROM analysis_cache WHERE prompt_version != ?",
+            (prompt_version,)
+        ).rowcount)
+    
+    def _enqueue(self, cursor: sqlite3.Cursor, job_ids: list[int]):
+        now = time.time()
+        cursor.executemany(
+            "INSERT OR IGNORE INTO analysis_queue (job_listing_id, available_at) VALUES (?, ?)",
+            [(job_id, now) for job_id in job_ids]
+        )
+
+    def _complete(self, cursor: sqlite3.Cursor, job_ids: list[int]):
+        cursor.executemany(
+            "UPDATE job_listings SET analysis_status = 'analyzed' WHERE id = ?",
+            [(job_id,) for job_id in job_ids]
+        )
+        cursor.executemany(
+            "UPDATE analysis_queue SET status = 'done', lease_owner = NULL, lease_expires_at = NULL WHERE job_listing_id = ?",
+            [(job_id,) for job_id in job_ids]
+        )
+
+    def _mark_dead(self, cursor: sqlite3.Cursor, job_ids: list[int]):
+        # Dead-lettered listings leave the pending index, so backlog readers stop returning them.
+        cursor.executemany(
+            "UPDATE job_listings SET analysis_status = 'dead' WHERE id = ? AND analysis_status = 'pending'",
+            [(job_id,) for job_id in job_ids]
+        )
+
+    def enqueue_unanalyzed(self) -> int:
+        """Queue every listing that has no analysis and isn't queued yet. Returns the number queued."""
+        return self._write(lambda cursor: cursor.execute("""
+            INSERT OR IGNORE INTO analysis_queue (job_listing_id, available_at)
+            SELECT id, ? FROM job_listings
+            WHERE analysis_status = 'pending'
+        """, (time.time(),)).rowcount)
+
+    def claim_jobs(self, owner: str, limit: int, lease_seconds: float, max_attempts: int) -> list[int]:
+        """
+        Lease up to limit queued jobs to owner and return their listing ids.
+
+        Items are claimable when pending and due, or when a previous lease expired
+        without being completed. Each claim counts as an attempt, so a job that
+        keeps crashing its worker ends up dead-lettered after max_attempts.
+        """
+        def claim(cursor: sqlite3.Cursor) -> list[int]:
+            now = time.time()
+            dead = cursor.execute("""
+                UPDATE analysis_queue
+                SET status = 'dead', lease_owner = NULL, lease_expires_at = NULL,
+                    last_error = COALESCE(last_error, 'lease expired')
+                WHERE status = 'leased' AND lease_expires_at <= ? AND attempts >= ?
+                RETURNING job_listing_id
+            """, (now, max_attempts)).fetchall()
+            self._mark_dead(cursor, [row[0] for row in dead])
+            rows = cursor.execute("""
+                UPDATE analysis_queue
+                SET status = 'leased', lease_owner = ?, lease_expires_at = ?, attempts = attempts + 1
+                WHERE job_listing_id IN (
+                    SELECT job_listing_id FROM analysis_queue
+                    WHERE (status = 'pending' AND available_at <= ?)
+                       OR (status = 'leased' AND lease_expires_at <= ?)
+                    ORDER BY available_at
+                    LIMIT ?
+                )
+                RETURNING job_listing_id
+            """, (owner, now + lease_seconds, now, now, limit)).fetchall()
+            return [row[0] for row in rows]
+
+        return self._write(claim)
+
+    def fail_job(self, job_id: int, owner: str, error: str, max_attempts: int, backoff_seconds: float = 30, max_backoff_seconds: float = 3600):
+        """
+        Return a leased job to the queue after a failed attempt, with exponential backoff.
+        Jobs that have used up max_attempts move to the 'dead' state instead.
+        """
+        def fail(cursor: sqlite3.Cursor):
+            row = cursor.execute("""
+                UPDATE analysis_queue
+                SET status = CASE WHEN attempts >= ? THEN 'dead' ELSE 'pending' END,
+                    available_at = ? + MIN(?, ? * (1 << MIN(attempts - 1, 20))),
+                    lease_owner = NULL,
+                    lease_expires_at = NULL,
+                    last_error = ?
+                WHERE job_listing_id = ? AND lease_owner = ?
+                RETURNING status
+            """, (max_attempts, time.time(), max_backoff_seconds, backoff_seconds, error[:1000], job_id, owner)).fetchone()
+            if row is not None and row[0] == 'dead':
+                self._mark_dead(cursor, [job_id])
+
+        self._write(fail)
+
+    def release_jobs(self, owner: str, job_ids: list[int] | None = None) -> int:
+        """
+        Hand jobs leased by owner back to the queue without counting the attempt.
+
+        Args:
+            owner: Worker holding the leases
+            job_ids: Listings to release, or None for every job owner holds; ids
+                that aren't leased by owner, such as completed ones, are left alone
+
+        Returns:
+            Number of jobs released
+        """
+        release = """
+            UPDATE analysis_queue
+            SET status = 'pending', attempts = MAX(attempts - 1, 0), lease_owner = NULL, lease_expires_at = NULL
+            WHERE status = 'leased' AND lease_owner = ?
+        """
+        if job_ids is None:
+            return self._write(lambda cursor: cursor.execute(release, (owner,)).rowcount)
+        if not job_ids:
+            return 0
+        return self._write(lambda cursor: cursor.executemany(
+            release + " AND job_listing_id = ?", [(owner, job_id) for job_id in job_ids]
+        ).rowcount)
+
+    def queue_counts(self) -> dict[str, int]:
+        """Number of queue items in each state."""
+        conn = self._get_connection()
+        rows = conn.execute("SELECT status, COUNT(*) FROM analysis_queue GROUP BY status").fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def data_version(self) -> int:
+        """
+        SQLite's data_version for this connection. It changes whenever another
+        connection commits, which makes it a cheap way to notice new work.
+        """
+        return self._get_connection().execute("PRAGMA data_version").fetchone()[0]
+
+    def get_jobs_by_ids(self, job_ids: list[int], include_content: bool = True) -> list[JobRecord]:
+        """Retrieve job listings by id, in the order given."""
+        if not job_ids:
+            return []
+        conn = self._get_connection()
+        placeholders = ",".join("?" * len(job_ids))
+        rows = conn.execute(
+            f"SELECT {self._job_columns(include_content)} FROM job_listings WHERE id IN ({placeholders})",
+            job_ids
+        ).fetchall()
+        jobs = {row['id']: self._row_to_job(row, include_content) for row in rows}
+        return [jobs[job_id] for job_id in job_ids if job_id in jobs]
+
+    def iter_job_urls(self, batch_size: int = 5000) -> Iterator[str]:
+        """Yield the URL of every stored listing, read from the URL index without touching descriptions."""
+        cursor = self._get_connection().cursor()
+        try:
+            cursor.execute("SELECT url FROM job_listings")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                for row in rows:
+                    yield row[0]
+        finally:
+            cursor.close()
+
+    def get_watermarks(self) -> dict[str, datetime]:
+        """Newest published_at stored from each provider, keyed by provider name."""
+        conn = self._get_connection()
+        rows = conn.execute("SELECT provider, published_at FROM provider_watermarks").fetchall()
+        return {row[0]: datetime.fromisoformat(row[1]) for row in rows}
+
+    def set_watermark(self, provider: str, published_at: datetime):
+        """Advance a provider's watermark to published_at; an older value never moves it back."""
+        def upsert(cursor: sqlite3.Cursor):
+            cursor.execute("""
+                INSERT INTO provider_watermarks (provider, published_at, updated_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT (provider) DO UPDATE SET
+                    published_at = MAX(published_at, excluded.published_at),
+                    updated_at = excluded.updated_at
+            """, (provider, published_at.astimezone(UTC).isoformat(), datetime.now(UTC).isoformat()))
+        self._write(upsert)
+
+    def get_analyses_version(self) -> tuple[int, str | None, int, int]:
+        """
+        Return (highest analysis id, time of the last change, relevance version, duplicate links version) as a cheap change token.
+
+        Analyses are only ever inserted, their relevance scores only change
+        together with the relevance version, and linking reposts, which
+        changes what the collapsed list hides, bumps the duplicate links
+        version. So the token moves exactly when the job list can change.
+        Every part is a single index lookup.
+        """
+        conn = self._get_connection()
+        row = conn.execute("""
+            SELECT
+                (SELECT MAX(id) FROM analyzed_jobs),
+                (SELECT MAX(analyzed_at) FROM analyzed_jobs),
+                (SELECT updated_at FROM relevance_profile),
+                (SELECT version FROM relevance_profile),
+                (SELECT updated_at FROM duplicate_links_version),
+                (SELECT version FROM duplicate_links_version)
+        """).fetchone()
+        changed = max((value for value in (row[1], row[2], row[4]) if value), default=None)
+        return row[0] or 0, changed, row[3] or 0, row[5] or 0
+
+    def iter_listing_texts(self, after_id: int = 0, batch_size: int = 1000) -> Iterator[tuple[int, str | None, str]]:
+        """
+        Stream (id, title, content) of every listing with an id above after_id, in id order.
+
+        Batches are fetched by keyset on id, so no read transaction stays open
+        between them.
+        """
+        conn = self._get_connection()
+        while True:
+            rows = conn.execute(
+                "SELECT id, title, content FROM job_listings WHERE id > ? ORDER BY id LIMIT ?",
+                (after_id, batch_size)
+            ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield row[0], row[1], row[2]
+            after_id = rows[-1][0]
+
+    def iter_unscored_listing_ids(self) -> Iterator[int]:
+        """Ids of listings without a relevance score, read from a partial index."""
+        conn = self._get_connection()
+        for row in conn.execute("SELECT id FROM job_listings WHERE relevance_score IS NULL ORDER BY id"):
+            yield row[0]
+
+    def get_relevance_profile(self) -> sqlite3.Row | None:
+        """The profile fingerprint and corpus size the stored relevance scores were computed with."""
+        conn = self._get_connection()
+        return conn.execute("SELECT * FROM relevance_profile WHERE id = 1").fetchone()
+
+    def save_relevance_scores(self, scores: Iterable[tuple[int, float]], fingerprint: str | None = None, listings: int | None = None) -> int:
+        """
+        Store relevance scores of listings and of their analyses in one transaction.
+
+        Args:
+            scores: (listing id, score) pairs
+            fingerprint: Profile the scores were computed for, recorded when
+                every listing was rescored; None when only new listings were
+            listings: Corpus size at a full rescore
+
+        Returns:
+            Number of listings updated
+        """
+        scores = [(score, job_id) for job_id, score in scores]
+
+        def save(cursor: sqlite3.Cursor) -> int:
+            cursor.executemany("UPDATE job_listings SET relevance_score = ? WHERE id = ?", scores)
+            updated = cursor.rowcount
+            cursor.executemany("UPDATE analyzed_jobs SET relevance_score = ? WHERE job_listing_id = ?", scores)
+            # The version only moves when the order of the job list can change.
+            if fingerprint is not None:
+                cursor.execute("""
+                    INSERT INTO relevance_profile (id, fingerprint, listings, version, updated_at)
+                    VALUES (1, ?, ?, 1, ?)
+                    ON CONFLICT (id) DO UPDATE SET
+                        fingerprint = excluded.fingerprint,
+                        listings = excluded.listings,
+                        version = version + 1,
+                        updated_at = excluded.updated_at
+                """, (fingerprint, listings, datetime.now(UTC)))
+            elif cursor.rowcount > 0:
+                cursor.execute("UPDATE relevance_profile SET version = version + 1, updated_at = ?", (datetime.now(UTC),))
+            return updated
+
+        if not scores:
+            return 0
+        return self._write(save)
+
+    def get_listings(self, ids: list[int]) -> list[dict]:
+        """
+        Listings with their analysis, if any, in the order of ids.
+
+        Rows have the same fields as a page of get_analyzed_listings, with
+        None scores for listings that haven't been analyzed.
+        """
+        if not ids:
+            return []
+        conn = self._get_connection()
+        rows = conn.execute(f"""
+            SELECT
+                jl.id as listing_id,
+                jl.title,
+                jl.url,
+                jl.salary_min as salary_from,
+                jl.salary_max as salary_to,
+                jl.canonical_id,
+                aj.is_remote_score,
+                aj.is_applicable_score,
+                aj.is_european_score,
+                aj.ai_score,
+                COALESCE(aj.relevance_score, jl.relevance_score) as relevance_score,
+                aj.analyzed_at
+            FROM job_listings jl
+            LEFT JOIN analyzed_jobs aj ON aj.job_listing_id = jl.id
+            WHERE jl.id IN ({", ".join("?" * len(ids))})
+        """, ids).fetchall()
+        by_id = {row["listing_id"]: dict(row) for row in rows}
+        return [by_id[job_id] for job_id in ids if job_id in by_id]
+
+    def _listing_filters(self, query: JobQuery) -> tuple[list[str], list]:
+        """SQL conditions and parameters for the score, salary and repost filters of query."""
+        conditions = []
+        params: list = []
+        for column, minimum in (
+            ("aj.ai_score", query.min_ai_score),
+            ("aj.is_remote_score", query.min_remote_score),
+            ("aj.is_applicable_score", query.min_applicable_score),
+            ("aj.is_european_score", query.min_european_score),
+        ):
+            if minimum is not None:
+                conditions.append(f"{column} >= ?")
+                params.append(minimum)
+        # Keep listings whose advertised range overlaps the requested one.
+        if query.min_salary is not None:
+            conditions.append("COALESCE(jl.salary_max, jl.salary_min) >= ?")
+            params.append(query.min_salary)
+        if query.max_salary is not None:
+            conditions.append("COALESCE(jl.salary_min, jl.salary_max) <= ?")
+            params.append(query.max_salary)
+        # A repost stays visible until its original has an analysis to stand in for it.
+        if query.duplicates == "collapse":
+            conditions.append(
+                "(jl.canonical_id IS NULL OR NOT EXISTS (SELECT 1 FROM analyzed_jobs c WHERE c.job_listing_id = jl.canonical_id))"
+            )
+        return conditions, params
+
+    def get_analyzed_listings(self, query: JobQuery | None = None) -> JobPage:
+        """
+        Return one page of analyzed jobs joined with their listing.
+
+        Pages are found by keyset rather than OFFSET: the query seeks straight
+        to the sort value and id after the previous page's last row, so every
+        page costs the same however deep the reader goes.
+
+        Args:
+            query: Filters, sort and position; defaults to the first page by AI score
+
+        Returns:
+            JobPage with the rows and the position of the next page, or None on the last page
+        """
+        query = query or JobQuery()
+        if query.sort not in SORT_COLUMNS:
+            raise ValueError(f"Unsupported sort column {query.sort!r}")
+        sort_column = f"aj.{query.sort}"
+        descending = query.direction == "desc"
+
+        conditions, params = self._listing_filters(query)
+        if query.after is not None:
+            value, after_id = query.after
+            # Unknown scores are NULL, which SQLite sorts below every value:
+            # last when descending, first when ascending.
+            if value is None and descending:
+                conditions.append(f"({sort_column} IS NULL AND aj.id < ?)")
+                params.append(after_id)
+            elif value is None:
+                conditions.append(f"(({sort_column} IS NULL AND aj.id > ?) OR {sort_column} IS NOT NULL)")
+                params.append(after_id)
+            elif descending and query.sort in NULLABLE_SCORES:
+                conditions.append(f"(({sort_column}, aj.id) < (?, ?) OR {sort_column} IS NULL)")
+                params.extend(query.after)
+            else:
+                conditions.append(f"({sort_column}, aj.id) {'<' if descending else '>'} (?, ?)")
+                params.extend(query.after)
+
+        order = "DESC" if descending else "ASC"
+        conn = self._get_connection()
+        rows = conn.execute(f"""
+            SELECT 
+                aj.id as analysis_id,
+                jl.id as listing_id,
+                jl.title,
+                jl.url,
+                jl.salary_min as salary_from,
+                jl.salary_max as salary_to,
+                aj.is_remote_score,
+                aj.is_applicable_score,
+                aj.is_european_score,
+                aj.ai_score,
+                aj.relevance_score,
+                aj.analyzed_at,
+                (SELECT COUNT(*) FROM job_listings d WHERE d.canonical_id = jl.id) as duplicates
+            FROM analyzed_jobs aj
+            JOIN job_listings jl ON jl.id = aj.job_listing_id
+            {"WHERE " + " AND ".join(conditions) if conditions else ""}
+            ORDER BY {sort_column} {order}, aj.id {order}
+            LIMIT ?
+        """, [*params, query.limit + 1]).fetchall()
+
+        rows = [dict(row) for row in rows]
+        next_after = None
+        if len(rows) > query.limit:
+            rows = rows[:query.limit]
+            next_after = (rows[-1][query.sort], rows[-1]['analysis_id'])
+        return JobPage(rows=rows, next_after=next_after)
+
+    def iter_analyzed_listings(self, filters: JobQuery | None = None, since: str | None = None, after_id: int | None = None, batch_size: int = 1000) -> Iterator[dict]:
+        """
+        Stream every analyzed job matching filters, in the order analyses were stored.
+
+        Rows are read from one cursor batch_size at a time, so memory stays flat
+        however many rows match. analysis_id is assigned when the analysis is
+        committed, so passing the last row's analysis_id back as after_id pulls
+        every analysis stored since, including ones a slower worker committed
+        with an earlier analyzed_at.
+
+        Args:
+            filters: Score and salary filters; sort, after and limit are ignored
+            since: Only return analyses with analyzed_at strictly after this ISO timestamp
+            after_id: Only return analyses with analysis_id greater than this
+            batch_size: Rows fetched from SQLite per round trip
+
+        Returns:
+            Iterator of row dicts
+        """
+        conditions, params = self._listing_filters(filters) if filters else ([], [])
+        if since:
+            # Stored timestamps use a space separator; accept the T form too.
+            datetime.fromisoformat(since)
+            conditions.append("aj.analyzed_at > ?")
+            params.append(since.replace("T", " ", 1))
+        if after_id is not None:
+            conditions.append("aj.id > ?")
+            params.append(after_id)
+
+        cursor = self._get_connection().cursor()
+        try:
+            cursor.execute(f"""
+                SELECT
+                    jl.id,
+                    jl.title,
+                    jl.url,
+                    jl.location,
+                    jl.salary_min,
+                    jl.salary_max,
+                    jl.published_at,
+                    aj.salary_from,
+                    aj.salary_to,
+                    aj.is_remote_score,
+                    aj.is_applicable_score,
+                    aj.is_european_score,
+                    aj.ai_score,
+                    aj.relevance_score,
+                    aj.source,
+                    aj.analyzed_at,
+                    jl.canonical_id,
+                    aj.id AS analysis_id
+                FROM analyzed_jobs aj
+                JOIN job_listings jl ON jl.id = aj.job_listing_id
+                {"WHERE " + " AND ".join(conditions) if conditions else ""}
+                ORDER BY aj.id
+            """, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                for row in rows:
+                    yield dict(row)
+        finally:
+            cursor.close()
+
+    def search(self, query: str, limit: int = 20, offset: int = 0, filters: JobQuery | None = None) -> list[dict]:
+        """
+        Full-text search over listing titles and descriptions, best matches first.
+
+        Matches in the title weigh more than matches in the description. Listings
+        that haven't been analyzed yet are included unless a score filter is set.
+
+        Args:
+            query: Free text as typed by the user, see fts_query
+            limit: Maximum number of results
+            offset: Number of results to skip
+            filters: Score and salary filters to apply on top of the text match; sort and after are ignored
+
+        Returns:
+            Rows with the listing, its scores (None if unanalyzed), rank and a
+            snippet of the description with matches wrapped in \x02 and \x03
+        """
+        match = fts_query(query)
+        if not match:
+            return []
+        conditions, params = self._listing_filters(filters) if filters else ([], [])
+        # A score filter can only be satisfied by analyzed rows.
+        scored = filters is not None and any(
+            value is not None
+            for value in (filters.min_ai_score, filters.min_remote_score, filters.min_applicable_score, filters.min_european_score)
+        )
+
+        conn = self._get_connection()
+        # Rank and page first, so snippets are only built for the rows returned.
+        rows = conn.execute(f"""
+            WITH hits AS (
+                SELECT jl.id, job_listings_fts.rank
+                FROM job_listings_fts
+                JOIN job_listings jl ON jl.id = job_listings_fts.rowid
+                {"" if scored else "LEFT"} JOIN analyzed_jobs aj ON aj.job_listing_id = jl.id
+                WHERE job_listings_fts MATCH ?
+                AND job_listings_fts.rank MATCH 'bm25(5.0, 1.0)'
+                {"".join(" AND " + condition for condition in conditions)}
+                ORDER BY job_listings_fts.rank
+                LIMIT ? OFFSET ?
+            )
+            SELECT
+                jl.id,
+                jl.id as listing_id,
+                jl.title,
+                jl.url,
+                jl.salary_min as salary_from,
+                jl.salary_max as salary_to,
+                aj.is_remote_score,
+                aj.is_applicable_score,
+                aj.is_european_score,
+                aj.ai_score,
+                COALESCE(aj.relevance_score, jl.relevance_score) as relevance_score,
+                aj.analyzed_at,
+                hits.rank,
+                (SELECT COUNT(*) FROM job_listings d WHERE d.canonical_id = jl.id) as duplicates,
+                snippet(job_listings_fts, 1, char(2), char(3), '…', 16) as snippet
+            FROM hits
+            JOIN job_listings_fts ON job_listings_fts.rowid = hits.id
+            JOIN job_listings jl ON jl.id = hits.id
+            LEFT JOIN analyzed_jobs aj ON aj.job_listing_id = hits.id
+            WHERE job_listings_fts MATCH ?
+            ORDER BY hits.rank
+        """, [match, *params, limit, offset, match]).fetchall()
+        return [dict(row) for row in rows]
+
+    def rebuild_search_index(self) -> int:
+        """
+        Rebuild the full-text index from job_listings.
+
+        Needed once after upgrading a database that already had listings, and
+        safe to rerun at any time.
+
+        Returns:
+            Number of listings indexed
+        """
+        def rebuild(cursor: sqlite3.Cursor) -> int:
+            cursor.execute("INSERT INTO job_listings_fts (job_listings_fts) VALUES ('rebuild')")
+            return cursor.execute("SELECT COUNT(*) FROM job_listings").fetchone()[0]
+        return self._write(rebuild)
+
     def close(self):
         """Ensure database connection is closed when object is destroyed."""
         if hasattr(self._local, 'conn'):
             self._local.conn.close()
             del self._local.conn
+        while self._idle:
+            self._idle.pop().close()
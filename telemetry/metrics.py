@@ -0,0 +1,295 @@
+import json
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+
+# METRICS_ENABLED=0 turns every metric operation into an immediate return.
+ENABLED = os.getenv("METRICS_ENABLED", "1").strip().lower() not in ("0", "false", "no", "off")
+METRICS_DIR = Path(os.getenv("METRICS_DIR", "data/metrics"))
+
+# Seconds, from a fast SQLite write up to a slow provider fetch.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        if not ENABLED:
+            return
+        with self._lock:
+            self.value += amount
+
+    def sample(self) -> dict:
+        return {"value": self.value}
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def set(self, value: float):
+        if not ENABLED:
+            return
+        self.value = value
+
+    def dec(self, amount: float = 1):
+        self.inc(-amount)
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "count", "_lock")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        if not ENABLED:
+            return
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    @contextmanager
+    def time(self):
+        """Observe how long the with block takes, in seconds."""
+        if not ENABLED:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def sample(self) -> dict:
+        with self._lock:
+            return {"buckets": list(self.counts), "sum": self.sum, "count": self.count}
+
+class Metric(ABC):
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        """
+        A named metric family, optionally split by label values.
+
+        Args:
+            name: Prometheus metric name
+            help: One-line description shown in the exposition
+            labelnames: Names of the labels children are keyed by, in order
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _new_child(self):
+        """Return a new child holding one label combination's value."""
+
+    def labels(self, *values):
+        """Return the child for these label values, creating it on first use."""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def snapshot(self) -> dict:
+        return {
+            "type": self.type,
+            "help": self.help,
+            "labelnames": list(self.labelnames),
+            "samples": [
+                {"labels": list(key), **child.sample()}
+                for key, child in list(self._children.items())
+            ]
+        }
+
+class Counter(Metric):
+    type = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def snapshot(self) -> dict:
+        snapshot = super().snapshot()
+        snapshot["bounds"] = list(self.buckets)
+        return snapshot
+
+_registry: dict[str, Metric] = {}
+_registry_lock = threading.Lock()
+
+def _register(metric: Metric) -> Metric:
+    with _registry_lock:
+        existing = _registry.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                raise ValueError(f"Metric {metric.name} is already registered with a different type or labels")
+            return existing
+        _registry[metric.name] = metric
+        return metric
+
+def counter(name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+    return _register(Counter(name, help, labelnames))
+
+def gauge(name: str, help: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+    return _register(Gauge(name, help, labelnames))
+
+def histogram(name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+    return _register(Histogram(name, help, labelnames, buckets))
+
+def snapshot() -> dict:
+    """Current values of every metric registered in this process."""
+    with _registry_lock:
+        metrics = list(_registry.values())
+    return {metric.name: metric.snapshot() for metric in metrics}
+
+_last_written: dict[str, float] = {}
+# Set by set_process_name when several components share this process.
+PROCESS_NAME: str | None = None
+
+def set_process_name(name: str):
+    """
+    Write every snapshot from this process under one name.
+
+    Used when several components share a process and so share one registry;
+    otherwise each would save the same metrics under its own name.
+    """
+    global PROCESS_NAME
+    PROCESS_NAME = name
+
+def write_snapshot(process: str, min_interval: float = 0):
+    """
+    Save this process's metrics to METRICS_DIR/<process>.json for the web UI to serve.
+
+    Written to a temporary file and renamed, so readers never see a partial
+    snapshot. Calls within min_interval seconds of the last write are skipped,
+    so it can be called from a loop.
+    """
+    if not ENABLED:
+        return
+    process = PROCESS_NAME or process
+    now = time.time()
+    if min_interval and now - _last_written.get(process, 0) < min_interval:
+        return
+    _last_written[process] = now
+    try:
+        METRICS_DIR.mkdir(parents=True, exist_ok=True)
+        path = METRICS_DIR / f"{process}.json"
+        temp = path.with_suffix(".json.tmp")
+        temp.write_text(json.dumps({"process": process, "pid": os.getpid(), "written_at": now, "metrics": snapshot()}))
+        os.replace(temp, path)
+    except OSError as e:
+        print(f"Failed to write metrics snapshot: {str(e)}")
+
+def read_snapshots(exclude: str | None = None) -> dict[str, dict]:
+    """
+    Load snapshot files written by other processes, keyed by process name.
+
+    Files written by this process are skipped; its live registry is newer.
+    """
+    snapshots = {}
+    if not METRICS_DIR.is_dir():
+        return snapshots
+    for path in sorted(METRICS_DIR.glob("*.json")):
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        if data.get("pid") == os.getpid():
+            continue
+        if data.get("process") and data["process"] != exclude:
+            snapshots[data["process"]] = data
+    return snapshots
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: list[str], values: list[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+def render_prometheus(process_metrics: dict[str, dict]) -> str:
+    """
+    Render metrics from one or more processes in the Prometheus text format.
+
+    Args:
+        process_metrics: Metric snapshots keyed by process name; every sample
+            gets a process label so the same metric from different processes
+            stays distinct
+    """
+    families: dict[str, list[tuple[str, dict]]] = {}
+    for process, metrics in process_metrics.items():
+        for name, family in metrics.items():
+            families.setdefault(name, []).append((process, family))
+
+    lines = []
+    for name in sorted(families):
+        first = families[name][0][1]
+        lines.append(f"# HELP {name} {first['help']}")
+        lines.append(f"# TYPE {name} {first['type']}")
+        for process, family in families[name]:
+            names = ["process", *family["labelnames"]]
+            for sample in family["samples"]:
+                values = [process, *sample["labels"]]
+                if family["type"] != "histogram":
+                    lines.append(f"{name}{_format_labels(names, values)} {_format_value(sample['value'])}")
+                    continue
+                cumulative = 0
+                for bound, count in zip([*family["bounds"], math.inf], sample["buckets"]):
+                    cumulative += count
+                    labels = _format_labels([*names, "le"], [*values, _format_value(bound)])
+                    lines.append(f"{name}_bucket{labels} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(names, values)} {_format_value(sample['sum'])}")
+                lines.append(f"{name}_count{_format_labels(names, values)} {sample['count']}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,262 @@
+"""
+Pagination, throttling and retries of the provider HTTP client against a
+local job board.
+"""
+import socket
+import threading
+import time
+from datetime import datetime, timedelta, UTC
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler
+import pytest
+import requests
+from benchmarks.fakes import FakeBoard, _serve
+from scrape.providers.base import BaseScraper, next_link, page_number
+from scrape.providers.client import HostPolicy, HTTPClient, retry_after
+
+ITEMS = [{"id": i, "url": f"https://example.com/jobs/{i}"} for i in range(25)]
+
+class Provider(BaseScraper):
+    def __init__(self, client: HTTPClient):
+        self.client = client
+
+    def fetch_jobs(self):
+        return iter(())
+
+def make_client(**options) -> HTTPClient:
+    policy = HostPolicy(rate=None, concurrency=options.pop("concurrency", 4))
+    options.setdefault("backoff", 0.01)
+    return HTTPClient(policy=policy, **options)
+
+@pytest.fixture
+def board():
+    board = FakeBoard(ITEMS, page_size=10)
+    board.url = board.start()
+    yield board
+    board.stop()
+
+class Scripted:
+    """Local server answering each request with the next (status, headers) of a script, repeating the last one."""
+
+    def __init__(self, *responses: tuple[int, dict]):
+        self.responses = list(responses)
+        self.requests: list[str] = []
+        scripted = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def answer(self):
+                scripted.requests.append(self.command)
+                status, headers = scripted.responses[min(len(scripted.requests), len(scripted.responses)) - 1]
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = answer
+
+            def log_message(self, *args):
+                pass
+
+        self.server = _serve(Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def scripted():
+    servers = []
+
+    def start(*responses):
+        server = Scripted(*responses)
+        servers.append(server)
+        return server
+    yield start
+    for server in servers:
+        server.stop()
+
+def response_with(headers: dict) -> requests.Response:
+    response = requests.Response()
+    response.headers.update(headers)
+    return response
+
+def test_next_link_follows_every_page_and_stops_at_the_last(board):
+    pages = list(Provider(make_client()).paginate(board.url, next_page=next_link))
+
+    assert len(pages) == board.pages == 3
+    assert [item["id"] for page in pages for item in page.json()] == list(range(25))
+    assert board.statuses == {200: 3}
+
+def test_page_number_stops_at_an_empty_page(board):
+    pages = list(Provider(make_client()).paginate(board.url, params={"page": 1}, next_page=page_number()))
+
+    assert [len(page.json()) for page in pages] == [10, 10, 5, 0]
+    assert board.statuses == {200: 4}
+
+def test_page_number_stops_at_a_short_page_when_the_page_size_is_known(board):
+    pages = list(Provider(make_client()).paginate(board.url, params={"page": 1}, next_page=page_number(page_size=10)))
+
+    assert [len(page.json()) for page in pages] == [10, 10, 5]
+    assert board.statuses == {200: 3}
+
+def test_page_number_counts_from_start_when_the_first_request_has_no_page(board):
+    pages = list(Provider(make_client()).paginate(board.url, next_page=page_number(start=1, page_size=10)))
+
+    assert [item["id"] for page in pages for item in page.json()] == list(range(25))
+
+def test_paginate_stops_when_a_page_leads_back_to_one_already_read(board):
+    pages = list(Provider(make_client()).paginate(board.url, params={"page": 2}, next_page=lambda response, url, params: (url, params)))
+
+    assert len(pages) == 1
+    assert board.statuses == {200: 1}
+
+def test_paginate_stops_at_max_pages(board):
+    pages = list(Provider(make_client()).paginate(board.url, max_pages=2))
+
+    assert len(pages) == 2
+
+def test_retry_after_in_seconds():
+    assert retry_after(response_with({"Retry-After": "7"})) == 7
+    assert retry_after(response_with({"Retry-After": "-3"})) == 0
+    assert retry_after(response_with({})) is None
+    assert retry_after(response_with({"Retry-After": "soon"})) is None
+
+def test_retry_after_as_http_date():
+    later = format_datetime(datetime.now(UTC) + timedelta(seconds=30), usegmt=True)
+    earlier = format_datetime(datetime.now(UTC) - timedelta(seconds=30), usegmt=True)
+
+    assert 28 <= retry_after(response_with({"Retry-After": later})) <= 30
+    assert retry_after(response_with({"Retry-After": earlier})) == 0
+
+def test_429_waits_for_retry_after(scripted):
+    server = scripted((429, {"Retry-After": "1"}), (200, {}))
+
+    start = time.monotonic()
+    response = make_client().get(server.url)
+
+    assert response.status_code == 200
+    assert time.monotonic() - start >= 0.9
+    assert len(server.requests) == 2
+
+def test_retry_after_longer_than_max_retry_after_fails_at_once(scripted):
+    server = scripted((429, {"Retry-After": "3600"}))
+
+    start = time.monotonic()
+    with pytest.raises(requests.HTTPError) as error:
+        make_client(max_retry_after=60).get(server.url)
+
+    assert error.value.response.status_code == 429
+    assert time.monotonic() - start < 1
+    assert len(server.requests) == 1
+
+def test_retry_after_date_longer_than_max_retry_after_fails_at_once(scripted):
+    server = scripted((503, {"Retry-After": format_datetime(datetime.now(UTC) + timedelta(hours=1), usegmt=True)}))
+
+    with pytest.raises(requests.HTTPError):
+        make_client(max_retry_after=60).get(server.url)
+    assert len(server.requests) == 1
+
+def test_5xx_is_retried_for_get_until_retries_run_out(scripted):
+    server = scripted((503, {}))
+
+    response = make_client(retries=2).get(server.url)
+
+    assert response.status_code == 503
+    assert server.requests == ["GET"] * 3
+
+def test_5xx_is_not_retried_for_post(scripted):
+    server = scripted((503, {}))
+
+    response = make_client(retries=2).request("POST", server.url, data=b"{}")
+
+    assert response.status_code == 503
+    assert server.requests == ["POST"]
+
+def test_429_is_retried_for_post(scripted):
+    server = scripted((429, {"Retry-After": "0"}), (200, {}))
+
+    response = make_client().request("POST", server.url, data=b"{}")
+
+    assert response.status_code == 200
+    assert server.requests == ["POST", "POST"]
+
+def unused_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/"
+
+def test_connection_errors_are_retried_for_get(monkeypatch):
+    client = make_client(retries=2)
+    attempts = []
+    send = client.session.request
+
+    def counting(*args, **kwargs):
+        attempts.append(args[0])
+        return send(*args, **kwargs)
+    monkeypatch.setattr(client.session, "request", counting)
+
+    with pytest.raises(requests.ConnectionError):
+        client.get(unused_url())
+    assert attempts == ["GET"] * 3
+
+def test_connection_errors_are_not_retried_for_post(monkeypatch):
+    client = make_client(retries=2, backoff=5)
+    attempts = []
+    send = client.session.request
+
+    def counting(*args, **kwargs):
+        attempts.append(args[0])
+        return send(*args, **kwargs)
+    monkeypatch.setattr(client.session, "request", counting)
+
+    start = time.monotonic()
+    with pytest.raises(requests.ConnectionError):
+        client.request("POST", unused_url(), data=b"{}")
+    assert attempts == ["POST"]
+    assert time.monotonic() - start < 1
+
+def test_concurrency_cap_limits_requests_in_flight_to_a_host(board):
+    board.latency = 0.02
+    client = make_client(concurrency=2)
+
+    def fetch():
+        for _ in range(5):
+            client.get(board.url).close()
+    threads = [threading.Thread(target=fetch) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert board.statuses == {200: 30}
+    assert board.max_in_flight == 2
+
+def test_streamed_response_keeps_its_slot_until_closed(board):
+    client = make_client(concurrency=1)
+    streamed = client.get(board.url, stream=True)
+    done = threading.Event()
+
+    def fetch():
+        client.get(board.url)
+        done.set()
+    thread = threading.Thread(target=fetch, daemon=True)
+    thread.start()
+
+    assert not done.wait(0.3)
+    streamed.close()
+    assert done.wait(5)
+    thread.join()
+
+def test_streamed_response_read_in_a_with_block_releases_its_slot(board):
+    client = make_client(concurrency=1)
+    with client.get(board.url, stream=True) as response:
+        assert len(response.json()) == 10
+
+    assert client.get(board.url, timeout=5).status_code == 200